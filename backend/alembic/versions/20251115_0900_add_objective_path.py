@@ -0,0 +1,45 @@
+"""add materialized path to objectives
+
+Revision ID: 20251115_0900
+Revises: 20251110_0820
+Create Date: 2025-11-15 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251115_0900"
+down_revision: Union[str, None] = "20251110_0820"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add path column holding the chain of ancestor ids ('/1/5/12/')
+    with op.batch_alter_table('objectives', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('path', sa.String(length=255), nullable=True))
+        batch_op.create_index('idx_objectives_path', ['path'])
+
+    # Backfill paths for existing rows with a single recursive walk from the roots
+    op.execute(
+        """
+        WITH RECURSIVE tree(id, path) AS (
+            SELECT id, '/' || id || '/' FROM objectives WHERE parent_id IS NULL
+            UNION ALL
+            SELECT o.id, tree.path || o.id || '/'
+            FROM objectives o JOIN tree ON o.parent_id = tree.id
+        )
+        UPDATE objectives
+        SET path = (SELECT tree.path FROM tree WHERE tree.id = objectives.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('objectives', schema=None) as batch_op:
+        batch_op.drop_index('idx_objectives_path')
+        batch_op.drop_column('path')
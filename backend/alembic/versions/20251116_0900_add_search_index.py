@@ -0,0 +1,63 @@
+"""add FTS5 search index for kpis, objectives and comments
+
+Revision ID: 20251116_0900
+Revises: 20251115_0900
+Create Date: 2025-11-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251116_0900"
+down_revision: Union[str, None] = "20251115_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# rowid = source id * 4 + kind (1 = kpi, 2 = objective, 3 = comment)
+SOURCES = (
+    ("kpis", 1, "{row}.title", "coalesce({row}.description, '')", "title, description"),
+    ("objectives", 2, "{row}.title", "coalesce({row}.description, '')", "title, description"),
+    ("kpi_comments", 3, "''", "{row}.comment", "comment"),
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+    for table, kind, title, body, columns in SOURCES:
+        insert_new = (
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"VALUES (new.id * 4 + {kind}, {title.format(row='new')}, {body.format(row='new')});"
+        )
+        delete_old = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {kind};"
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {columns} ON {table} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+
+        # Index existing rows
+        op.execute(
+            f"INSERT INTO search_index(rowid, title, body) "
+            f"SELECT id * 4 + {kind}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    for table, *_ in SOURCES:
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,133 @@
+"""add numeric target/current values, unit and direction to kpis
+
+Revision ID: 20251117_0900
+Revises: 20251116_0900
+Create Date: 2025-11-17 09:00:00.000000
+
+"""
+import re
+from typing import Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251117_0900"
+down_revision: Union[str, None] = "20251116_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Value parsing as of this revision, copied from app.utils.kpi_values so
+# later changes to the helper do not change what this migration does
+
+NUMBER_RE = re.compile(r"^\s*([-+]?\d[\d.,\s]*)")
+MULTIPLIERS = {
+    "k": 1e3,
+    "nghìn": 1e3,
+    "ngàn": 1e3,
+    "tr": 1e6,
+    "triệu": 1e6,
+    "tỷ": 1e9,
+    "tỉ": 1e9,
+}
+UNIT_MAX_LENGTH = 20
+
+
+def to_number(raw: str) -> Optional[float]:
+    raw = raw.replace(" ", "").rstrip(".,")
+    if not raw:
+        return None
+
+    if "," in raw and "." in raw:
+        if raw.rfind(",") > raw.rfind("."):
+            raw = raw.replace(".", "").replace(",", ".")
+        else:
+            raw = raw.replace(",", "")
+    elif "," in raw:
+        if re.fullmatch(r"[-+]?\d{1,3}(,\d{3})+", raw):
+            raw = raw.replace(",", "")
+        else:
+            raw = raw.replace(",", ".")
+    elif re.fullmatch(r"[-+]?[1-9]\d{0,2}(\.\d{3})+", raw):
+        raw = raw.replace(".", "")
+
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def parse_value(value: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    if value is None:
+        return None, None
+    match = NUMBER_RE.match(str(value))
+    if not match:
+        return None, None
+
+    number = to_number(match.group(1))
+    if number is None:
+        return None, None
+
+    rest = str(value)[match.end():].strip()
+    word = rest.split(" ", 1)[0].lower() if rest else ""
+    if word in MULTIPLIERS:
+        number *= MULTIPLIERS[word]
+        rest = rest[len(word):].strip()
+
+    unit = rest[:UNIT_MAX_LENGTH] or None
+    return number, unit
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('kpis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('target_numeric', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('current_numeric', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('unit', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('direction', sa.String(length=10), nullable=False, server_default='higher'))
+
+    # Parse existing text values and write them back in one batched UPDATE
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, target_value, current_value FROM kpis "
+        "WHERE target_value IS NOT NULL OR current_value IS NOT NULL"
+    )).fetchall()
+
+    params = []
+    for kpi_id, target_value, current_value in rows:
+        target, target_unit = parse_value(target_value)
+        current, current_unit = parse_value(current_value)
+        if target is None and current is None:
+            continue
+        params.append({
+            "id": kpi_id,
+            "target": target,
+            "current": current,
+            "unit": target_unit or current_unit,
+        })
+
+    if params:
+        conn.execute(
+            sa.text(
+                "UPDATE kpis SET target_numeric = :target, current_numeric = :current, "
+                "unit = :unit WHERE id = :id"
+            ),
+            params,
+        )
+
+    # Derive progress in SQL where both values are known (higher is better)
+    op.execute(
+        """
+        UPDATE kpis
+        SET progress_percentage = max(0.0, min(100.0, current_numeric * 100.0 / target_numeric))
+        WHERE target_numeric IS NOT NULL AND target_numeric != 0
+          AND current_numeric IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    # Native DROP COLUMN (SQLite 3.35+): batch mode would recreate kpis and
+    # lose its search index triggers
+    for column in ('direction', 'unit', 'current_numeric', 'target_numeric'):
+        op.execute(f"ALTER TABLE kpis DROP COLUMN {column}")
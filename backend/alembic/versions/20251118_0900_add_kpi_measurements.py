@@ -0,0 +1,50 @@
+"""add kpi measurement time series
+
+Revision ID: 20251118_0900
+Revises: 20251117_0900
+Create Date: 2025-11-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251118_0900"
+down_revision: Union[str, None] = "20251117_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'kpi_measurements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kpi_id', sa.Integer(), nullable=False),
+        sa.Column('measured_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['kpi_id'], ['kpis.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_kpi_measurements_kpi_id_measured_at',
+        'kpi_measurements',
+        ['kpi_id', 'measured_at'],
+        unique=False,
+    )
+
+    # Start each series with the KPI's current numeric value
+    op.execute(
+        """
+        INSERT INTO kpi_measurements (kpi_id, measured_at, value)
+        SELECT id, updated_at, current_numeric FROM kpis
+        WHERE current_numeric IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kpi_measurements_kpi_id_measured_at', table_name='kpi_measurements')
+    op.drop_table('kpi_measurements')
@@ -0,0 +1,36 @@
+"""add external key to kpis for bulk value ingest
+
+Revision ID: 20251119_0900
+Revises: 20251118_0900
+Create Date: 2025-11-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251119_0900"
+down_revision: Union[str, None] = "20251118_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('kpis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('external_key', sa.String(length=100), nullable=True))
+    op.create_index(
+        'ix_kpis_external_key_period',
+        'kpis',
+        ['external_key', 'year', 'quarter'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kpis_external_key_period', table_name='kpis')
+    # Native DROP COLUMN (SQLite 3.35+): batch mode would recreate kpis and
+    # lose its search index triggers
+    op.execute("ALTER TABLE kpis DROP COLUMN external_key")
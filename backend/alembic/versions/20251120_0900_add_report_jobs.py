@@ -0,0 +1,57 @@
+"""add background report jobs
+
+Revision ID: 20251120_0900
+Revises: 20251119_0900
+Create Date: 2025-11-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251120_0900"
+down_revision: Union[str, None] = "20251119_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('report_type', sa.String(length=10), nullable=False),
+        sa.Column('params', sa.Text(), nullable=False),
+        sa.Column('spec_hash', sa.String(length=64), nullable=False),
+        sa.Column('requested_by', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_report_jobs_requested_by', 'report_jobs', ['requested_by'], unique=False)
+    op.create_index('ix_report_jobs_expires_at', 'report_jobs', ['expires_at'], unique=False)
+    op.create_index(
+        'ix_report_jobs_active_spec',
+        'report_jobs',
+        ['spec_hash'],
+        unique=True,
+        sqlite_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_report_jobs_active_spec', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_expires_at', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_requested_by', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,37 @@
+"""add covering indexes for KPI analytics
+
+Revision ID: 20251121_0900
+Revises: 20251120_0900
+Create Date: 2025-11-21 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251121_0900"
+down_revision: Union[str, None] = "20251120_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_kpis_year_status_quarter_category',
+        'kpis',
+        ['year', 'status', 'quarter', 'category', 'progress_percentage'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_kpis_year_user_id',
+        'kpis',
+        ['year', 'user_id', 'status', 'quarter', 'category', 'progress_percentage'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_kpis_year_user_id', table_name='kpis')
+    op.drop_index('ix_kpis_year_status_quarter_category', table_name='kpis')
@@ -0,0 +1,123 @@
+"""add trigger-maintained kpi rollup table
+
+Revision ID: 20251122_0900
+Revises: 20251121_0900
+Create Date: 2025-11-22 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122_0900"
+down_revision: Union[str, None] = "20251121_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY = "department, year, quarter, category, status"
+
+ACCUMULATE = (
+    "ON CONFLICT(department, year, quarter, category, status) DO UPDATE SET "
+    "kpi_count = kpi_count + excluded.kpi_count, "
+    "progress_sum = progress_sum + excluded.progress_sum, "
+    "progress_count = progress_count + excluded.progress_count;"
+)
+
+
+def department(row):
+    return f"coalesce((SELECT department FROM users WHERE id = {row}.user_id), '')"
+
+
+def add_row(row, sign):
+    return (
+        f"INSERT INTO kpi_rollups ({KEY}, kpi_count, progress_sum, progress_count) "
+        f"VALUES ({department(row)}, {row}.year, {row}.quarter, coalesce({row}.category, ''), "
+        f"{row}.status, {sign}1, {sign}coalesce({row}.progress_percentage, 0), "
+        f"{sign}({row}.progress_percentage IS NOT NULL)) {ACCUMULATE}"
+    )
+
+
+def delete_if_empty(row):
+    return (
+        f"DELETE FROM kpi_rollups WHERE department = {department(row)} "
+        f"AND year = {row}.year AND quarter = {row}.quarter "
+        f"AND category = coalesce({row}.category, '') AND status = {row}.status "
+        f"AND kpi_count = 0;"
+    )
+
+
+def add_user(row, sign):
+    return (
+        f"INSERT INTO kpi_rollups ({KEY}, kpi_count, progress_sum, progress_count) "
+        f"SELECT coalesce({row}.department, ''), year, quarter, coalesce(category, ''), status, "
+        f"{sign}count(*), {sign}total(progress_percentage), {sign}count(progress_percentage) "
+        f"FROM kpis WHERE user_id = {row}.id GROUP BY 2, 3, 4, 5 {ACCUMULATE}"
+    )
+
+
+TRIGGERS = ("kpis_rollup_ai", "kpis_rollup_ad", "kpis_rollup_au", "users_rollup_au", "users_rollup_bd")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'kpi_rollups',
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('quarter', sa.String(length=10), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('kpi_count', sa.Integer(), nullable=False),
+        sa.Column('progress_sum', sa.Float(), nullable=False),
+        sa.Column('progress_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('department', 'year', 'quarter', 'category', 'status'),
+    )
+
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_ai AFTER INSERT ON kpis "
+        f"BEGIN {add_row('new', '+')} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_ad AFTER DELETE ON kpis "
+        f"BEGIN {add_row('old', '-')} {delete_if_empty('old')} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_au "
+        f"AFTER UPDATE OF user_id, year, quarter, category, status, progress_percentage ON kpis "
+        f"BEGIN {add_row('old', '-')} {add_row('new', '+')} {delete_if_empty('old')} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS users_rollup_au AFTER UPDATE OF department ON users "
+        f"WHEN coalesce(old.department, '') <> coalesce(new.department, '') "
+        f"BEGIN {add_user('old', '-')} {add_user('new', '+')} "
+        f"DELETE FROM kpi_rollups WHERE kpi_count = 0; END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS users_rollup_bd BEFORE DELETE ON users "
+        "BEGIN DELETE FROM kpis WHERE user_id = old.id; END"
+    )
+
+    # Aggregate existing KPIs
+    op.execute(
+        f"INSERT INTO kpi_rollups ({KEY}, kpi_count, progress_sum, progress_count) "
+        "SELECT coalesce(u.department, ''), k.year, k.quarter, coalesce(k.category, ''), k.status, "
+        "count(*), total(k.progress_percentage), count(k.progress_percentage) "
+        "FROM kpis k JOIN users u ON u.id = k.user_id GROUP BY 1, 2, 3, 4, 5"
+    )
+
+    # Overall analytics now read the rollup instead of this index
+    op.drop_index('ix_kpis_year_status_quarter_category', table_name='kpis')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_kpis_year_status_quarter_category',
+        'kpis',
+        ['year', 'status', 'quarter', 'category', 'progress_percentage'],
+        unique=False,
+    )
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('kpi_rollups')
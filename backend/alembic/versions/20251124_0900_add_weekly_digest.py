@@ -0,0 +1,55 @@
+"""add weekly digest runs
+
+Revision ID: 20251124_0900
+Revises: 20251123_0900
+Create Date: 2025-11-24 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251124_0900"
+down_revision: Union[str, None] = "20251123_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'digest_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('period_end', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('last_user_id', sa.Integer(), nullable=False),
+        sa.Column('emails_queued', sa.Integer(), nullable=False),
+        sa.Column('lease_until', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_digest_runs_running',
+        'digest_runs',
+        ['status'],
+        unique=True,
+        sqlite_where=sa.text("status = 'running'"),
+    )
+    op.create_table(
+        'objective_progress_snapshots',
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('objective_id', sa.Integer(), nullable=False),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['digest_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('run_id', 'objective_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('objective_progress_snapshots')
+    op.drop_index('ix_digest_runs_running', table_name='digest_runs')
+    op.drop_table('digest_runs')
@@ -0,0 +1,73 @@
+"""add trigger-maintained unread notification counters
+
+Revision ID: 20251125_0900
+Revises: 20251124_0900
+Create Date: 2025-11-25 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251125_0900"
+down_revision: Union[str, None] = "20251124_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def increment(row):
+    return (
+        "INSERT INTO notification_counters (user_id, unread) "
+        f"SELECT {row}.user_id, 1 WHERE NOT {row}.is_read "
+        "ON CONFLICT(user_id) DO UPDATE SET unread = unread + 1;"
+    )
+
+
+def decrement(row):
+    return (
+        "UPDATE notification_counters SET unread = unread - 1 "
+        f"WHERE user_id = {row}.user_id AND NOT {row}.is_read;"
+    )
+
+
+TRIGGERS = ("notifications_unread_ai", "notifications_unread_ad", "notifications_unread_au")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS notifications_unread_ai AFTER INSERT ON notifications "
+        f"WHEN NOT new.is_read BEGIN {increment('new')} END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS notifications_unread_ad AFTER DELETE ON notifications "
+        f"WHEN NOT old.is_read BEGIN {decrement('old')} END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS notifications_unread_au "
+        "AFTER UPDATE OF user_id, is_read ON notifications "
+        "WHEN old.is_read IS NOT new.is_read OR old.user_id IS NOT new.user_id "
+        f"BEGIN {decrement('old')} {increment('new')} END"
+    )
+
+    # Count existing unread notifications
+    op.execute(
+        "INSERT INTO notification_counters (user_id, unread) "
+        "SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('notification_counters')
@@ -0,0 +1,52 @@
+"""add trigger-maintained data version counters for report cache keys
+
+Revision ID: 20251126_0900
+Revises: 20251125_0900
+Create Date: 2025-11-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251126_0900"
+down_revision: Union[str, None] = "20251125_0900"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def bump(name):
+    return (
+        f"INSERT INTO data_versions (name, version) VALUES ('{name}', 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1;"
+    )
+
+
+TRIGGERS = ("kpis_version_ai", "kpis_version_ad", "kpis_version_au", "users_version_au")
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    op.execute(f"CREATE TRIGGER IF NOT EXISTS kpis_version_ai AFTER INSERT ON kpis BEGIN {bump('kpis')} END")
+    op.execute(f"CREATE TRIGGER IF NOT EXISTS kpis_version_ad AFTER DELETE ON kpis BEGIN {bump('kpis')} END")
+    op.execute(f"CREATE TRIGGER IF NOT EXISTS kpis_version_au AFTER UPDATE ON kpis BEGIN {bump('kpis')} END")
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS users_version_au "
+        "AFTER UPDATE OF username, full_name, email, department, role ON users "
+        f"BEGIN {bump('users')} END"
+    )
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('data_versions')
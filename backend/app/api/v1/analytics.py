@@ -1,23 +1,57 @@
 """Analytics and reporting API endpoints."""
 
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import StreamingResponse
+import os
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status as http_status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
+from app.core.report_jobs import report_filename
 from app.models.user import User
-from app.models.kpi import KPI
+from app.schemas.report import ReportJobCreate, ReportJobResponse
 from app.services.report_service import report_service
-from app.services.pdf_service import pdf_service
-from app.crud.user import user as user_crud
+from app.services.export_service import MEDIA_TYPES, export_service
 from app.crud.kpi import kpi_crud
+from app.utils.etag import etag_matches
+from app.utils.xlsx_export import iter_file
 
 router = APIRouter()
 
+MEDIA_TYPES_BY_REPORT = {
+    "pdf": "application/pdf",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _cached_report(request: Request, db: Session, report_type: str, current_user: User, **params):
+    """
+    Serve a report from the report cache, rendering it on a miss.
+
+    The cache key doubles as a strong ETag: a matching If-None-Match gets a
+    304 after the single version-check query, with nothing rendered or read.
+    """
+    cache_key = report_service.get_report_version(
+        db, report_type=report_type, requester=current_user, **params
+    )
+    headers = {"ETag": f'"{cache_key}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    report = report_service.get_report_file(
+        db, report_type=report_type, requester=current_user, cache_key=cache_key, **params
+    )
+    headers["Content-Length"] = str(os.fstat(report.fileno()).st_size)
+    headers["Content-Disposition"] = f"attachment; filename={report_filename(report_type, params)}"
+    return StreamingResponse(
+        iter_file(report), media_type=MEDIA_TYPES_BY_REPORT[report_type], headers=headers
+    )
+
 
 @router.get("/reports/excel")
 def export_excel_report(
+    request: Request,
     user_id: Optional[int] = Query(None),
     year: Optional[int] = Query(None),
     quarter: Optional[str] = Query(None),
@@ -30,21 +64,15 @@ def export_excel_report(
     if current_user.role == "employee":
         user_id = current_user.id
 
-    excel_file = report_service.generate_excel_report(
-        db, user_id=user_id, year=year, quarter=quarter, status=status
-    )
-
-    filename = f"kpi_report_{year or 'all'}_{quarter or 'all'}.xlsx"
-
-    return StreamingResponse(
-        excel_file,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    return _cached_report(
+        request, db, "excel", current_user,
+        user_id=user_id, year=year, quarter=quarter, status=status
     )
 
 
 @router.get("/reports/pdf")
 def export_pdf_report(
+    request: Request,
     user_id: Optional[int] = Query(None),
     year: Optional[int] = Query(None),
     quarter: Optional[str] = Query(None),
@@ -65,72 +93,78 @@ def export_pdf_report(
     if current_user.role == "employee":
         user_id = current_user.id
 
-    # Get user info for report header
-    if user_id:
-        target_user = user_crud.get(db, user_id=user_id)
-    else:
-        target_user = current_user
-
-    user_info = {
-        "full_name": target_user.full_name or target_user.username,
-        "email": target_user.email,
-        "department": target_user.department or "N/A",
-        "role": target_user.role,
-    }
-
-    # Get KPIs
-    kpis_query = db.query(KPI)
-
-    if user_id:
-        kpis_query = kpis_query.filter(KPI.user_id == user_id)
-
-    if year:
-        kpis_query = kpis_query.filter(KPI.year == year)
-
-    if quarter:
-        kpis_query = kpis_query.filter(KPI.quarter == quarter)
-
-    if status:
-        kpis_query = kpis_query.filter(KPI.status == status)
-
-    kpis = kpis_query.all()
-
-    # Convert KPIs to dict format
-    kpis_data = [
-        {
-            "title": kpi.title,
-            "description": kpi.description,
-            "year": kpi.year,
-            "quarter": kpi.quarter,
-            "target_value": kpi.target_value,
-            "actual_value": kpi.actual_value,
-            "unit": kpi.unit,
-            "status": kpi.status,
-            "category": kpi.category,
-        }
-        for kpi in kpis
-    ]
-
-    # Prepare filters dict
-    filters = {}
-    if year:
-        filters["year"] = year
-    if quarter:
-        filters["quarter"] = quarter
-    if status:
-        filters["status"] = status
-
-    # Generate PDF
-    pdf_buffer = pdf_service.generate_kpi_report(
-        kpis=kpis_data, user_info=user_info, filters=filters
+    return _cached_report(
+        request, db, "pdf", current_user,
+        user_id=user_id, year=year, quarter=quarter, status=status
     )
 
-    filename = f"kpi_report_{year or 'all'}_{quarter or 'all'}.pdf"
 
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+@router.post(
+    "/reports/jobs",
+    response_model=ReportJobResponse,
+    status_code=http_status.HTTP_202_ACCEPTED
+)
+def submit_report_job(
+    job_in: ReportJobCreate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Generate a PDF or Excel report in the background.
+
+    Returns the job at once; poll `GET /reports/jobs/{id}` for status and
+    progress, then fetch the file from `/reports/jobs/{id}/download`.
+    Submitting the same report while it is still being generated returns
+    the existing job. Finished reports are kept for
+    `REPORT_JOB_TTL_HOURS`.
+    """
+    job, _ = report_service.submit_report_job(
+        db,
+        report_type=job_in.report_type,
+        current_user=current_user,
+        user_id=job_in.user_id,
+        year=job_in.year,
+        quarter=job_in.quarter,
+        status=job_in.status,
+    )
+    response.headers["Location"] = str(request.url_for("get_report_job", job_id=job.id))
+    return job
+
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+def get_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get status and progress of a background report."""
+    return report_service.get_report_job(db, job_id, current_user)
+
+
+@router.get("/reports/jobs/{job_id}/download")
+def download_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Download a finished background report."""
+    job = report_service.get_report_job(db, job_id, current_user)
+
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=http_status.HTTP_409_CONFLICT,
+            detail=f"Report is not ready (status: {job.status})"
+        )
+    if not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(
+            status_code=http_status.HTTP_410_GONE,
+            detail="Report file has expired"
+        )
+
+    return FileResponse(
+        job.file_path, media_type=MEDIA_TYPES_BY_REPORT[job.report_type], filename=job.file_name
     )
 
 
@@ -148,3 +182,67 @@ def get_analytics(
 
     analytics = report_service.get_analytics_data(db, user_id=user_id, year=year)
     return analytics
+
+
+@router.get("/analytics/attainment")
+def get_attainment_summary(
+    user_id: Optional[int] = Query(None),
+    year: Optional[int] = Query(None),
+    quarter: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get target/actual totals, average progress and the attainment
+    distribution (progress buckets), aggregated in SQL.
+    """
+    # Employee can only view their own analytics
+    if current_user.role == "employee":
+        user_id = current_user.id
+
+    return kpi_crud.get_value_summary(
+        db, user_id=user_id, year=year, quarter=quarter, status=status
+    )
+
+
+@router.get("/exports/{dataset}")
+def export_dataset(
+    dataset: Literal["kpis", "objectives", "objective-kpi-links", "kpi-history"],
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    user_id: Optional[int] = Query(None),
+    year: Optional[int] = Query(None),
+    quarter: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    department: Optional[str] = Query(None, description="Objectives only"),
+    since: Optional[datetime] = Query(None, description="kpi-history only: changes from this time"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream raw data for BI tools as CSV (with header) or NDJSON.
+
+    Datasets: `kpis`, `objectives` (with their materialized hierarchy
+    `path`, parents first), `objective-kpi-links` and `kpi-history`.
+    Rows are streamed from a server-side cursor, so the download starts
+    immediately and memory does not grow with the row count.
+
+    Employees export their own data only; managers get all KPIs and the
+    objectives of their department.
+    """
+    query = export_service.build_query(
+        dataset,
+        current_user,
+        user_id=user_id,
+        year=year,
+        quarter=quarter,
+        status=status,
+        department=department,
+        since=since,
+    )
+
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        export_service.stream(query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={dataset}.{extension}"}
+    )
@@ -1,7 +1,7 @@
 """Comment API endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
@@ -57,8 +57,10 @@ def create_comment(
 @router.get("/kpis/{kpi_id}/comments", response_model=List[KPICommentResponse])
 def list_comments(
     kpi_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -68,9 +70,10 @@ def list_comments(
     - kpi_id: KPI ID
     - skip: Number of comments to skip (pagination)
     - limit: Maximum number of comments to return
+    - cursor: Value of a previous X-Next-Cursor header (keyset pagination)
 
     **Returns:**
-    - List of comments
+    - List of comments; X-Next-Cursor header is set when more remain
     """
     # Verify KPI exists
     kpi = kpi_crud.get(db, kpi_id=kpi_id)
@@ -87,7 +90,15 @@ def list_comments(
             detail="You can only view comments on your own KPIs"
         )
 
-    comments = kpi_comment_crud.get_by_kpi(db, kpi_id=kpi_id, skip=skip, limit=limit)
+    try:
+        comments, next_cursor = kpi_comment_crud.get_by_kpi(
+            db, kpi_id=kpi_id, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return comments
 
 
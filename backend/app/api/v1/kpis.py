@@ -1,10 +1,13 @@
 """KPI API endpoints."""
 
-from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
+from app.config import settings
 from app.models.user import User
 from app.schemas.kpi import (
     KPICreate,
@@ -14,11 +17,21 @@ from app.schemas.kpi import (
     KPISubmit,
     KPIApprove,
     KPIReject,
+    KPIBulkApprove,
+    KPIBulkReject,
+    KPIBulkActionResponse,
+    KPIRollover,
+    KPIRolloverResponse,
+    KPIMeasurementBulkCreate,
+    KPIMeasurementBulkResponse,
+    KPIIngestResponse,
+    KPITrendResponse,
     KPIStatistics,
     DashboardStatistics,
 )
 from app.schemas.objective import ObjectiveKPILinkResponse
 from app.services.kpi import kpi_service
+from app.utils.kpi_ingest import CONTENT_TYPES
 
 router = APIRouter()
 
@@ -52,14 +65,152 @@ def get_dashboard_statistics(
 def get_pending_approvals(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set false to skip the total count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get KPIs pending approval (managers only).
+
+    Pass `cursor` (from `next_cursor`) for keyset pagination instead of `skip`.
     """
     return kpi_service.get_pending_approvals(
-        db, current_user=current_user, skip=skip, limit=limit
+        db, current_user=current_user, skip=skip, limit=limit,
+        cursor=cursor, include_total=include_total,
+    )
+
+
+@router.get("/trends", response_model=KPITrendResponse)
+def get_trends(
+    kpi_ids: Optional[List[int]] = Query(None),
+    user_id: Optional[int] = Query(None),
+    department: Optional[str] = Query(None),
+    year: Optional[int] = Query(None),
+    quarter: Optional[str] = Query(None, pattern="^Q[1-4]$"),
+    start: Optional[datetime] = Query(None, description="Include measurements from this time"),
+    end: Optional[datetime] = Query(None, description="Include measurements before this time"),
+    bucket: Literal["day", "week", "month"] = Query("week"),
+    aggregate: Literal["last", "avg"] = Query("last"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get downsampled measurement series for one or many KPIs (one query).
+
+    Select KPIs by repeating `kpi_ids` and/or by `user_id`, `department`,
+    `year` and `quarter`; employees only get their own KPIs. Each bucket
+    (weeks start on Monday) holds its last measurement or the average.
+    """
+    return kpi_service.get_trends(
+        db,
+        current_user=current_user,
+        kpi_ids=kpi_ids,
+        user_id=user_id,
+        department=department,
+        year=year,
+        quarter=quarter,
+        start=start,
+        end=end,
+        bucket=bucket,
+        aggregate=aggregate,
+    )
+
+
+@router.post("/measurements", response_model=KPIMeasurementBulkResponse, status_code=201)
+def ingest_measurements(
+    measurement_data: KPIMeasurementBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Record up to 10,000 numeric KPI measurements in one transaction.
+
+    Employees can only record values for their own KPIs. With
+    `update_current` (default), the current value and progress of the
+    caller's own draft or rejected KPIs follow their latest measurement;
+    other KPIs only get the measurements.
+    """
+    return kpi_service.ingest_measurements(
+        db, measurement_data=measurement_data, current_user=current_user
+    )
+
+
+async def _read_body(request: Request, limit: int) -> bytes:
+    """
+    Read a request body of at most ``limit`` bytes, or raise 413.
+
+    A declared Content-Length over the limit is refused before anything is
+    read; otherwise the stream is read with a running count, so a chunked
+    or understated body is cut off as soon as it passes the limit.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="Upload is too large",
+    )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise too_large
+
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post("/ingest", response_model=KPIIngestResponse)
+async def ingest_kpi_values(
+    request: Request,
+    format: Optional[Literal["jsonl", "csv"]] = Query(
+        None, description="Upload format; defaults to the request Content-Type"
+    ),
+    batch_size: int = Query(settings.INGEST_BATCH_SIZE, ge=1, le=10000, description="Rows per commit"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Bulk-update KPI current values from another system.
+
+    The request body is JSON lines (`application/x-ndjson`) or CSV with a
+    header (`text/csv`); each record has `kpi_id` or `external_key`,
+    `value` and an optional ISO 8601 `timestamp`. External keys resolve to
+    the KPI of the timestamp's quarter. Every value is appended to the KPI's
+    measurement series and the current value follows the latest one.
+    As with a KPI edit, only the owner's draft or rejected KPIs can be
+    updated; rows for other KPIs are rejected.
+
+    Rows are committed in batches of `batch_size`; invalid rows are reported
+    in `rejects` with their line number and do not stop the upload.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send JSON lines (application/x-ndjson) or CSV (text/csv), or set format",
+        )
+
+    body = await _read_body(request, settings.MAX_UPLOAD_SIZE)
+    try:
+        content = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload must be UTF-8 encoded",
+        )
+
+    # Keep the event loop free while batches are written
+    return await run_in_threadpool(
+        kpi_service.ingest_values,
+        db,
+        content=content,
+        fmt=fmt,
+        batch_size=batch_size,
+        current_user=current_user,
     )
 
 
@@ -72,6 +223,8 @@ def get_kpis(
     quarter: Optional[str] = Query(None, pattern="^Q[1-4]$"),
     status: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set false to skip the total count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -86,7 +239,11 @@ def get_kpis(
     - year: Filter by year
     - quarter: Filter by quarter (Q1, Q2, Q3, Q4)
     - status: Filter by status (draft, submitted, approved, rejected)
-    - search: Search in title and description
+    - search: Full-text word-prefix search in title and description
+
+    Pagination:
+    - cursor: Keyset cursor (`next_cursor` of the previous page); replaces skip
+    - include_total: Set false for infinite scroll to skip the COUNT query
     """
     return kpi_service.get_kpis(
         db,
@@ -98,6 +255,8 @@ def get_kpis(
         quarter=quarter,
         status=status,
         search=search,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -178,6 +337,63 @@ def submit_kpi(
     )
 
 
+@router.post("/rollover", response_model=KPIRolloverResponse)
+def rollover_kpis(
+    rollover_data: KPIRollover,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Open a new period by creating draft KPIs in bulk (managers only).
+
+    - source=previous: clone each user's KPIs from the previous quarter
+      (or source_year/source_quarter), copying their objective links
+    - source=templates: instantiate active templates matching each user's
+      role, optionally limited to `categories`
+
+    Users are selected by `department` and/or `user_ids`; managers are
+    limited to their own department. KPIs whose title already exists for the
+    user in the target period are skipped. Use `dry_run` to preview.
+    """
+    return kpi_service.rollover_kpis(
+        db, rollover_data=rollover_data, current_user=current_user
+    )
+
+
+@router.post("/bulk/approve", response_model=KPIBulkActionResponse)
+def bulk_approve_kpis(
+    approve_data: KPIBulkApprove,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Approve up to 1000 submitted KPIs at once (managers only).
+
+    All changes are committed in one transaction. KPIs that are missing or
+    not in 'submitted' status are reported as failed items.
+    """
+    return kpi_service.bulk_approve_kpis(
+        db, approve_data=approve_data, current_user=current_user
+    )
+
+
+@router.post("/bulk/reject", response_model=KPIBulkActionResponse)
+def bulk_reject_kpis(
+    reject_data: KPIBulkReject,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Reject up to 1000 submitted KPIs at once with a shared reason (managers only).
+
+    All changes are committed in one transaction. KPIs that are missing or
+    not in 'submitted' status are reported as failed items.
+    """
+    return kpi_service.bulk_reject_kpis(
+        db, reject_data=reject_data, current_user=current_user
+    )
+
+
 @router.post("/{kpi_id}/approve", response_model=KPIResponse)
 def approve_kpi(
     kpi_id: int,
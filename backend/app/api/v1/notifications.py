@@ -1,26 +1,32 @@
 """Notification API endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, require_admin
 from app.models.user import User
 from app.schemas.notification import (
+    BroadcastResult,
+    NotificationBroadcast,
     NotificationResponse,
     NotificationUpdate,
     UnreadCount
 )
 from app.crud.notification import notification_crud
+from app.utils.etag import etag_matches
+from app.services.notification_service import notification_service
 
 router = APIRouter()
 
 
 @router.get("/notifications", response_model=List[NotificationResponse])
 def list_notifications(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     unread_only: bool = False,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -30,31 +36,74 @@ def list_notifications(
     - skip: Number of notifications to skip (pagination)
     - limit: Maximum number of notifications to return
     - unread_only: Only return unread notifications
+    - cursor: Value of a previous X-Next-Cursor header (keyset pagination)
 
     **Returns:**
-    - List of notifications
+    - List of notifications; X-Next-Cursor header is set when more remain
     """
-    notifications = notification_crud.get_by_user(
-        db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        unread_only=unread_only
-    )
+    try:
+        notifications, next_cursor = notification_crud.get_by_user(
+            db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            unread_only=unread_only,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return notifications
 
 
 @router.get("/notifications/unread-count", response_model=UnreadCount)
 def get_unread_count(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get count of unread notifications for current user.
 
+    The count is read from a per-user counter and is its own ETag, so
+    unchanged polls get a 304.
+
     **Returns:**
     - Count of unread notifications
     """
     count = notification_crud.count_unread(db, user_id=current_user.id)
+    headers = {"ETag": f'"unread-{count}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return {"count": count}
+
+
+@router.post("/notifications/broadcast", response_model=BroadcastResult)
+def broadcast_notification(
+    broadcast_in: NotificationBroadcast,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Send an in-app notification to every active user with a role and/or in a department (admin only).
+
+    **Args:**
+    - broadcast_in: Notification plus optional roles and department filters
+
+    **Returns:**
+    - Number of users notified
+    """
+    count = notification_service.broadcast(
+        db,
+        title=broadcast_in.title,
+        message=broadcast_in.message,
+        type=broadcast_in.type or "info",
+        link=broadcast_in.link,
+        roles=broadcast_in.roles,
+        department=broadcast_in.department
+    )
     return {"count": count}
 
 
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_active_user
 from app.models.user import User
-from app.models.objective import Objective, ObjectiveKPILink
+from app.models.objective import Objective
 from app.schemas.objective import (
     ObjectiveCreate,
     ObjectiveUpdate,
@@ -22,6 +22,7 @@ from app.schemas.objective import (
     ObjectiveKPILinkResponse,
 )
 from app.crud.objective import objective_crud
+from app.core.progress_rollup import objective_rollup_queue
 
 router = APIRouter()
 
@@ -83,12 +84,16 @@ def list_objectives(
     quarter: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Set false to skip the total count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     List objectives with filters.
 
+    Pass `cursor` (from `next_cursor`) for keyset pagination instead of `skip`.
+
     Permissions:
     - Admin: Can see all objectives
     - Manager: Can see all objectives in their department
@@ -102,10 +107,7 @@ def list_objectives(
         if not department:
             department = current_user.department
 
-    objectives = objective_crud.get_multi(
-        db,
-        skip=skip,
-        limit=limit,
+    filters = dict(
         owner_id=owner_id,
         level=level,
         year=year,
@@ -113,50 +115,39 @@ def list_objectives(
         status=status,
         department=department,
     )
+    try:
+        rows, next_cursor = objective_crud.get_multi_with_details(
+            db, skip=skip, limit=limit, cursor=cursor, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Enrich with details
     items = []
-    for objective in objectives:
+    for objective, owner_name, parent_title, children_count, kpi_count in rows:
         detail = ObjectiveDetail.model_validate(objective)
-
-        # Add owner name
-        if objective.owner:
-            detail.owner_name = objective.owner.full_name or objective.owner.username
-
-        # Add parent title
-        if objective.parent:
-            detail.parent_title = objective.parent.title
-
-        # Count children and KPIs
-        detail.children_count = len(objective_crud.get_children(db, objective.id))
-        detail.kpi_count = len(objective_crud.get_linked_kpis(db, objective.id))
-
+        detail.owner_name = owner_name
+        detail.parent_title = parent_title
+        detail.children_count = children_count
+        detail.kpi_count = kpi_count
         items.append(detail)
 
     # Get total count (without pagination)
-    total_objectives = objective_crud.get_multi(
-        db,
-        skip=0,
-        limit=10000,  # Large number to get all
-        owner_id=owner_id,
-        level=level,
-        year=year,
-        quarter=quarter,
-        status=status,
-        department=department,
-    )
-    total = len(total_objectives)
+    total = objective_crud.count(db, **filters) if include_total else None
 
     # Calculate pagination
     page = (skip // limit) + 1 if limit > 0 else 1
-    total_pages = (total + limit - 1) // limit if limit > 0 else 1
+    total_pages = None
+    if total is not None:
+        total_pages = (total + limit - 1) // limit if limit > 0 else 1
 
     return ObjectiveListResponse(
         items=items,
         total=total,
         page=page,
         page_size=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -236,7 +227,17 @@ def update_objective(
             if not parent:
                 raise HTTPException(status_code=404, detail="Parent objective not found")
 
-    updated_objective = objective_crud.update(db, db_obj=objective, obj_in=objective_in)
+    old_parent_id = objective.parent_id
+    try:
+        updated_objective = objective_crud.update(db, db_obj=objective, obj_in=objective_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if updated_objective.parent_id != old_parent_id:
+        # Re-parented: refresh the old and new ancestors, as for a move
+        objective_rollup_queue.enqueue(
+            objective_ids=[objective_id] + ([old_parent_id] if old_parent_id else [])
+        )
     return updated_objective
 
 
@@ -273,7 +274,11 @@ def delete_objective(
                 status_code=403, detail="Not authorized to delete this objective"
             )
 
+    parent_id = objective.parent_id
     objective_crud.delete(db, objective_id=objective_id)
+    if parent_id:
+        # The parent (and its ancestors) lost a child
+        objective_rollup_queue.enqueue(objective_ids=[parent_id])
     return None
 
 
@@ -344,6 +349,60 @@ def get_objective_tree(
         return [build_tree_node(tree)]
 
 
+def _build_cascade_nodes(db: Session, roots: List[Objective]) -> List[ObjectiveCascadeNode]:
+    """
+    Build cascade trees (objectives + linked KPIs) for the given roots.
+
+    Subtrees, owner names and KPI links are bulk-loaded in a fixed number of
+    queries and assembled in memory, independent of tree size.
+    """
+    rows = objective_crud.get_subtrees(db, [root.id for root in roots])
+    objectives = {obj.id: obj for obj, _ in rows}
+    owner_names = {obj.id: owner_name for obj, owner_name in rows}
+
+    children_by_parent: dict[int, List[Objective]] = {}
+    for obj, _ in rows:
+        if obj.parent_id in objectives:
+            children_by_parent.setdefault(obj.parent_id, []).append(obj)
+
+    kpis_by_objective: dict[int, List[KPISummary]] = {}
+    for objective_id, weight, kpi in objective_crud.get_kpi_links_bulk(db, list(objectives)):
+        kpis_by_objective.setdefault(objective_id, []).append(KPISummary(
+            id=kpi.id,
+            title=kpi.title,
+            progress_percentage=kpi.progress_percentage or 0.0,
+            target_value=kpi.target_numeric,
+            current_value=kpi.current_numeric,
+            unit=kpi.unit,
+            weight=weight if weight is not None else 1.0
+        ))
+
+    def build_node(obj: Objective) -> ObjectiveCascadeNode:
+        kpis = kpis_by_objective.get(obj.id, [])
+        children = children_by_parent.get(obj.id, [])
+
+        return ObjectiveCascadeNode(
+            id=obj.id,
+            title=obj.title,
+            description=obj.description,
+            level=obj.level,
+            progress_percentage=obj.progress_percentage,
+            status=obj.status,
+            year=obj.year,
+            quarter=obj.quarter,
+            owner_id=obj.owner_id,
+            owner_name=owner_names.get(obj.id),
+            department=obj.department,
+            kpi_count=len(kpis),
+            children_count=len(children),
+            is_featured=bool(obj.is_featured),
+            kpis=kpis,
+            children=[build_node(child) for child in children]
+        )
+
+    return [build_node(objectives[root.id]) for root in roots if root.id in objectives]
+
+
 @router.get("/cascade/view", response_model=List[ObjectiveCascadeNode])
 def get_objectives_cascade(
     year: Optional[int] = Query(None, description="Filter by year"),
@@ -370,54 +429,7 @@ def get_objectives_cascade(
     # Get objectives at top level
     top_objectives = query.all()
 
-    def build_cascade_node(obj: Objective) -> ObjectiveCascadeNode:
-        """Recursively build cascade node with KPIs and children."""
-        # Get owner name
-        owner_name = obj.owner.full_name if obj.owner else None
-
-        # Get linked KPIs
-        kpi_links = objective_crud.get_linked_kpis(db, obj.id)
-        kpis = []
-        for kpi in kpi_links:
-            # Get weight from link
-            link = db.query(ObjectiveKPILink).filter(
-                ObjectiveKPILink.objective_id == obj.id,
-                ObjectiveKPILink.kpi_id == kpi.id
-            ).first()
-
-            kpis.append(KPISummary(
-                id=kpi.id,
-                title=kpi.title,
-                progress_percentage=kpi.progress_percentage or 0.0,
-                target_value=kpi.target_value,
-                current_value=kpi.current_value,
-                unit=kpi.unit,
-                weight=link.weight if link else 1.0
-            ))
-
-        # Get children objectives
-        children = objective_crud.get_children(db, obj.id)
-
-        return ObjectiveCascadeNode(
-            id=obj.id,
-            title=obj.title,
-            description=obj.description,
-            level=obj.level,
-            progress_percentage=obj.progress_percentage,
-            status=obj.status,
-            year=obj.year,
-            quarter=obj.quarter,
-            owner_id=obj.owner_id,
-            owner_name=owner_name,
-            department=obj.department,
-            kpi_count=len(kpis),
-            children_count=len(children),
-            is_featured=bool(obj.is_featured),
-            kpis=kpis,
-            children=[build_cascade_node(child) for child in children]
-        )
-
-    return [build_cascade_node(obj) for obj in top_objectives]
+    return _build_cascade_nodes(db, top_objectives)
 
 
 @router.get("/featured", response_model=List[ObjectiveCascadeNode])
@@ -427,55 +439,9 @@ def get_featured_objectives(
     current_user: User = Depends(get_current_active_user),
 ):
     """Get all featured/pinned objectives with their KPIs and children."""
-    from app.models.objective import ObjectiveKPILink
-
     featured = objective_crud.get_featured(db, year=year)
 
-    def build_cascade_node(obj: Objective) -> ObjectiveCascadeNode:
-        """Build cascade node with KPIs and children."""
-        owner_name = obj.owner.full_name if obj.owner else None
-
-        # Get linked KPIs
-        kpi_links = objective_crud.get_linked_kpis(db, obj.id)
-        kpis = []
-        for kpi in kpi_links:
-            link = db.query(ObjectiveKPILink).filter(
-                ObjectiveKPILink.objective_id == obj.id,
-                ObjectiveKPILink.kpi_id == kpi.id
-            ).first()
-
-            kpis.append(KPISummary(
-                id=kpi.id,
-                title=kpi.title,
-                progress_percentage=kpi.progress_percentage or 0.0,
-                target_value=kpi.target_value,
-                current_value=kpi.current_value,
-                unit=kpi.unit,
-                weight=link.weight if link else 1.0
-            ))
-
-        children = objective_crud.get_children(db, obj.id)
-
-        return ObjectiveCascadeNode(
-            id=obj.id,
-            title=obj.title,
-            description=obj.description,
-            level=obj.level,
-            progress_percentage=obj.progress_percentage,
-            status=obj.status,
-            year=obj.year,
-            quarter=obj.quarter,
-            owner_id=obj.owner_id,
-            owner_name=owner_name,
-            department=obj.department,
-            kpi_count=len(kpis),
-            children_count=len(children),
-            is_featured=bool(obj.is_featured),
-            kpis=kpis,
-            children=[build_cascade_node(child) for child in children]
-        )
-
-    return [build_cascade_node(obj) for obj in featured]
+    return _build_cascade_nodes(db, featured)
 
 
 @router.post("/{objective_id}/toggle-featured", response_model=ObjectiveResponse)
@@ -516,16 +482,24 @@ def move_objective(
             status_code=403, detail="Only admins can move objectives"
         )
 
+    objective = objective_crud.get(db, objective_id)
+    if not objective:
+        raise HTTPException(status_code=404, detail="Objective not found")
+    old_parent_id = objective.parent_id
+
     try:
         objective = objective_crud.move(
             db, objective_id=objective_id, new_parent_id=new_parent_id
         )
-        if not objective:
-            raise HTTPException(status_code=404, detail="Objective not found")
-        return objective
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    # The moved objective seeds its new ancestors; the old parent its old ones
+    objective_rollup_queue.enqueue(
+        objective_ids=[objective_id] + ([old_parent_id] if old_parent_id else [])
+    )
+    return objective
+
 
 # KPI Linking Endpoints
 @router.post("/{objective_id}/kpis", response_model=ObjectiveKPILinkResponse, status_code=201)
@@ -549,6 +523,7 @@ def link_kpi_to_objective(
     link = objective_crud.link_kpi(
         db, objective_id=objective_id, kpi_id=link_in.kpi_id, weight=link_in.weight
     )
+    objective_rollup_queue.enqueue(objective_ids=[objective_id])
     return link
 
 
@@ -574,6 +549,7 @@ def unlink_kpi_from_objective(
     if not success:
         raise HTTPException(status_code=404, detail="Link not found")
 
+    objective_rollup_queue.enqueue(objective_ids=[objective_id])
     return None
 
 
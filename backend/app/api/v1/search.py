@@ -0,0 +1,37 @@
+"""Full-text search API endpoints."""
+
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_active_user
+from app.models.user import User
+from app.schemas.search import SearchResponse
+from app.crud.search import search_crud
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    types: Optional[List[Literal["kpi", "objective", "comment"]]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Ranked full-text search across KPIs, objectives and KPI comments.
+
+    Every word is matched as a prefix ("rev gro" finds "Revenue growth").
+    `snippet` is HTML: the matched text is HTML-escaped and matches are
+    wrapped in `<mark>`, so it can be inserted as markup as is. `title` is
+    plain text and must be escaped like any other field.
+
+    Permissions:
+    - Admin/Manager: All KPIs, objectives and comments
+    - Employee: Only their own KPIs and objectives, and comments on their KPIs
+    """
+    owner_id = current_user.id if current_user.role == "employee" else None
+    items = search_crud.search(db, term=q, kinds=types, owner_id=owner_id, limit=limit)
+    return SearchResponse(query=q, items=items)
@@ -66,6 +66,24 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     SMTP_FROM: str = "noreply@company.com"
     SMTP_TLS: bool = True
+    SMTP_TIMEOUT: float = 30.0
+    SMTP_POOL_SIZE: int = 2  # connections kept open for reuse
+    SMTP_POOL_IDLE_SECONDS: float = 60.0  # idle connections are closed after this
+    SMTP_POOL_CHECK_SECONDS: float = 15.0  # idle connections are checked with NOOP after this
+
+    # Email outbox delivery
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50  # emails claimed per poll
+    EMAIL_OUTBOX_POLL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 600  # claimed emails are retried after this if undelivered
+    EMAIL_SEND_RATE: float = 5.0  # emails per second, 0 for no limit
+    EMAIL_MAX_ATTEMPTS: int = 8  # then the email is dead-lettered
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0  # doubled after each failed attempt
+    EMAIL_RETRY_MAX_SECONDS: float = 3600.0
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 7  # sent emails are kept this long
+
+    # Weekly digest
+    DIGEST_BATCH_SIZE: int = 200  # digests queued per checkpoint
+    DIGEST_LEASE_SECONDS: int = 900  # an unfinished run is resumed after this
 
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -76,6 +94,22 @@ class Settings(BaseSettings):
     ENABLE_DOCS: bool = True
     ENABLE_NOTIFICATIONS: bool = True
 
+    # Objective progress rollup (debounced after KPI writes)
+    ROLLUP_DEBOUNCE_SECONDS: float = 2.0
+    ROLLUP_MAX_DELAY_SECONDS: float = 10.0
+
+    # Bulk KPI value ingest
+    INGEST_BATCH_SIZE: int = 1000  # rows per commit
+    INGEST_MAX_ROWS: int = 200000
+
+    # Background report jobs
+    REPORT_DIR: str = "/data/reports"
+    REPORT_WORKERS: int = 2  # render processes
+    REPORT_MAX_PENDING: int = 20  # queued + running jobs before submissions are refused
+    REPORT_JOB_TTL_HOURS: int = 24  # finished jobs and their files are kept this long
+    REPORT_CACHE_DIR: str = "/data/reports/cache"
+    REPORT_CACHE_MAX_SIZE: int = 524288000  # 500MB, least recently used reports go first
+
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
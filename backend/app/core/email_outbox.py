@@ -0,0 +1,257 @@
+"""Asynchronous delivery of queued emails from the outbox table."""
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+import aiosmtplib
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.crud.email_outbox import outbox_email_crud
+from app.models.email_outbox import OutboxEmail
+from app.utils.email import email_service
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """True for SMTP failures that retrying cannot fix (5xx replies)."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(500 <= e.code < 600 for e in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 500 <= error.code < 600
+    return False
+
+
+class EmailOutboxWorker:
+    """
+    Deliver outbox emails on the event loop.
+
+    Requests only insert outbox rows, in their own transaction, and wake
+    the worker. The worker claims due rows in batches, sends each batch
+    over one pooled SMTP connection at no more than ``rate`` emails per
+    second and records the outcome. Temporary failures are retried with
+    exponential backoff; an email rejected permanently or failing
+    ``max_attempts`` times is dead-lettered. Claims are leased, so emails
+    claimed by a process that died are picked up again once the lease
+    runs out.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        poll_interval: float,
+        lease: float,
+        rate: float,
+        max_attempts: int,
+        retry_base: float,
+        retry_max: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = timedelta(seconds=lease)
+        self.rate = rate
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._next_send = 0.0
+
+    def enqueue(
+        self,
+        db: Session,
+        *,
+        to_emails: List[str],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+        notification_id: Optional[int] = None,
+    ) -> Optional[OutboxEmail]:
+        """
+        Queue an email for delivery. Returns None if email is disabled.
+
+        Inside a unit_of_work the email commits (or rolls back) with the
+        caller's writes, and the worker is woken once it is committed.
+        """
+        if not email_service.enabled:
+            logger.debug("Email service is disabled. Email not queued.")
+            return None
+
+        if not to_emails:
+            logger.warning("No recipients specified. Email not queued.")
+            return None
+
+        message = outbox_email_crud.create(
+            db,
+            to_emails=to_emails,
+            subject=subject,
+            body_html=body_html,
+            body_text=body_text,
+            notification_id=notification_id,
+        )
+        self._wake_after_commit(db)
+        return message
+
+    def enqueue_many(self, db: Session, messages: List[dict]) -> int:
+        """
+        Queue many emails in one insert. Returns the number queued.
+
+        Each message is a dict of ``enqueue``'s keyword arguments; messages
+        without recipients are skipped. Transactions behave as in ``enqueue``.
+        """
+        if not email_service.enabled:
+            logger.debug("Email service is disabled. Emails not queued.")
+            return 0
+
+        queued = outbox_email_crud.create_many(db, [m for m in messages if m["to_emails"]])
+        if queued:
+            self._wake_after_commit(db)
+        return queued
+
+    def wake(self) -> None:
+        """Make the worker poll now. Safe to call from any thread."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run(), name="email-outbox")
+        logger.info("Email outbox worker started")
+
+    async def stop(self) -> None:
+        """Stop the worker after the email being sent, if any."""
+        self._stopping = True
+        if self._task:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=self.poll_interval + 30)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+            await email_service.smtp_pool.close()
+        self._loop = self._wakeup = None
+        logger.info("Email outbox worker stopped")
+
+    async def process_batch(self) -> int:
+        """Claim and deliver one batch of due emails. Returns the number claimed."""
+        rows = await asyncio.to_thread(self._claim)
+        if not rows:
+            return 0
+
+        # The whole batch goes over one pooled SMTP connection
+        async with email_service.smtp_pool.session() as smtp:
+            for index, row in enumerate(rows):
+                if self._stopping:
+                    # Hand the rest back untouched rather than waiting for the lease
+                    await asyncio.to_thread(self._release, [r.id for r in rows[index:]])
+                    break
+                await self._throttle()
+                try:
+                    await smtp.send(email_service.build_message(
+                        json.loads(row.recipients), row.subject, row.body_html, row.body_text
+                    ))
+                except Exception as e:
+                    await asyncio.to_thread(self._record_failure, row, e)
+                else:
+                    await asyncio.to_thread(self._record_sent, row.id)
+        return len(rows)
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait after the ``attempts``-th failed attempt."""
+        return min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                claimed = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Error delivering queued emails: {e}")
+                claimed = 0
+
+            # A full batch means more may be due already
+            if claimed < self.batch_size and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    await email_service.smtp_pool.prune()
+
+    def _wake_after_commit(self, db: Session) -> None:
+        if db.info.get("unit_of_work"):
+            event.listen(db, "after_commit", lambda session: self.wake(), once=True)
+        else:
+            self.wake()
+
+    async def _throttle(self) -> None:
+        if self.rate <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        if self._next_send > now:
+            await asyncio.sleep(self._next_send - now)
+        self._next_send = max(now, self._next_send) + 1 / self.rate
+
+    def _claim(self) -> list:
+        db = SessionLocal()
+        try:
+            return outbox_email_crud.claim_due(db, limit=self.batch_size, lease=self.lease)
+        finally:
+            db.close()
+
+    def _release(self, message_ids: List[int]) -> None:
+        db = SessionLocal()
+        try:
+            outbox_email_crud.release(db, message_ids)
+        finally:
+            db.close()
+
+    def _record_sent(self, message_id: int) -> None:
+        db = SessionLocal()
+        try:
+            outbox_email_crud.mark_sent(db, message_id)
+        finally:
+            db.close()
+
+    def _record_failure(self, row, error: Exception) -> None:
+        message = str(error) or type(error).__name__
+        if _is_permanent(error) or row.attempts >= self.max_attempts:
+            retry_at = None
+            logger.error(f"Email {row.id} dead-lettered after {row.attempts} attempts: {message}")
+        else:
+            retry_at = _utcnow() + timedelta(seconds=self.retry_delay(row.attempts))
+            logger.warning(f"Email {row.id} failed (attempt {row.attempts}), retrying: {message}")
+
+        db = SessionLocal()
+        try:
+            outbox_email_crud.mark_failed(db, row.id, error=message, retry_at=retry_at)
+        finally:
+            db.close()
+
+
+# Global email outbox worker instance
+email_outbox_worker = EmailOutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    lease=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    rate=settings.EMAIL_SEND_RATE,
+    max_attempts=settings.EMAIL_MAX_ATTEMPTS,
+    retry_base=settings.EMAIL_RETRY_BASE_SECONDS,
+    retry_max=settings.EMAIL_RETRY_MAX_SECONDS,
+)
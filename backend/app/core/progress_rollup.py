@@ -0,0 +1,129 @@
+"""Debounced background propagation of KPI progress into objectives."""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.crud.objective import objective_crud
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectiveRollupQueue:
+    """
+    Coalesce KPI/objective changes and roll them up off the request path.
+
+    Writers only add ids to an in-memory set. A worker thread waits until
+    no new ids have arrived for ``debounce`` seconds (or ``max_delay``
+    seconds have passed since the first one) and then runs a single
+    batched rollup for the whole burst.
+    """
+
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._kpi_ids: set = set()
+        self._objective_ids: set = set()
+        self._first_enqueued: Optional[float] = None
+        self._last_enqueued: Optional[float] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def enqueue(
+        self, *, kpi_ids: Iterable[int] = (), objective_ids: Iterable[int] = ()
+    ) -> None:
+        """Schedule a rollup for changed KPIs and/or objectives."""
+        with self._condition:
+            self._kpi_ids.update(kpi_ids)
+            self._objective_ids.update(objective_ids)
+            now = time.monotonic()
+            if self._first_enqueued is None:
+                self._first_enqueued = now
+            self._last_enqueued = now
+            self._condition.notify()
+
+    def start(self) -> None:
+        """Start the background worker thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="objective-rollup", daemon=True
+        )
+        self._thread.start()
+        logger.info("Objective rollup worker started")
+
+    def stop(self) -> None:
+        """Stop the worker and roll up anything still pending."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=30)
+            self._thread = None
+        self.flush()
+        logger.info("Objective rollup worker stopped")
+
+    def flush(self) -> Dict[int, float]:
+        """Roll up all pending changes now (in the calling thread)."""
+        kpi_ids, objective_ids = self._drain()
+        if not kpi_ids and not objective_ids:
+            return {}
+
+        db = SessionLocal()
+        try:
+            changed = objective_crud.rollup_progress(
+                db, objective_ids=objective_ids, kpi_ids=kpi_ids
+            )
+            logger.info(
+                f"Rolled up {len(kpi_ids)} KPIs / {len(objective_ids)} objectives, "
+                f"{len(changed)} objectives updated"
+            )
+            return changed
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error rolling up objective progress: {e}")
+            return {}
+        finally:
+            db.close()
+
+    def _drain(self) -> tuple:
+        """Take the pending id sets and reset the debounce window."""
+        with self._condition:
+            kpi_ids, objective_ids = self._kpi_ids, self._objective_ids
+            self._kpi_ids, self._objective_ids = set(), set()
+            self._first_enqueued = self._last_enqueued = None
+        return kpi_ids, objective_ids
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping and self._first_enqueued is None:
+                    self._condition.wait()
+
+                # Wait for the burst to go quiet, bounded by max_delay
+                while not self._stopping:
+                    due = min(
+                        self._last_enqueued + self.debounce,
+                        self._first_enqueued + self.max_delay,
+                    )
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                if self._stopping:
+                    return
+
+            self.flush()
+
+
+# Global rollup queue instance
+objective_rollup_queue = ObjectiveRollupQueue(
+    debounce=settings.ROLLUP_DEBOUNCE_SECONDS,
+    max_delay=settings.ROLLUP_MAX_DELAY_SECONDS,
+)
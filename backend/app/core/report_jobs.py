@@ -0,0 +1,198 @@
+"""Background rendering of PDF/Excel reports in a process pool."""
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database import SessionLocal
+from app.crud.report_job import report_job_crud
+from app.crud.user import user as user_crud
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"pdf": "pdf", "excel": "xlsx"}
+
+
+def _ttl() -> timedelta:
+    return timedelta(hours=settings.REPORT_JOB_TTL_HOURS)
+
+
+def report_filename(report_type: str, params: dict) -> str:
+    """Download name of a report, as used by the synchronous endpoints."""
+    return (
+        f"kpi_report_{params.get('year') or 'all'}_{params.get('quarter') or 'all'}"
+        f".{EXTENSIONS[report_type]}"
+    )
+
+
+def render_report_job(job_id: str) -> None:
+    """
+    Render one report job to REPORT_DIR. Runs in a pool worker process.
+
+    The job row is the only input: it is claimed (queued -> running), the
+    report is written to a temporary name and renamed into place, and the
+    row is completed or failed. A job that is no longer queued is skipped.
+    """
+    # Imported here: services import this module for the queue
+    from app.services.report_service import report_service
+
+    db = SessionLocal()
+    try:
+        job = report_job_crud.start(db, job_id)
+        if job is None:
+            return
+        params = json.loads(job.params)
+
+        # Reuse a cached rendering of the same report and data if there is one
+        requester = user_crud.get(db, user_id=job.requested_by)
+        cache_key = report_service.get_report_version(
+            db, report_type=job.report_type, requester=requester, **params
+        )
+        report = report_service.get_report_file(
+            db, report_type=job.report_type, requester=requester, cache_key=cache_key, **params
+        )
+        report_job_crud.set_progress(db, job_id, 90)
+
+        os.makedirs(settings.REPORT_DIR, exist_ok=True)
+        path = os.path.join(settings.REPORT_DIR, f"{job_id}.{EXTENSIONS[job.report_type]}")
+        with report, open(f"{path}.part", "wb") as out:
+            shutil.copyfileobj(report, out)
+        os.replace(f"{path}.part", path)
+
+        report_job_crud.complete(
+            db,
+            job_id,
+            file_path=path,
+            file_name=report_filename(job.report_type, params),
+            file_size=os.path.getsize(path),
+            ttl=_ttl(),
+        )
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"Report job {job_id} failed")
+        report_job_crud.fail(db, job_id=job_id, error=str(e) or type(e).__name__, ttl=_ttl())
+    finally:
+        db.close()
+
+
+class ReportJobQueue:
+    """
+    Run report jobs in a bounded process pool.
+
+    Rendering is CPU-bound (reportlab, xlsxwriter), so it runs in worker
+    processes rather than on the event loop or its thread pool. At most
+    ``max_workers`` reports render at once and at most ``max_pending`` jobs
+    are accepted before submissions are refused. Workers are spawned, not
+    forked, so they never inherit the server's open database connections.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted jobs not yet finished."""
+        with self._lock:
+            return len(self._futures)
+
+    def is_full(self) -> bool:
+        """True if no more jobs should be accepted."""
+        return self.pending >= self.max_pending
+
+    def start(self) -> None:
+        """Start the pool and fail jobs left over from a previous run."""
+        os.makedirs(settings.REPORT_DIR, exist_ok=True)
+        db = SessionLocal()
+        try:
+            count = report_job_crud.fail(db, error="Interrupted by server restart", ttl=_ttl())
+            if count:
+                logger.warning(f"Marked {count} interrupted report jobs as failed")
+        finally:
+            db.close()
+        with self._lock:
+            self._ensure_executor()
+        logger.info(f"Report job pool started ({self.max_workers} workers)")
+
+    def stop(self) -> None:
+        """Cancel queued jobs and stop the pool once running jobs finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        logger.info("Report job pool stopped")
+
+    def submit(self, job_id: str) -> None:
+        """Queue a job for rendering."""
+        with self._lock:
+            try:
+                future = self._ensure_executor().submit(render_report_job, job_id)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool
+                logger.error("Report job pool is broken, restarting it")
+                self._executor = None
+                future = self._ensure_executor().submit(render_report_job, job_id)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def cleanup(self) -> int:
+        """Delete expired jobs and their files. Returns the number of jobs."""
+        db = SessionLocal()
+        try:
+            paths = report_job_crud.delete_expired(db)
+        finally:
+            db.close()
+        for path in paths:
+            if path:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return len(paths)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+        # Failures inside the job are recorded by the worker itself; this
+        # covers jobs that never ran or whose worker died
+        if future.cancelled():
+            error = "Cancelled by server shutdown"
+        elif future.exception() is not None:
+            error = str(future.exception()) or type(future.exception()).__name__
+        else:
+            return
+
+        db = SessionLocal()
+        try:
+            report_job_crud.fail(db, job_id=job_id, error=error, ttl=_ttl())
+        except Exception as e:
+            logger.error(f"Error marking report job {job_id} as failed: {e}")
+        finally:
+            db.close()
+
+
+# Global report job queue instance
+report_job_queue = ReportJobQueue(
+    max_workers=settings.REPORT_WORKERS,
+    max_pending=settings.REPORT_MAX_PENDING,
+)
@@ -2,11 +2,18 @@
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timezone
 import logging
 
+from app.config import settings
 from app.database import SessionLocal
+from app.crud.email_outbox import outbox_email_crud
 from app.crud.notification import notification_crud
+from app.crud.objective import objective_crud
+from app.crud.kpi_rollup import kpi_rollup_crud
+from app.core.report_jobs import report_job_queue
+from app.core.weekly_digest import run_weekly_digest
 
 logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
@@ -23,6 +30,88 @@ def cleanup_old_notifications():
         logger.error(f"Error cleaning notifications: {e}")
 
 
+def repair_objective_progress():
+    """Recompute progress of all objectives in the current year."""
+    try:
+        db = SessionLocal()
+        changed = objective_crud.rollup_year(db, datetime.now(timezone.utc).year)
+        logger.info(f"Objective progress repair updated {len(changed)} objectives")
+        db.close()
+    except Exception as e:
+        logger.error(f"Error repairing objective progress: {e}")
+
+
+def rebuild_kpi_rollups():
+    """Recompute the KPI rollup table and report any drift from the triggers."""
+    try:
+        db = SessionLocal()
+        result = kpi_rollup_crud.rebuild(db)
+        if result["drifted"]:
+            logger.warning(
+                f"KPI rollup rebuilt: {result['drifted']} of {result['groups']} groups had drifted"
+            )
+        else:
+            logger.info(f"KPI rollup verified: {result['groups']} groups")
+        db.close()
+    except Exception as e:
+        logger.error(f"Error rebuilding KPI rollup: {e}")
+
+
+def reconcile_unread_counts():
+    """Recompute unread notification counters and report any drift from the triggers."""
+    try:
+        db = SessionLocal()
+        result = notification_crud.reconcile_unread_counts(db)
+        if result["drifted"]:
+            logger.warning(
+                f"Unread counters repaired: {result['drifted']} of {result['users']} users had drifted"
+            )
+        else:
+            logger.info(f"Unread counters verified: {result['users']} users")
+        db.close()
+    except Exception as e:
+        logger.error(f"Error reconciling unread counters: {e}")
+
+
+def cleanup_sent_emails():
+    """Delete delivered outbox emails past their retention period."""
+    try:
+        db = SessionLocal()
+        count = outbox_email_crud.delete_sent(db, days=settings.EMAIL_OUTBOX_RETENTION_DAYS)
+        logger.info(f"Cleaned up {count} sent emails")
+        db.close()
+    except Exception as e:
+        logger.error(f"Error cleaning sent emails: {e}")
+
+
+def cleanup_expired_report_jobs():
+    """Delete expired background report jobs and their files."""
+    try:
+        count = report_job_queue.cleanup()
+        if count:
+            logger.info(f"Cleaned up {count} expired report jobs")
+    except Exception as e:
+        logger.error(f"Error cleaning report jobs: {e}")
+
+
+def send_weekly_digest():
+    """Queue this week's digest emails."""
+    try:
+        run_weekly_digest()
+    except Exception as e:
+        logger.error(f"Error sending weekly digest: {e}")
+
+
+def resume_weekly_digest():
+    """Finish a digest run that was interrupted."""
+    try:
+        result = run_weekly_digest(resume_only=True)
+        if result:
+            logger.info(f"Resumed weekly digest run {result['run_id']}")
+    except Exception as e:
+        logger.error(f"Error resuming weekly digest: {e}")
+
+
 def start_scheduler():
     """Start background task scheduler."""
     # Run cleanup daily at 2 AM
@@ -34,6 +123,69 @@ def start_scheduler():
         replace_existing=True
     )
 
+    # Remove delivered outbox emails daily
+    scheduler.add_job(
+        cleanup_sent_emails,
+        trigger=CronTrigger(hour=2, minute=15),
+        id='cleanup_sent_emails',
+        name='Cleanup sent emails',
+        replace_existing=True
+    )
+
+    # Recompute objective progress nightly to repair any drift
+    scheduler.add_job(
+        repair_objective_progress,
+        trigger=CronTrigger(hour=2, minute=30),
+        id='repair_objective_progress',
+        name='Recompute objective progress',
+        replace_existing=True
+    )
+
+    # Verify and rebuild the KPI rollup nightly
+    scheduler.add_job(
+        rebuild_kpi_rollups,
+        trigger=CronTrigger(hour=3, minute=0),
+        id='rebuild_kpi_rollups',
+        name='Rebuild KPI rollup',
+        replace_existing=True
+    )
+
+    # Verify and repair unread notification counters nightly
+    scheduler.add_job(
+        reconcile_unread_counts,
+        trigger=CronTrigger(hour=3, minute=15),
+        id='reconcile_unread_counts',
+        name='Reconcile unread notification counters',
+        replace_existing=True
+    )
+
+    # Send the weekly digest on Monday morning
+    scheduler.add_job(
+        send_weekly_digest,
+        trigger=CronTrigger(day_of_week='mon', hour=7, minute=0),
+        id='send_weekly_digest',
+        name='Send weekly digest',
+        replace_existing=True
+    )
+
+    # Pick up a digest run left unfinished by a crash or restart
+    scheduler.add_job(
+        resume_weekly_digest,
+        trigger=IntervalTrigger(minutes=15),
+        id='resume_weekly_digest',
+        name='Resume weekly digest',
+        replace_existing=True
+    )
+
+    # Remove expired report files hourly
+    scheduler.add_job(
+        cleanup_expired_report_jobs,
+        trigger=CronTrigger(minute=15),
+        id='cleanup_report_jobs',
+        name='Cleanup expired report jobs',
+        replace_existing=True
+    )
+
     scheduler.start()
     logger.info("Scheduler started")
 
@@ -0,0 +1,118 @@
+"""Scheduled weekly activity digest for all users."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database import SessionLocal, unit_of_work
+from app.crud.digest import digest_crud
+from app.core.email_outbox import email_outbox_worker
+from app.utils.email import email_service
+from app.utils.email_templates import weekly_digest_email
+
+logger = logging.getLogger(__name__)
+
+# Objectives listed per digest, largest changes first
+MAX_OBJECTIVES = 5
+
+# A new run starts only this long after the previous one ended
+MIN_INTERVAL = timedelta(days=6)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def run_weekly_digest(now: Optional[datetime] = None, resume_only: bool = False) -> Dict[str, int]:
+    """
+    Queue the weekly digest for every user who wants it.
+
+    Activity is gathered for all users at once by a fixed number of
+    grouped queries, then digests are rendered and queued on the email
+    outbox in chunks of DIGEST_BATCH_SIZE users. Each chunk commits
+    together with a checkpoint of the last user it covered, so a run that
+    dies part way is resumed (by this function, once its lease has run
+    out) from the next user without sending anyone a second digest.
+
+    With ``resume_only`` an unfinished run is resumed but no new run is
+    started. Returns the run id and the number of emails queued by this
+    call, or an empty dict if there was nothing to do.
+    """
+    if not email_service.enabled:
+        logger.debug("Email service is disabled. Weekly digest skipped.")
+        return {}
+
+    now = now or _utcnow()
+    lease = timedelta(seconds=settings.DIGEST_LEASE_SECONDS)
+    db = SessionLocal()
+    try:
+        previous = digest_crud.get_last_completed(db)
+        run = digest_crud.get_running(db)
+        if run is None:
+            if resume_only or (previous and now - previous.period_end < MIN_INTERVAL):
+                return {}
+            run = digest_crud.create_run(
+                db,
+                period_start=previous.period_end if previous else now - timedelta(days=7),
+                period_end=now,
+            )
+            if run is None:
+                # Another process started one first
+                return {}
+        if not digest_crud.claim(db, run.id, lease=lease):
+            return {}
+
+        try:
+            queued = _send_digests(db, run, previous.id if previous else None, lease)
+        except Exception:
+            db.rollback()
+            digest_crud.release(db, run.id)
+            raise
+        digest_crud.complete(db, run.id)
+        logger.info(f"Weekly digest run {run.id} queued {queued} emails")
+        return {"run_id": run.id, "emails_queued": queued}
+    finally:
+        db.close()
+
+
+def _send_digests(db, run, baseline_run_id: Optional[int], lease: timedelta) -> int:
+    activity = digest_crud.get_activity(
+        db, run=run, baseline_run_id=baseline_run_id, year=run.period_end.year
+    )
+    recipients = [
+        r for r in digest_crud.get_recipients(db, after_user_id=run.last_user_id)
+        if r.id in activity
+    ]
+    period = f"{run.period_start:%b %d} - {run.period_end:%b %d, %Y}"
+    base_url = settings.CORS_ORIGINS[0] if settings.CORS_ORIGINS else "http://localhost"
+    link = f"{base_url}/dashboard"
+
+    queued = 0
+    size = settings.DIGEST_BATCH_SIZE
+    for start in range(0, len(recipients), size):
+        chunk = recipients[start:start + size]
+        messages = []
+        for user in chunk:
+            stats = activity[user.id]
+            stats["objectives"] = stats["objectives"][:MAX_OBJECTIVES]
+            content = weekly_digest_email({
+                "user_name": user.name,
+                "period": period,
+                "stats": stats,
+                "link": link,
+            })
+            messages.append({
+                "to_emails": [user.email],
+                "subject": content["subject"],
+                "body_html": content["html_body"],
+                "body_text": content["text_body"],
+            })
+
+        with unit_of_work(db):
+            count = email_outbox_worker.enqueue_many(db, messages)
+            digest_crud.checkpoint(
+                db, run.id, last_user_id=chunk[-1].id, emails_queued=count, lease=lease
+            )
+        queued += count
+    return queued
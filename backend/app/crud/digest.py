@@ -0,0 +1,254 @@
+"""CRUD operations for weekly digest runs and activity."""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
+
+from app.database import commit_or_flush
+from app.models.digest import DigestRun, ObjectiveProgressSnapshot
+from app.models.kpi import KPI, KPIComment, KPIHistory
+from app.models.notification import Notification
+from app.models.objective import Objective
+from app.models.user import User
+
+# kpi_history actions that change a KPI's status
+STATUS_ACTIONS = ("submitted", "approved", "rejected")
+
+
+def _utcnow() -> datetime:
+    # Stored naive, like the server_default timestamps
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CRUDDigest:
+    """Digest runs, their checkpoints and the activity they report."""
+
+    def get_running(self, db: Session) -> Optional[DigestRun]:
+        """Get the run in progress, if any."""
+        return db.execute(
+            select(DigestRun).where(DigestRun.status == "running")
+        ).scalar_one_or_none()
+
+    def get_last_completed(self, db: Session) -> Optional[DigestRun]:
+        """Get the most recent completed run."""
+        return db.execute(
+            select(DigestRun)
+            .where(DigestRun.status == "completed")
+            .order_by(DigestRun.period_end.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def create_run(
+        self, db: Session, *, period_start: datetime, period_end: datetime
+    ) -> Optional[DigestRun]:
+        """
+        Start a run and snapshot the progress of every objective.
+
+        Returns None if another run is already in progress.
+        """
+        run = DigestRun(
+            period_start=period_start,
+            period_end=period_end,
+            status="running",
+            last_user_id=0,
+            emails_queued=0,
+        )
+        db.add(run)
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            return None
+        db.execute(
+            insert(ObjectiveProgressSnapshot).from_select(
+                ["run_id", "objective_id", "progress"],
+                select(run.id, Objective.id, Objective.progress_percentage),
+            )
+        )
+        commit_or_flush(db, run)
+        return run
+
+    def claim(self, db: Session, run_id: int, *, lease: timedelta) -> bool:
+        """Take a running run unless another process holds its lease."""
+        now = _utcnow()
+        result = db.execute(
+            update(DigestRun)
+            .where(
+                DigestRun.id == run_id,
+                DigestRun.status == "running",
+                or_(DigestRun.lease_until.is_(None), DigestRun.lease_until < now),
+            )
+            .values(lease_until=now + lease)
+        )
+        commit_or_flush(db)
+        return bool(result.rowcount)
+
+    def checkpoint(
+        self, db: Session, run_id: int, *, last_user_id: int, emails_queued: int, lease: timedelta
+    ) -> None:
+        """Record progress and extend the lease. Commit it with the emails it covers."""
+        db.execute(
+            update(DigestRun)
+            .where(DigestRun.id == run_id)
+            .values(
+                last_user_id=last_user_id,
+                emails_queued=DigestRun.emails_queued + emails_queued,
+                lease_until=_utcnow() + lease,
+            )
+        )
+        commit_or_flush(db)
+
+    def release(self, db: Session, run_id: int) -> None:
+        """Give up the lease so the run can be resumed right away."""
+        db.execute(update(DigestRun).where(DigestRun.id == run_id).values(lease_until=None))
+        commit_or_flush(db)
+
+    def complete(self, db: Session, run_id: int) -> None:
+        """Finish a run and keep only its snapshot as the next baseline."""
+        db.execute(
+            update(DigestRun)
+            .where(DigestRun.id == run_id)
+            .values(status="completed", finished_at=_utcnow(), lease_until=None)
+        )
+        db.execute(delete(ObjectiveProgressSnapshot).where(ObjectiveProgressSnapshot.run_id != run_id))
+        commit_or_flush(db)
+
+    def get_recipients(self, db: Session, *, after_user_id: int = 0) -> List[Row]:
+        """Active users who want the digest, in id order: (id, email, name, role)."""
+        return db.execute(
+            select(
+                User.id,
+                User.email,
+                func.coalesce(User.full_name, User.username).label("name"),
+                User.role,
+            )
+            .where(
+                User.id > after_user_id,
+                User.is_active == True,
+                User.weekly_digest == True,
+                User.email_notifications == True,
+            )
+            .order_by(User.id)
+        ).all()
+
+    def get_activity(
+        self,
+        db: Session,
+        *,
+        run: DigestRun,
+        baseline_run_id: Optional[int],
+        year: int,
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Weekly activity of every user, keyed by user id.
+
+        A fixed handful of grouped queries covers all users: KPI history
+        and comments in the run's period (on each user's own KPIs),
+        notifications received in it, currently submitted KPIs, average
+        KPI progress in ``year`` and objective progress between the
+        baseline run's snapshot and this run's. Users with no activity
+        are absent.
+        """
+        window = (run.period_start, run.period_end)
+        activity: Dict[int, Dict[str, Any]] = {}
+
+        def stats(user_id: int) -> Dict[str, Any]:
+            return activity.setdefault(user_id, {
+                "kpis_updated": 0,
+                "status_changes": 0,
+                "new_comments": 0,
+                "new_notifications": 0,
+                "unread_notifications": 0,
+                "pending_approvals": 0,
+                "objectives": [],
+            })
+
+        for user_id, kpis_updated, status_changes in db.execute(
+            select(
+                KPI.user_id,
+                func.count(func.distinct(KPIHistory.kpi_id)),
+                func.sum(case((KPIHistory.action.in_(STATUS_ACTIONS), 1), else_=0)),
+            )
+            .select_from(KPIHistory)
+            .join(KPI, KPI.id == KPIHistory.kpi_id)
+            .where(KPIHistory.created_at >= window[0], KPIHistory.created_at < window[1])
+            .group_by(KPI.user_id)
+        ):
+            stats(user_id).update(kpis_updated=kpis_updated, status_changes=status_changes)
+
+        # Comments by others on a user's KPIs
+        for user_id, count in db.execute(
+            select(KPI.user_id, func.count())
+            .select_from(KPIComment)
+            .join(KPI, KPI.id == KPIComment.kpi_id)
+            .where(
+                KPIComment.created_at >= window[0],
+                KPIComment.created_at < window[1],
+                KPIComment.user_id != KPI.user_id,
+            )
+            .group_by(KPI.user_id)
+        ):
+            stats(user_id)["new_comments"] = count
+
+        for user_id, count, unread in db.execute(
+            select(
+                Notification.user_id,
+                func.count(),
+                func.sum(case((Notification.is_read == False, 1), else_=0)),
+            )
+            .where(Notification.created_at >= window[0], Notification.created_at < window[1])
+            .group_by(Notification.user_id)
+        ):
+            stats(user_id).update(new_notifications=count, unread_notifications=unread)
+
+        # Own KPIs awaiting review; approvers see the whole queue
+        submitted_total = 0
+        for user_id, count in db.execute(
+            select(KPI.user_id, func.count())
+            .where(KPI.status == "submitted")
+            .group_by(KPI.user_id)
+        ):
+            stats(user_id)["pending_approvals"] = count
+            submitted_total += count
+        if submitted_total:
+            for (user_id,) in db.execute(
+                select(User.id).where(User.role.in_(("admin", "manager")), User.is_active == True)
+            ):
+                stats(user_id)["pending_approvals"] = submitted_total
+
+        current = aliased(ObjectiveProgressSnapshot)
+        baseline = aliased(ObjectiveProgressSnapshot)
+        before = func.coalesce(baseline.progress, 0.0)
+        for owner_id, title, progress, previous in db.execute(
+            select(Objective.owner_id, Objective.title, current.progress, before)
+            .join(current, and_(current.objective_id == Objective.id, current.run_id == run.id))
+            .outerjoin(
+                baseline,
+                and_(baseline.objective_id == Objective.id, baseline.run_id == baseline_run_id),
+            )
+            .where(current.progress != before)
+            .order_by(Objective.owner_id, func.abs(current.progress - before).desc())
+        ):
+            stats(owner_id)["objectives"].append({
+                "title": title,
+                "progress": round(progress, 1),
+                "delta": round(progress - previous, 1),
+            })
+
+        # Average progress only accompanies some other activity
+        for user_id, avg_progress in db.execute(
+            select(KPI.user_id, func.avg(KPI.progress_percentage))
+            .where(KPI.year == year, KPI.user_id.in_(list(activity)))
+            .group_by(KPI.user_id)
+        ):
+            activity[user_id]["avg_progress"] = round(avg_progress or 0, 1)
+
+        return activity
+
+
+# Create singleton instance
+digest_crud = CRUDDigest()
@@ -0,0 +1,180 @@
+"""CRUD operations for the email outbox."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.database import commit_or_flush
+from app.models.email_outbox import UNSENT_STATUSES, OutboxEmail
+
+
+def _utcnow() -> datetime:
+    # Stored naive, like the server_default timestamps
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CRUDOutboxEmail:
+    """CRUD operations for outbox emails."""
+
+    def get(self, db: Session, message_id: int) -> Optional[OutboxEmail]:
+        """Get outbox email by ID."""
+        return db.get(OutboxEmail, message_id)
+
+    def create(
+        self,
+        db: Session,
+        *,
+        to_emails: List[str],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None,
+        notification_id: Optional[int] = None,
+    ) -> OutboxEmail:
+        """Queue an email. Inside a unit_of_work it commits with the caller's writes."""
+        message = OutboxEmail(
+            recipients=json.dumps(list(to_emails)),
+            subject=subject,
+            body_html=body_html,
+            body_text=body_text,
+            notification_id=notification_id,
+            status="pending",
+            attempts=0,
+            next_attempt_at=_utcnow(),
+        )
+        db.add(message)
+        commit_or_flush(db)
+        return message
+
+    def create_many(self, db: Session, messages: List[dict]) -> int:
+        """
+        Queue many emails in one executemany insert.
+
+        Each message is a dict of ``create``'s keyword arguments. Returns
+        the number queued.
+        """
+        if not messages:
+            return 0
+        now = _utcnow()
+        db.execute(
+            insert(OutboxEmail),
+            [
+                {
+                    "recipients": json.dumps(list(m["to_emails"])),
+                    "subject": m["subject"],
+                    "body_html": m["body_html"],
+                    "body_text": m.get("body_text"),
+                    "notification_id": m.get("notification_id"),
+                    "status": "pending",
+                    "attempts": 0,
+                    "next_attempt_at": now,
+                }
+                for m in messages
+            ],
+        )
+        commit_or_flush(db)
+        return len(messages)
+
+    def claim_due(self, db: Session, *, limit: int, lease: timedelta) -> List[Row]:
+        """
+        Claim up to ``limit`` due emails for delivery.
+
+        Claimed rows move to "sending" with ``next_attempt_at`` set to the
+        end of the lease and their attempt counted. Rows still "sending"
+        after their lease ran out (their worker died) are due again.
+        Returns rows of (id, recipients, subject, body_html, body_text,
+        attempts).
+        """
+        now = _utcnow()
+        due = (
+            select(OutboxEmail.id)
+            .where(
+                OutboxEmail.status.in_(UNSENT_STATUSES),
+                OutboxEmail.next_attempt_at <= now,
+            )
+            .order_by(OutboxEmail.next_attempt_at)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        rows = db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id.in_(due))
+            .values(
+                status="sending",
+                attempts=OutboxEmail.attempts + 1,
+                next_attempt_at=now + lease,
+            )
+            .returning(
+                OutboxEmail.id,
+                OutboxEmail.recipients,
+                OutboxEmail.subject,
+                OutboxEmail.body_html,
+                OutboxEmail.body_text,
+                OutboxEmail.attempts,
+            )
+        ).all()
+        commit_or_flush(db)
+        return sorted(rows, key=lambda row: row.id)
+
+    def mark_sent(self, db: Session, message_id: int) -> None:
+        """Record a successful delivery."""
+        db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id == message_id, OutboxEmail.status == "sending")
+            .values(status="sent", sent_at=_utcnow(), last_error=None)
+        )
+        commit_or_flush(db)
+
+    def mark_failed(
+        self,
+        db: Session,
+        message_id: int,
+        *,
+        error: str,
+        retry_at: Optional[datetime] = None,
+    ) -> None:
+        """Schedule a failed email for ``retry_at``, or dead-letter it if None."""
+        values = {"last_error": error}
+        if retry_at is None:
+            values["status"] = "dead"
+        else:
+            values.update(status="pending", next_attempt_at=retry_at)
+        db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id == message_id, OutboxEmail.status == "sending")
+            .values(**values)
+        )
+        commit_or_flush(db)
+
+    def release(self, db: Session, message_ids: List[int]) -> None:
+        """Return claimed but unattempted emails to the queue."""
+        if not message_ids:
+            return
+        db.execute(
+            update(OutboxEmail)
+            .where(OutboxEmail.id.in_(message_ids), OutboxEmail.status == "sending")
+            .values(
+                status="pending",
+                attempts=OutboxEmail.attempts - 1,
+                next_attempt_at=_utcnow(),
+            )
+        )
+        commit_or_flush(db)
+
+    def delete_sent(self, db: Session, *, days: int) -> int:
+        """Delete emails delivered more than ``days`` days ago."""
+        result = db.execute(
+            delete(OutboxEmail).where(
+                OutboxEmail.status == "sent",
+                OutboxEmail.sent_at < _utcnow() - timedelta(days=days),
+            )
+        )
+        commit_or_flush(db)
+        return result.rowcount
+
+
+# Create singleton instance
+outbox_email_crud = CRUDOutboxEmail()
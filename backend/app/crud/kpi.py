@@ -1,11 +1,19 @@
 """KPI CRUD operations."""
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_
+from typing import Optional, List, Dict, Any, Iterator, Sequence
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import String, and_, case, exists, func, insert, literal, null, or_, select, update
+from sqlalchemy.engine import Row
 from datetime import datetime, timezone
 
-from app.models.kpi import KPI, KPITemplate, KPIEvidence, KPIComment, KPIHistory
+from app.models.kpi import KPI, KPITemplate, KPIEvidence, KPIComment, KPIHistory, KPIMeasurement
+from app.models.kpi_rollup import KPIRollup
+from app.models.objective import Objective, ObjectiveKPILink
+from app.models.user import User
+from app.crud.search import search_crud
+from app.database import commit_or_flush
+from app.utils.kpi_values import format_value, parse_value
+from app.utils.pagination import keyset_paginate
 from app.schemas.kpi import (
     KPICreate,
     KPIUpdate,
@@ -89,8 +97,30 @@ class CRUDKPI:
     """CRUD operations for KPIs."""
 
     def get(self, db: Session, kpi_id: int) -> Optional[KPI]:
-        """Get a KPI by ID."""
-        return db.query(KPI).filter(KPI.id == kpi_id).first()
+        """Get a KPI by ID (served from the session identity map when loaded)."""
+        return db.get(KPI, kpi_id)
+
+    def get_by_external_key(
+        self, db: Session, *, external_key: str, year: int, quarter: str
+    ) -> Optional[KPI]:
+        """Get the KPI with an external key in a period."""
+        return db.query(KPI).filter(
+            KPI.external_key == external_key, KPI.year == year, KPI.quarter == quarter
+        ).first()
+
+    def resolve_external_keys(
+        self, db: Session, *, external_keys: List[str]
+    ) -> Dict[tuple, int]:
+        """Map (external_key, year, quarter) to KPI id for all periods of the given keys."""
+        rows = db.query(KPI.id, KPI.external_key, KPI.year, KPI.quarter).filter(
+            KPI.external_key.in_(external_keys)
+        ).all()
+        return {(key, year, quarter): kpi_id for kpi_id, key, year, quarter in rows}
+
+    def get_access(self, db: Session, *, kpi_ids: List[int]) -> Dict[int, Row]:
+        """Map each existing KPI id in ``kpi_ids`` to its (user_id, status)."""
+        rows = db.query(KPI.id, KPI.user_id, KPI.status).filter(KPI.id.in_(kpi_ids)).all()
+        return {row.id: row for row in rows}
 
     def get_multi(
         self,
@@ -103,8 +133,16 @@ class CRUDKPI:
         quarter: Optional[str] = None,
         status: Optional[str] = None,
         search: Optional[str] = None,
-    ) -> tuple[List[KPI], int]:
-        """Get multiple KPIs with filters and return (items, total_count)."""
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+    ) -> tuple[List[KPI], Optional[int], Optional[str]]:
+        """
+        Get multiple KPIs with filters.
+
+        Pages newest-first by (created_at, id); pass ``cursor`` for keyset
+        pagination and ``with_total=False`` to skip the COUNT.
+        Returns (items, total_count, next_cursor).
+        """
         query = db.query(KPI)
 
         # Apply filters
@@ -117,39 +155,95 @@ class CRUDKPI:
         if status:
             query = query.filter(KPI.status == status)
         if search:
-            search_filter = or_(
-                KPI.title.ilike(f"%{search}%"),
-                KPI.description.ilike(f"%{search}%"),
-            )
-            query = query.filter(search_filter)
+            # Word-prefix match through the FTS5 index instead of a LIKE scan
+            match = search_crud.build_match(search)
+            if match:
+                query = query.filter(KPI.id.in_(search_crud.kpi_ids_matching(match)))
 
         # Get total count before pagination
-        total = query.count()
+        total = query.count() if with_total else None
 
         # Apply pagination and ordering
-        items = query.order_by(KPI.created_at.desc()).offset(skip).limit(limit).all()
+        items, next_cursor = keyset_paginate(
+            query, ts_column=KPI.created_at, id_column=KPI.id,
+            cursor=cursor, skip=skip, limit=limit,
+        )
+
+        return items, total, next_cursor
 
-        return items, total
+    def select_rows(
+        self,
+        *,
+        columns: Sequence[Any],
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None,
+    ):
+        """Build a SELECT of KPI ``columns`` with the list filters, in id order."""
+        query = select(*columns)
+        if user_id:
+            query = query.where(KPI.user_id == user_id)
+        if year:
+            query = query.where(KPI.year == year)
+        if quarter:
+            query = query.where(KPI.quarter == quarter)
+        if status:
+            query = query.where(KPI.status == status)
+        return query.order_by(KPI.id)
+
+    def iter_rows(
+        self,
+        db: Session,
+        *,
+        columns: Sequence[Any],
+        batch_size: int = 2000,
+        **filters: Any,
+    ) -> Iterator[Any]:
+        """
+        Stream rows of KPI ``columns`` in id order for exports.
+
+        Plain rows (no ORM objects) are fetched ``batch_size`` at a time from
+        a server-side cursor (yield_per), so memory stays flat regardless of
+        the row count. ``filters`` are those of select_rows.
+        """
+        result = db.execute(
+            self.select_rows(columns=columns, **filters).execution_options(yield_per=batch_size)
+        )
+        try:
+            yield from result
+        finally:
+            result.close()
 
     def get_pending_approvals(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> tuple[List[KPI], int]:
-        """Get KPIs pending approval."""
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        with_total: bool = True,
+    ) -> tuple[List[KPI], Optional[int], Optional[str]]:
+        """Get KPIs pending approval, newest submission first (keyset on submitted_at, id)."""
         query = db.query(KPI).filter(KPI.status == "submitted")
-        total = query.count()
-        items = query.order_by(KPI.submitted_at.desc()).offset(skip).limit(limit).all()
-        return items, total
+        total = query.count() if with_total else None
+        items, next_cursor = keyset_paginate(
+            query, ts_column=KPI.submitted_at, id_column=KPI.id,
+            cursor=cursor, skip=skip, limit=limit,
+        )
+        return items, total, next_cursor
 
     def create(self, db: Session, *, obj_in: KPICreate, user_id: int) -> KPI:
         """Create a new KPI."""
+        values = obj_in.model_dump()
         db_obj = KPI(
-            **obj_in.model_dump(),
+            **values,
             user_id=user_id,
             status="draft",
         )
+        self._apply_values(db, db_obj, values)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db, db_obj)
 
         # Create history record
         self._create_history(
@@ -175,8 +269,8 @@ class CRUDKPI:
                 setattr(db_obj, field, value)
 
         if changes:
-            db.commit()
-            db.refresh(db_obj)
+            self._apply_values(db, db_obj, update_data)
+            commit_or_flush(db, db_obj)
 
             # Create history record
             self._create_history(
@@ -190,6 +284,56 @@ class CRUDKPI:
 
         return db_obj
 
+    def _apply_values(self, db: Session, db_obj: KPI, changed: Dict[str, Any]) -> None:
+        """
+        Parse changed target/current text into the numeric columns and derive
+        progress from them when both are known.
+
+        A unit found in the text is kept unless one was given explicitly. A
+        new numeric current value is also appended to the measurement series.
+        """
+        for text_field, numeric_field in (
+            ("current_value", "current_numeric"),
+            ("target_value", "target_numeric"),
+        ):
+            if text_field in changed:
+                number, unit = parse_value(getattr(db_obj, text_field))
+                if (
+                    numeric_field == "current_numeric"
+                    and number is not None
+                    and number != db_obj.current_numeric
+                ):
+                    db.add(KPIMeasurement(
+                        kpi=db_obj, value=number, measured_at=datetime.now(timezone.utc)
+                    ))
+                setattr(db_obj, numeric_field, number)
+                if unit and not changed.get("unit"):
+                    db_obj.unit = unit
+
+        progress = db_obj.derived_progress
+        if progress is not None:
+            db_obj.progress_percentage = progress
+
+    def recalculate_progress(self, db: Session, *, kpi_ids: Optional[List[int]] = None) -> int:
+        """
+        Re-derive progress_percentage in SQL for KPIs with numeric values.
+
+        One set-based UPDATE; pass ``kpi_ids`` to limit it. Returns the
+        number of KPIs whose progress changed.
+        """
+        derived = KPI.derived_progress
+        query = update(KPI).where(
+            derived.isnot(None),
+            or_(KPI.progress_percentage.is_(None), KPI.progress_percentage != derived),
+        )
+        if kpi_ids is not None:
+            query = query.where(KPI.id.in_(kpi_ids))
+        changed = db.execute(
+            query.values(progress_percentage=derived).execution_options(synchronize_session=False)
+        ).rowcount
+        commit_or_flush(db)
+        return changed
+
     def delete(self, db: Session, *, kpi_id: int, user_id: int) -> bool:
         """Delete a KPI (only if in draft status)."""
         db_obj = self.get(db, kpi_id=kpi_id)
@@ -202,7 +346,7 @@ class CRUDKPI:
                 old_value=f"Deleted KPI: {db_obj.title}",
             )
             db.delete(db_obj)
-            db.commit()
+            commit_or_flush(db)
             return True
         return False
 
@@ -212,8 +356,7 @@ class CRUDKPI:
         if db_obj and db_obj.status == "draft":
             db_obj.status = "submitted"
             db_obj.submitted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(db_obj)
+            commit_or_flush(db, db_obj)
 
             self._create_history(
                 db,
@@ -235,8 +378,7 @@ class CRUDKPI:
             db_obj.status = "approved"
             db_obj.approved_at = datetime.now(timezone.utc)
             db_obj.approved_by = approver_id
-            db.commit()
-            db.refresh(db_obj)
+            commit_or_flush(db, db_obj)
 
             self._create_history(
                 db,
@@ -259,8 +401,7 @@ class CRUDKPI:
         db_obj = self.get(db, kpi_id=kpi_id)
         if db_obj and db_obj.status == "submitted":
             db_obj.status = "rejected"
-            db.commit()
-            db.refresh(db_obj)
+            commit_or_flush(db, db_obj)
 
             self._create_history(
                 db,
@@ -275,35 +416,562 @@ class CRUDKPI:
             return db_obj
         return None
 
-    def get_statistics(self, db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
-        """Get KPI statistics."""
-        query = db.query(KPI)
+    def bulk_review(
+        self,
+        db: Session,
+        *,
+        kpi_ids: List[int],
+        approver_id: int,
+        approve: bool,
+        comment: Optional[str] = None,
+        department: Optional[str] = None,
+    ) -> tuple[List[Any], Dict[int, Optional[Row]]]:
+        """
+        Approve or reject many submitted KPIs with set-based statements.
+
+        One UPDATE ... RETURNING changes every KPI still in 'submitted'
+        status (and, with ``department``, owned by a user in it); history
+        rows and comments are then batch-inserted. For rejections
+        ``comment`` is the reason and is always stored.
+
+        Returns (reviewed rows of (id, user_id, title), {skipped id: row of
+        (status, department of the owner), or None if the KPI does not
+        exist}).
+        """
+        if approve:
+            values = {
+                "status": "approved",
+                "approved_at": datetime.now(timezone.utc),
+                "approved_by": approver_id,
+            }
+            action, history_value = "approved", comment or "Approved"
+        else:
+            values = {"status": "rejected"}
+            action, history_value = "rejected", f"Rejected: {comment}"
+
+        query = update(KPI).where(KPI.id.in_(kpi_ids), KPI.status == "submitted")
+        if department is not None:
+            query = query.where(
+                KPI.user_id.in_(select(User.id).where(User.department == department))
+            )
+        reviewed = db.execute(
+            query
+            .values(**values)
+            .returning(KPI.id, KPI.user_id, KPI.title)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        reviewed_ids = {row.id for row in reviewed}
+        skipped_ids = [kpi_id for kpi_id in kpi_ids if kpi_id not in reviewed_ids]
+        skipped: Dict[int, Optional[Row]] = dict.fromkeys(skipped_ids)
+        if skipped_ids:
+            skipped.update(
+                (row.id, row)
+                for row in db.query(KPI.id, KPI.status, User.department)
+                .join(User, User.id == KPI.user_id)
+                .filter(KPI.id.in_(skipped_ids))
+            )
+
+        if reviewed:
+            db.execute(
+                insert(KPIHistory),
+                [
+                    {"kpi_id": row.id, "user_id": approver_id, "action": action,
+                     "new_value": history_value}
+                    for row in reviewed
+                ],
+            )
+            if comment:
+                db.execute(
+                    insert(KPIComment),
+                    [
+                        {"kpi_id": row.id, "user_id": approver_id, "comment": comment}
+                        for row in reviewed
+                    ],
+                )
+            commit_or_flush(db)
+
+        return reviewed, skipped
+
+    def rollover(
+        self,
+        db: Session,
+        *,
+        year: int,
+        quarter: str,
+        actor_id: int,
+        from_templates: bool = False,
+        source_year: Optional[int] = None,
+        source_quarter: Optional[str] = None,
+        department: Optional[str] = None,
+        user_ids: Optional[List[int]] = None,
+        categories: Optional[List[str]] = None,
+        copy_links: bool = True,
+        dry_run: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Create draft KPIs for a new period in bulk.
+
+        Sources are either each user's KPIs of the source period (one per
+        title, copying objective links) or the active templates matching the
+        user's role and ``categories``. Users that already have a KPI with
+        the same title in the target period are skipped, so reruns are safe.
+        KPIs, history rows and links are written with INSERT ... SELECT.
+
+        Returns {"kpis_created", "links_created", "objective_ids", "items"};
+        with ``dry_run`` nothing is written and ``items`` lists what would be
+        created.
+        """
+        users = select(User.id).where(User.is_active == True)
+        if department:
+            users = users.where(User.department == department)
+        if user_ids:
+            users = users.where(User.id.in_(user_ids))
+
+        target = aliased(KPI)
+
+        def not_in_target(user_col, title_col):
+            return ~exists().where(
+                target.user_id == user_col,
+                target.year == year,
+                target.quarter == quarter,
+                target.title == title_col,
+            )
+
+        if from_templates:
+            template_filter = [
+                KPITemplate.is_active == True,
+                or_(KPITemplate.role.is_(None), KPITemplate.role == User.role),
+            ]
+            if categories:
+                template_filter.append(KPITemplate.category.in_(categories))
+            source_ids = None
+            source = (
+                select(
+                    User.id.label("user_id"),
+                    KPITemplate.id.label("template_id"),
+                    KPITemplate.name.label("title"),
+                    KPITemplate.description,
+                    KPITemplate.category,
+                    KPITemplate.measurement_method,
+                    null().label("target_value"),
+                    null().label("target_numeric"),
+                    null().label("unit"),
+                    literal("higher").label("direction"),
+                    null().label("external_key"),
+                    null().label("source_kpi_id"),
+                )
+                .join(KPITemplate, and_(*template_filter))
+                .where(User.id.in_(users), not_in_target(User.id, KPITemplate.name))
+                .order_by(User.id, KPITemplate.id)
+            )
+        else:
+            # Latest KPI per (user, title) in the source period
+            source_ids = (
+                select(func.max(KPI.id))
+                .where(
+                    KPI.year == source_year,
+                    KPI.quarter == source_quarter,
+                    KPI.user_id.in_(users),
+                )
+                .group_by(KPI.user_id, KPI.title)
+            )
+            source = (
+                select(
+                    KPI.user_id,
+                    KPI.template_id,
+                    KPI.title,
+                    KPI.description,
+                    KPI.category,
+                    KPI.measurement_method,
+                    KPI.target_value,
+                    KPI.target_numeric,
+                    KPI.unit,
+                    KPI.direction,
+                    # Keep the external key unless the target period already uses it
+                    case(
+                        (
+                            exists().where(
+                                target.external_key == KPI.external_key,
+                                target.year == year,
+                                target.quarter == quarter,
+                            ),
+                            None,
+                        ),
+                        else_=KPI.external_key,
+                    ).label("external_key"),
+                    KPI.id.label("source_kpi_id"),
+                )
+                .where(KPI.id.in_(source_ids), not_in_target(KPI.user_id, KPI.title))
+                .order_by(KPI.id)
+            )
+
+        if dry_run:
+            rows = db.execute(source).all()
+            links = 0
+            if source_ids is not None and copy_links and rows:
+                links = db.query(func.count(ObjectiveKPILink.id)).filter(
+                    ObjectiveKPILink.kpi_id.in_([row.source_kpi_id for row in rows])
+                ).scalar()
+            return {
+                "kpis_created": len(rows),
+                "links_created": links,
+                "objective_ids": [],
+                "items": [
+                    {"user_id": row.user_id, "title": row.title,
+                     "source_kpi_id": row.source_kpi_id, "template_id": row.template_id}
+                    for row in rows
+                ],
+            }
+
+        max_before = db.query(func.max(KPI.id)).scalar() or 0
+        columns = ["user_id", "template_id", "title", "description", "category",
+                   "measurement_method", "target_value", "target_numeric", "unit", "direction",
+                   "external_key"]
+        source = source.subquery()
+        created = db.execute(
+            insert(KPI).from_select(
+                columns + ["year", "quarter", "status"],
+                select(
+                    *(source.c[name] for name in columns),
+                    literal(year), literal(quarter), literal("draft"),
+                ),
+            )
+        ).rowcount
+
+        new_kpi = aliased(KPI)
+        is_new = and_(new_kpi.id > max_before, new_kpi.year == year, new_kpi.quarter == quarter)
+
+        db.execute(
+            insert(KPIHistory).from_select(
+                ["kpi_id", "user_id", "action", "new_value"],
+                select(
+                    new_kpi.id,
+                    literal(actor_id),
+                    literal("created"),
+                    literal("Created KPI: ", String).concat(new_kpi.title),
+                ).where(is_new),
+            )
+        )
+
+        links_created, objective_ids = 0, []
+        if source_ids is not None and copy_links and created:
+            source_kpi, later_kpi = aliased(KPI), aliased(KPI)
+            # Map each new KPI back to its source (the latest KPI with the
+            # same user and title) with index lookups instead of an IN list
+            link_source = (
+                select(ObjectiveKPILink.objective_id, new_kpi.id, ObjectiveKPILink.weight)
+                .select_from(new_kpi)
+                .join(source_kpi, and_(
+                    source_kpi.user_id == new_kpi.user_id,
+                    source_kpi.title == new_kpi.title,
+                    source_kpi.year == source_year,
+                    source_kpi.quarter == source_quarter,
+                ))
+                .join(ObjectiveKPILink, ObjectiveKPILink.kpi_id == source_kpi.id)
+                .where(
+                    is_new,
+                    ~exists().where(
+                        later_kpi.user_id == source_kpi.user_id,
+                        later_kpi.title == source_kpi.title,
+                        later_kpi.year == source_year,
+                        later_kpi.quarter == source_quarter,
+                        later_kpi.id > source_kpi.id,
+                    ),
+                )
+            )
+            links_created = db.execute(
+                insert(ObjectiveKPILink).from_select(
+                    ["objective_id", "kpi_id", "weight"], link_source
+                )
+            ).rowcount
+            objective_ids = [
+                row[0] for row in db.execute(link_source.with_only_columns(
+                    ObjectiveKPILink.objective_id
+                ).distinct()).all()
+            ]
+
+        commit_or_flush(db)
+        return {
+            "kpis_created": created,
+            "links_created": links_created,
+            "objective_ids": objective_ids,
+            "items": [],
+        }
+
+    _STATUSES = ("draft", "submitted", "approved", "rejected")
+
+    # Attainment buckets as (label, lower bound inclusive, upper bound exclusive)
+    _ATTAINMENT_BUCKETS = (
+        ("0-25", 0, 25), ("25-50", 25, 50), ("50-75", 50, 75), ("75-100", 75, 100),
+    )
+
+    def get_value_summary(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Status counts, target/actual totals, average progress and the
+        attainment distribution in a single aggregate query.
+
+        Totals and the achievement rate only include KPIs with both numeric
+        values. KPIs without progress count as "unknown" attainment.
+        """
+        paired = and_(KPI.target_numeric.isnot(None), KPI.current_numeric.isnot(None))
+        progress = KPI.progress_percentage
+        columns = [
+            func.count(KPI.id),
+            *[func.sum(case((KPI.status == s, 1), else_=0)) for s in self._STATUSES],
+            func.sum(case((paired, KPI.target_numeric), else_=0.0)),
+            func.sum(case((paired, KPI.current_numeric), else_=0.0)),
+            func.avg(progress),
+            *[
+                func.sum(case((and_(progress >= low, progress < high), 1), else_=0))
+                for _, low, high in self._ATTAINMENT_BUCKETS
+            ],
+            func.sum(case((progress >= 100, 1), else_=0)),
+            func.sum(case((progress.is_(None), 1), else_=0)),
+        ]
+
+        query = db.query(*columns)
         if user_id:
             query = query.filter(KPI.user_id == user_id)
+        if year:
+            query = query.filter(KPI.year == year)
+        if quarter:
+            query = query.filter(KPI.quarter == quarter)
+        if status:
+            query = query.filter(KPI.status == status)
+        row = query.one()
+
+        total = row[0]
+        total_target, total_actual = row[5] or 0.0, row[6] or 0.0
+        buckets = [label for label, _, _ in self._ATTAINMENT_BUCKETS] + ["100+", "unknown"]
+        return {
+            "total_kpis": total,
+            **{s: int(c or 0) for s, c in zip(self._STATUSES, row[1:5])},
+            "total_target": total_target,
+            "total_actual": total_actual,
+            "achievement_rate": round(total_actual / total_target * 100, 2) if total_target else 0.0,
+            "average_progress": round(row[7] or 0.0, 2),
+            "attainment": {label: int(c or 0) for label, c in zip(buckets, row[8:])},
+        }
 
-        total_kpis = query.count()
-        draft = query.filter(KPI.status == "draft").count()
-        submitted = query.filter(KPI.status == "submitted").count()
-        approved = query.filter(KPI.status == "approved").count()
-        rejected = query.filter(KPI.status == "rejected").count()
+    def get_statistics(self, db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """Get KPI statistics (single query)."""
+        return self.get_dashboard(db, user_id=user_id)["totals"]
 
-        # Calculate average progress
-        avg_progress = db.query(func.avg(KPI.progress_percentage)).filter(
-            KPI.progress_percentage.isnot(None)
-        )
+    def get_dashboard(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        my_user_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get overall and per-quarter KPI statistics.
+
+        Overall statistics are read from the KPI rollup table, so their cost
+        depends on the number of periods rather than KPIs; one user's
+        statistics are aggregated from their KPIs. Status counts use
+        SUM(CASE ...) per (year, quarter) group and the groups are folded
+        into overall totals in Python. When ``my_user_id`` is given, the
+        number of KPIs owned by that user is counted too.
+
+        Returns {"totals": {...}, "quarters": [{year, quarter, ...}], "my_kpis": int}.
+        """
         if user_id:
-            avg_progress = avg_progress.filter(KPI.user_id == user_id)
-        avg_progress = avg_progress.scalar() or 0.0
+            rows = db.execute(
+                select(
+                    KPI.year,
+                    KPI.quarter,
+                    func.count(KPI.id),
+                    *[
+                        func.sum(case((KPI.status == s, 1), else_=0))
+                        for s in self._STATUSES
+                    ],
+                    func.sum(KPI.progress_percentage),
+                    func.count(KPI.progress_percentage),
+                )
+                .where(KPI.user_id == user_id)
+                .group_by(KPI.year, KPI.quarter)
+                .order_by(KPI.year, KPI.quarter)
+            ).all()
+        else:
+            rows = db.execute(
+                select(
+                    KPIRollup.year,
+                    KPIRollup.quarter,
+                    func.sum(KPIRollup.kpi_count),
+                    *[
+                        func.sum(case((KPIRollup.status == s, KPIRollup.kpi_count), else_=0))
+                        for s in self._STATUSES
+                    ],
+                    func.sum(KPIRollup.progress_sum),
+                    func.sum(KPIRollup.progress_count),
+                )
+                .group_by(KPIRollup.year, KPIRollup.quarter)
+                .order_by(KPIRollup.year, KPIRollup.quarter)
+            ).all()
+
+        quarters = []
+        totals = dict.fromkeys(("total_kpis",) + self._STATUSES, 0)
+        progress_sum, progress_count, my_kpis = 0.0, 0, 0
+        for row in rows:
+            year, quarter, total = row[0], row[1], row[2]
+            counts = dict(zip(self._STATUSES, (int(c or 0) for c in row[3:7])))
+            q_sum, q_count = row[7] or 0.0, row[8] or 0
+            quarters.append(
+                self._stats_dict(total, counts, q_sum, q_count, year=year, quarter=quarter)
+            )
 
-        # Calculate completion rate (approved KPIs)
-        completion_rate = (approved / total_kpis * 100) if total_kpis > 0 else 0.0
+            totals["total_kpis"] += total
+            for s in self._STATUSES:
+                totals[s] += counts[s]
+            progress_sum += q_sum
+            progress_count += q_count
+
+        if my_user_id is not None:
+            my_kpis = db.execute(
+                select(func.count()).select_from(KPI).where(KPI.user_id == my_user_id)
+            ).scalar()
+
+        total_kpis = totals.pop("total_kpis")
+        return {
+            "totals": self._stats_dict(total_kpis, totals, progress_sum, progress_count),
+            "quarters": quarters,
+            "my_kpis": my_kpis,
+        }
+
+    def get_breakdowns(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        KPI analytics broken down by status, quarter, category, department
+        and linked objective, aggregated in SQL over all matching KPIs.
+
+        Without a user filter the first four breakdowns and the totals are
+        folded from the KPI rollup table, so their cost depends on the
+        number of departments and periods rather than KPIs; one user's KPIs
+        are grouped directly. Objectives are grouped from their KPI links,
+        so that part scales with the number of links.
+        """
+        filters = []
+        if user_id:
+            filters.append(KPI.user_id == user_id)
+        if year:
+            filters.append(KPI.year == year)
+        approved = func.sum(case((KPI.status == "approved", 1), else_=0))
+
+        if user_id:
+            groups = db.execute(
+                select(
+                    User.department,
+                    KPI.status,
+                    KPI.quarter,
+                    KPI.category,
+                    func.count(),
+                    func.total(KPI.progress_percentage),
+                )
+                .join(User, User.id == KPI.user_id)
+                .where(*filters)
+                .group_by(User.department, KPI.status, KPI.quarter, KPI.category)
+            ).all()
+        else:
+            query = select(
+                KPIRollup.department,
+                KPIRollup.status,
+                KPIRollup.quarter,
+                KPIRollup.category,
+                func.sum(KPIRollup.kpi_count),
+                func.total(KPIRollup.progress_sum),
+            )
+            if year:
+                query = query.where(KPIRollup.year == year)
+            groups = db.execute(
+                query.group_by(
+                    KPIRollup.department, KPIRollup.status, KPIRollup.quarter, KPIRollup.category
+                )
+            ).all()
+
+        total_kpis, progress_sum = 0, 0.0
+        by_status: Dict[str, int] = {}
+        by_quarter: Dict[str, int] = {}
+        by_category: Dict[str, int] = {}
+        departments: Dict[str, List[float]] = {}
+        for department, status, quarter, category, count, progress in groups:
+            total_kpis += count
+            progress_sum += progress
+            by_status[status] = by_status.get(status, 0) + count
+            by_quarter[quarter] = by_quarter.get(quarter, 0) + count
+            category = category or "Uncategorized"
+            by_category[category] = by_category.get(category, 0) + count
+            totals = departments.setdefault(department or "", [0, 0.0, 0])
+            totals[0] += count
+            totals[1] += progress
+            if status == "approved":
+                totals[2] += count
+
+        objectives = db.execute(
+            select(
+                Objective.id,
+                Objective.title,
+                Objective.level,
+                func.count(),
+                func.total(KPI.progress_percentage),
+                approved,
+            )
+            .join(ObjectiveKPILink, ObjectiveKPILink.objective_id == Objective.id)
+            .join(KPI, KPI.id == ObjectiveKPILink.kpi_id)
+            .where(*filters)
+            .group_by(Objective.id, Objective.title, Objective.level)
+            .order_by(Objective.id)
+        ).all()
+
+        def summary(total: int, progress: float, approved_count: int, **extra) -> Dict[str, Any]:
+            return {
+                **extra,
+                "total_kpis": total,
+                "avg_progress": round(progress / total, 2) if total else 0,
+                "completion_rate": round(approved_count / total * 100, 2) if total else 0,
+            }
 
         return {
-            "total_kpis": total_kpis,
-            "draft": draft,
-            "submitted": submitted,
-            "approved": approved,
-            "rejected": rejected,
+            **summary(total_kpis, progress_sum, by_status.get("approved", 0)),
+            "by_status": by_status,
+            "by_quarter": by_quarter,
+            "by_category": by_category,
+            "by_department": [
+                summary(total, progress, approved_count, department=department or "Unassigned")
+                for department, (total, progress, approved_count) in sorted(departments.items())
+            ],
+            "by_objective": [
+                summary(total, progress, approved_count, objective_id=id_, title=title, level=level)
+                for id_, title, level, total, progress, approved_count in objectives
+            ],
+        }
+
+    @staticmethod
+    def _stats_dict(
+        total: int, counts: Dict[str, int], progress_sum: float, progress_count: int, **extra
+    ) -> Dict[str, Any]:
+        """Build a statistics dict from raw aggregates."""
+        avg_progress = progress_sum / progress_count if progress_count else 0.0
+        # Calculate completion rate (approved KPIs)
+        completion_rate = (counts["approved"] / total * 100) if total > 0 else 0.0
+        return {
+            **extra,
+            "total_kpis": total,
+            **counts,
             "average_progress": round(avg_progress, 2),
             "completion_rate": round(completion_rate, 2),
         }
@@ -327,7 +995,7 @@ class CRUDKPI:
             new_value=new_value,
         )
         db.add(history)
-        db.commit()
+        commit_or_flush(db)
         return history
 
     def _create_comment(
@@ -340,7 +1008,7 @@ class CRUDKPI:
             comment=comment,
         )
         db.add(comment_obj)
-        db.commit()
+        commit_or_flush(db)
         return comment_obj
 
 
@@ -427,6 +1095,177 @@ class CRUDKPIComment:
         return False
 
 
+# ============================================================================
+# KPI Measurement CRUD
+# ============================================================================
+
+class CRUDKPIMeasurement:
+    """CRUD operations for the KPI measurement time series."""
+
+    # Bucket start date for each granularity (weeks start on Monday)
+    _BUCKETS = {
+        "day": lambda ts: func.date(ts),
+        "week": lambda ts: func.date(ts, "weekday 0", "-6 days"),
+        "month": lambda ts: func.strftime("%Y-%m-01", ts),
+    }
+
+    def create_many(self, db: Session, *, measurements: List[Dict[str, Any]]) -> int:
+        """
+        Append measurements with a single executemany INSERT.
+
+        Each item needs kpi_id and value; a missing measured_at defaults to
+        now. Aware timestamps are stored as naive UTC. Returns the count.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
+        for item in measurements:
+            measured_at = item.get("measured_at") or now
+            if measured_at.tzinfo is not None:
+                measured_at = measured_at.astimezone(timezone.utc).replace(tzinfo=None)
+            rows.append({"kpi_id": item["kpi_id"], "value": item["value"], "measured_at": measured_at})
+
+        if rows:
+            db.execute(insert(KPIMeasurement), rows)
+            commit_or_flush(db)
+        return len(rows)
+
+    def sync_current_values(
+        self, db: Session, *, kpi_ids: List[int], user_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Set each KPI's current value to its latest measurement.
+
+        Latest values are looked up through the (kpi_id, measured_at) index
+        and only KPIs whose value changes are updated (one executemany
+        UPDATE). With ``user_id``, one history row per changed KPI records
+        the change. Returns the changed ids; progress is left to
+        CRUDKPI.recalculate_progress.
+        """
+        if not kpi_ids:
+            return []
+
+        latest = (
+            select(KPIMeasurement.value)
+            .where(KPIMeasurement.kpi_id == KPI.id)
+            .order_by(KPIMeasurement.measured_at.desc(), KPIMeasurement.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        candidates = (
+            select(KPI.id, KPI.unit, KPI.current_value, KPI.current_numeric, latest.label("value"))
+            .where(KPI.id.in_(kpi_ids))
+            .subquery()
+        )
+        rows = db.execute(
+            select(candidates).where(
+                candidates.c.value.isnot(None),
+                or_(
+                    candidates.c.current_numeric.is_(None),
+                    candidates.c.current_numeric != candidates.c.value,
+                ),
+            )
+        ).all()
+        if not rows:
+            return []
+
+        changes = [
+            {
+                "id": row.id,
+                "current_numeric": row.value,
+                "current_value": format_value(row.value, row.unit),
+                "old_value": row.current_value,
+            }
+            for row in rows
+        ]
+        db.execute(
+            update(KPI),
+            [{key: change[key] for key in ("id", "current_numeric", "current_value")} for change in changes],
+        )
+        if user_id is not None:
+            db.execute(
+                insert(KPIHistory),
+                [
+                    {
+                        "kpi_id": change["id"],
+                        "user_id": user_id,
+                        "action": "updated",
+                        "old_value": "current_value",
+                        "new_value": f"current_value: {change['old_value']} → {change['current_value']}",
+                    }
+                    for change in changes
+                ],
+            )
+        commit_or_flush(db)
+        return [change["id"] for change in changes]
+
+    def get_trends(
+        self,
+        db: Session,
+        *,
+        kpi_ids: Optional[List[int]] = None,
+        user_id: Optional[int] = None,
+        department: Optional[str] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: str = "week",
+        aggregate: str = "last",
+    ) -> List[Dict[str, Any]]:
+        """
+        Downsampled series for many KPIs in a single query.
+
+        Measurements are grouped per KPI into day/week/month buckets and
+        reduced to the bucket's last value or its average. Returns one
+        {"kpi_id", "title", "unit", "points"} dict per KPI with measurements,
+        each point being {"bucket", "value", "count"} in time order.
+        """
+        measured_at = KPIMeasurement.measured_at
+        bucket_start = self._BUCKETS[bucket](measured_at).label("bucket")
+
+        filters = []
+        if kpi_ids:
+            filters.append(KPI.id.in_(kpi_ids))
+        if user_id:
+            filters.append(KPI.user_id == user_id)
+        if year:
+            filters.append(KPI.year == year)
+        if quarter:
+            filters.append(KPI.quarter == quarter)
+        if department:
+            filters.append(KPI.user_id.in_(select(User.id).where(User.department == department)))
+        if start:
+            filters.append(measured_at >= start)
+        if end:
+            filters.append(measured_at < end)
+
+        if aggregate == "avg":
+            reduced = [func.avg(KPIMeasurement.value).label("value")]
+        else:
+            # SQLite takes bare columns of a max() aggregate from the row holding
+            # the maximum, so this picks each bucket's last value without a
+            # window function and sort (about 3x faster)
+            reduced = [KPIMeasurement.value, func.max(measured_at, type_=String)]
+
+        query = (
+            select(KPI.id.label("kpi_id"), KPI.title, KPI.unit, bucket_start, *reduced, func.count().label("count"))
+            .join(KPIMeasurement, KPIMeasurement.kpi_id == KPI.id)
+            .where(*filters)
+            .group_by(KPI.id, bucket_start)
+            .order_by(KPI.id, bucket_start)
+        )
+
+        series: Dict[int, Dict[str, Any]] = {}
+        for row in db.execute(query):
+            entry = series.get(row.kpi_id)
+            if entry is None:
+                entry = series[row.kpi_id] = {
+                    "kpi_id": row.kpi_id, "title": row.title, "unit": row.unit, "points": [],
+                }
+            entry["points"].append({"bucket": row.bucket, "value": row.value, "count": row.count})
+        return list(series.values())
+
+
 # ============================================================================
 # Instances
 # ============================================================================
@@ -435,3 +1274,4 @@ kpi_template_crud = CRUDKPITemplate()
 kpi_crud = CRUDKPI()
 kpi_evidence_crud = CRUDKPIEvidence()
 kpi_comment_crud = CRUDKPIComment()
+kpi_measurement_crud = CRUDKPIMeasurement()
@@ -1,8 +1,10 @@
 """CRUD operations for KPI Comments."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
+from app.database import commit_or_flush
 from app.models.kpi import KPIComment
+from app.utils.pagination import keyset_paginate
 from app.schemas.kpi import KPICommentCreate
 
 
@@ -34,8 +36,7 @@ class KPICommentCRUD:
             comment=comment_in.comment
         )
         db.add(comment)
-        db.commit()
-        db.refresh(comment)
+        commit_or_flush(db, comment)
         return comment
 
     def get(self, db: Session, *, comment_id: int) -> Optional[KPIComment]:
@@ -56,26 +57,30 @@ class KPICommentCRUD:
         *,
         kpi_id: int,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[KPIComment]:
-        """Get all comments for a KPI.
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[KPIComment], Optional[str]]:
+        """Get comments for a KPI, newest first.
 
         Args:
             db: Database session
             kpi_id: KPI ID
-            skip: Number of comments to skip
+            skip: Number of comments to skip (ignored with cursor)
             limit: Maximum number of comments to return
+            cursor: Keyset cursor on (created_at, id) from a previous page
 
         Returns:
-            List of KPIComment objects
+            Tuple of (KPIComment objects, next page cursor or None)
         """
-        return (
-            db.query(KPIComment)
-            .filter(KPIComment.kpi_id == kpi_id)
-            .order_by(KPIComment.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        query = db.query(KPIComment).filter(KPIComment.kpi_id == kpi_id)
+
+        return keyset_paginate(
+            query,
+            ts_column=KPIComment.created_at,
+            id_column=KPIComment.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
 
     def update(
@@ -0,0 +1,65 @@
+"""KPI rollup table maintenance."""
+
+import math
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.kpi_rollup import AGGREGATE_QUERY, CREATE_STATEMENTS, KPI_ROLLUP_TABLE
+
+
+class CRUDKPIRollup:
+    """Rebuild and verification of the trigger-maintained KPI rollup."""
+
+    def rebuild(self, db: Session) -> Dict[str, int]:
+        """
+        Recompute the rollup from the kpis table and replace its contents.
+
+        The triggers normally keep it exact; this repairs databases that
+        predate them, bulk changes made with triggers disabled, and the
+        floating point drift of incrementally added progress sums. Returns
+        {"groups": rows written, "drifted": rows that were missing, stale
+        or off}.
+        """
+        for statement in CREATE_STATEMENTS:
+            db.execute(text(statement))
+
+        expected = {
+            tuple(row[:5]): tuple(row[5:])
+            for row in db.execute(text(AGGREGATE_QUERY))
+        }
+        actual = {
+            tuple(row[:5]): tuple(row[5:])
+            for row in db.execute(text(
+                "SELECT department, year, quarter, category, status, "
+                f"kpi_count, progress_sum, progress_count FROM {KPI_ROLLUP_TABLE}"
+            ))
+        }
+        drifted = sum(
+            1
+            for key in expected.keys() | actual.keys()
+            if not self._same(expected.get(key), actual.get(key))
+        )
+
+        db.execute(text(f"DELETE FROM {KPI_ROLLUP_TABLE}"))
+        db.execute(text(
+            f"INSERT INTO {KPI_ROLLUP_TABLE} (department, year, quarter, category, status, "
+            f"kpi_count, progress_sum, progress_count) {AGGREGATE_QUERY}"
+        ))
+        db.commit()
+        return {"groups": len(expected), "drifted": drifted}
+
+    @staticmethod
+    def _same(expected, actual) -> bool:
+        if expected is None or actual is None:
+            return expected == actual
+        count, progress_sum, progress_count = expected
+        return (
+            count == actual[0]
+            and progress_count == actual[2]
+            and math.isclose(progress_sum, actual[1], rel_tol=1e-9, abs_tol=1e-6)
+        )
+
+
+kpi_rollup_crud = CRUDKPIRollup()
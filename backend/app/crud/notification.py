@@ -1,8 +1,18 @@
 """CRUD operations for Notifications."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from app.database import commit_or_flush
 from app.models.notification import Notification
+from app.models.notification_counter import (
+    AGGREGATE_QUERY,
+    CREATE_STATEMENTS,
+    NOTIFICATION_COUNTER_TABLE,
+    NotificationCounter,
+)
+from app.utils.pagination import keyset_paginate
 
 
 class NotificationCRUD:
@@ -40,10 +50,52 @@ class NotificationCRUD:
             is_read=False
         )
         db.add(notification)
-        db.commit()
-        db.refresh(notification)
+        commit_or_flush(db, notification)
         return notification
 
+    def create_many(self, db: Session, *, notifications: List[Dict[str, Any]]) -> int:
+        """Create many notifications with a single batched INSERT.
+
+        Args:
+            db: Database session
+            notifications: Dicts with user_id, title, message and optionally
+                type (default "info") and link
+
+        Returns:
+            Number of notifications created
+        """
+        if not notifications:
+            return 0
+
+        db.execute(
+            insert(Notification),
+            [{"type": "info", "link": None, **n, "is_read": False} for n in notifications]
+        )
+        commit_or_flush(db)
+        return len(notifications)
+
+    def create_many_returning(
+        self, db: Session, *, notifications: List[Dict[str, Any]]
+    ) -> List[Row]:
+        """Create many notifications with a single batched INSERT ... RETURNING.
+
+        Args:
+            db: Database session
+            notifications: Dicts as for create_many
+
+        Returns:
+            (id, user_id) rows of the created notifications, in no particular order
+        """
+        if not notifications:
+            return []
+
+        rows = db.execute(
+            insert(Notification).returning(Notification.id, Notification.user_id),
+            [{"type": "info", "link": None, **n, "is_read": False} for n in notifications]
+        ).all()
+        commit_or_flush(db)
+        return rows
+
     def get(self, db: Session, *, notification_id: int) -> Optional[Notification]:
         """Get notification by ID.
 
@@ -63,31 +115,34 @@ class NotificationCRUD:
         user_id: int,
         skip: int = 0,
         limit: int = 50,
-        unread_only: bool = False
-    ) -> List[Notification]:
-        """Get notifications for a user.
+        unread_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """Get notifications for a user, newest first.
 
         Args:
             db: Database session
             user_id: User ID
-            skip: Number of notifications to skip
+            skip: Number of notifications to skip (ignored with cursor)
             limit: Maximum number of notifications to return
             unread_only: Only return unread notifications
+            cursor: Keyset cursor on (created_at, id) from a previous page
 
         Returns:
-            List of Notification objects
+            Tuple of (Notification objects, next page cursor or None)
         """
         query = db.query(Notification).filter(Notification.user_id == user_id)
 
         if unread_only:
             query = query.filter(Notification.is_read == False)
 
-        return (
-            query
-            .order_by(Notification.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return keyset_paginate(
+            query,
+            ts_column=Notification.created_at,
+            id_column=Notification.id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
 
     def mark_as_read(
@@ -153,6 +208,9 @@ class NotificationCRUD:
     def count_unread(self, db: Session, *, user_id: int) -> int:
         """Count unread notifications for a user.
 
+        Reads the trigger-maintained counter, a primary key lookup, rather
+        than counting notifications.
+
         Args:
             db: Database session
             user_id: User ID
@@ -160,12 +218,48 @@ class NotificationCRUD:
         Returns:
             Number of unread notifications
         """
-        return (
-            db.query(Notification)
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .count()
+        count = db.scalar(
+            select(NotificationCounter.unread).where(NotificationCounter.user_id == user_id)
+        )
+        return count or 0
+
+    def reconcile_unread_counts(self, db: Session) -> Dict[str, int]:
+        """Recompute all unread counters from the notifications table.
+
+        The triggers normally keep them exact; this repairs databases that
+        predate them and changes made with triggers disabled.
+
+        Args:
+            db: Database session
+
+        Returns:
+            {"users": users with unread notifications, "drifted": counters
+            that were missing, stale or off}
+        """
+        for statement in CREATE_STATEMENTS:
+            db.execute(text(statement))
+
+        expected = dict(db.execute(text(AGGREGATE_QUERY)).all())
+        actual = {
+            user_id: unread
+            for user_id, unread in db.execute(
+                select(NotificationCounter.user_id, NotificationCounter.unread)
+            )
+            if unread
+        }
+        drifted = sum(
+            1 for user_id in expected.keys() | actual.keys()
+            if expected.get(user_id) != actual.get(user_id)
         )
 
+        if drifted:
+            db.execute(delete(NotificationCounter))
+            db.execute(text(
+                f"INSERT INTO {NOTIFICATION_COUNTER_TABLE} (user_id, unread) {AGGREGATE_QUERY}"
+            ))
+        commit_or_flush(db)
+        return {"users": len(expected), "drifted": drifted}
+
     def delete_old_notifications(
         self,
         db: Session,
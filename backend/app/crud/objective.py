@@ -1,14 +1,18 @@
 """CRUD operations for objectives."""
 
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from collections import defaultdict
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, and_, or_, literal, select, update, String
 
+from app.database import commit_or_flush
 from app.models.objective import Objective, ObjectiveKPILink
 from app.models.kpi import KPI
 from app.schemas.objective import ObjectiveCreate, ObjectiveUpdate
+from app.utils.pagination import keyset_paginate
 
 
 class ObjectiveCRUD:
@@ -23,6 +27,10 @@ class ObjectiveCRUD:
         obj_data["created_by"] = created_by
         db_obj = self.model(**obj_data)
         db.add(db_obj)
+        db.flush()  # Assign id so the path can be built
+
+        parent_path = self._get_path(db, db_obj.parent_id) if db_obj.parent_id else None
+        db_obj.path = f"{parent_path or '/'}{db_obj.id}/"
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -43,10 +51,121 @@ class ObjectiveCRUD:
         quarter: Optional[str] = None,
         status: Optional[str] = None,
         department: Optional[str] = None,
-    ) -> List[Objective]:
-        """Get multiple objectives with filters."""
-        query = db.query(self.model)
+        cursor: Optional[str] = None,
+    ) -> tuple[List[Objective], Optional[str]]:
+        """
+        Get multiple objectives with filters, newest first.
+
+        Pass ``cursor`` for keyset pagination on (created_at, id).
+        Returns (items, next_cursor).
+        """
+        query = self._apply_filters(
+            db.query(self.model),
+            owner_id=owner_id,
+            level=level,
+            year=year,
+            quarter=quarter,
+            status=status,
+            department=department,
+        )
+
+        return keyset_paginate(
+            query, ts_column=self.model.created_at, id_column=self.model.id,
+            cursor=cursor, skip=skip, limit=limit,
+        )
+
+    def get_multi_with_details(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> tuple[List[tuple], Optional[str]]:
+        """
+        Get a page of objectives with owner name, parent title and counts.
+
+        Children and KPI counts are correlated subqueries and owner/parent
+        are joined, so the whole page costs a single query. Returns
+        ((Objective, owner_name, parent_title, children_count, kpi_count) rows,
+        next_cursor).
+        """
+        from app.models.user import User
 
+        parent = aliased(self.model)
+        child = aliased(self.model)
+
+        children_count = (
+            select(func.count(child.id))
+            .where(child.parent_id == self.model.id)
+            .correlate(self.model)
+            .scalar_subquery()
+        )
+        kpi_count = (
+            select(func.count(ObjectiveKPILink.id))
+            .where(ObjectiveKPILink.objective_id == self.model.id)
+            .correlate(self.model)
+            .scalar_subquery()
+        )
+
+        query = (
+            db.query(
+                self.model,
+                func.coalesce(User.full_name, User.username),
+                parent.title,
+                children_count,
+                kpi_count,
+            )
+            .outerjoin(User, User.id == self.model.owner_id)
+            .outerjoin(parent, parent.id == self.model.parent_id)
+        )
+        query = self._apply_filters(query, **filters)
+
+        return keyset_paginate(
+            query, ts_column=self.model.created_at, id_column=self.model.id,
+            cursor=cursor, skip=skip, limit=limit,
+        )
+
+    def count(self, db: Session, **filters) -> int:
+        """Count objectives matching filters with a single COUNT(*)."""
+        query = self._apply_filters(db.query(func.count(self.model.id)), **filters)
+        return query.scalar()
+
+    def select_rows(
+        self,
+        *,
+        columns: Sequence[Any],
+        owner_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+    ):
+        """Build a SELECT of objective ``columns`` with the list filters, parents first."""
+        query = self._apply_filters(
+            select(*columns),
+            owner_id=owner_id,
+            year=year,
+            quarter=quarter,
+            status=status,
+            department=department,
+        )
+        # Paths sort in hierarchy order
+        return query.order_by(self.model.path, self.model.id)
+
+    def _apply_filters(
+        self,
+        query,
+        *,
+        owner_id: Optional[int] = None,
+        level: Optional[str] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+    ):
+        """Apply the standard list filters to a query."""
         if owner_id is not None:
             query = query.filter(self.model.owner_id == owner_id)
         if level is not None:
@@ -59,8 +178,7 @@ class ObjectiveCRUD:
             query = query.filter(self.model.status == status)
         if department is not None:
             query = query.filter(self.model.department == department)
-
-        return query.offset(skip).limit(limit).all()
+        return query
 
     def update(
         self, db: Session, *, db_obj: Objective, obj_in: ObjectiveUpdate
@@ -68,6 +186,12 @@ class ObjectiveCRUD:
         """Update objective."""
         update_data = obj_in.model_dump(exclude_unset=True)
 
+        # Re-parenting must keep the subtree paths in sync
+        if "parent_id" in update_data:
+            new_parent_id = update_data.pop("parent_id")
+            if new_parent_id != db_obj.parent_id:
+                self._reparent(db, obj=db_obj, new_parent_id=new_parent_id)
+
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
@@ -79,8 +203,17 @@ class ObjectiveCRUD:
 
     def delete(self, db: Session, *, objective_id: int) -> Objective:
         """Delete objective (cascades to children and links)."""
-        obj = db.query(self.model).get(objective_id)
-        db.delete(obj)
+        obj = self.get(db, objective_id)
+        if obj.path:
+            # Remove the whole subtree in one statement; links go via FK cascade
+            (
+                db.query(self.model)
+                .filter(self._subtree_filter(obj.path))
+                .delete(synchronize_session=False)
+            )
+            db.expunge(obj)
+        else:
+            db.delete(obj)
         db.commit()
         return obj
 
@@ -91,48 +224,65 @@ class ObjectiveCRUD:
 
     def get_ancestors(self, db: Session, objective_id: int) -> List[Objective]:
         """Get all ancestors (parent chain) of an objective."""
-        ancestors = []
-        current = self.get(db, objective_id)
+        path = self._get_path(db, objective_id)
+        if not path:
+            return []
+
+        ancestor_ids = self._path_ids(path)[:-1]
+        if not ancestor_ids:
+            return []
+
+        ancestors = db.query(self.model).filter(self.model.id.in_(ancestor_ids)).all()
+        position = {ancestor_id: i for i, ancestor_id in enumerate(ancestor_ids)}
+        return sorted(ancestors, key=lambda a: position[a.id])  # Top to bottom
 
-        while current and current.parent_id:
-            parent = self.get(db, current.parent_id)
-            if parent:
-                ancestors.append(parent)
-                current = parent
-            else:
-                break
+    def get_descendants(self, db: Session, objective_id: int) -> List[Objective]:
+        """Get all descendants of an objective (excluding itself)."""
+        path = self._get_path(db, objective_id)
+        if not path:
+            return []
 
-        return list(reversed(ancestors))  # Return from top to bottom
+        return (
+            db.query(self.model)
+            .filter(self._subtree_filter(path), self.model.id != objective_id)
+            .order_by(self.model.path)
+            .all()
+        )
 
     def get_tree(self, db: Session, root_id: Optional[int] = None) -> List[Objective]:
         """
         Get full tree structure.
         If root_id is provided, returns subtree from that root.
         If root_id is None, returns all top-level objectives and their trees.
+
+        The whole (sub)tree is loaded in a single query and ``children`` is
+        populated in memory, so no per-node queries are issued.
         """
+        query = db.query(self.model).options(joinedload(self.model.owner))
+
         if root_id:
-            root = self.get(db, root_id)
-            if root:
-                return self._build_tree_recursive(db, root)
-            return []
+            path = self._get_path(db, root_id)
+            if not path:
+                return []
+            nodes = query.filter(self._subtree_filter(path)).order_by(self.model.id).all()
         else:
-            # Get all top-level objectives (no parent)
-            roots = db.query(self.model).filter(self.model.parent_id.is_(None)).all()
-            result = []
-            for root in roots:
-                result.append(self._build_tree_recursive(db, root))
-            return result
+            nodes = query.order_by(self.model.id).all()
 
-    def _build_tree_recursive(self, db: Session, node: Objective) -> Objective:
-        """Build tree recursively (internal helper)."""
-        # Load children
-        node.children = self.get_children(db, node.id)
+        children_map = {node.id: [] for node in nodes}
+        roots = []
+        for node in nodes:
+            if node.id != root_id and node.parent_id in children_map:
+                children_map[node.parent_id].append(node)
+            elif root_id is None and node.parent_id is None:
+                roots.append(node)
 
-        # Recursively build subtrees
-        for child in node.children:
-            self._build_tree_recursive(db, child)
+        for node in nodes:
+            set_committed_value(node, "children", children_map[node.id])
 
-        return node
+        if root_id:
+            root = next((node for node in nodes if node.id == root_id), None)
+            return root if root else []
+        return roots
 
     def move(
         self, db: Session, *, objective_id: int, new_parent_id: Optional[int]
@@ -142,21 +292,141 @@ class ObjectiveCRUD:
         if not obj:
             return None
 
-        # Validate no circular reference
+        self._reparent(db, obj=obj, new_parent_id=new_parent_id)
+
+        obj.updated_at = datetime.now(timezone.utc)
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+        return obj
+
+    # Materialized path helpers
+    def _get_path(self, db: Session, objective_id: int) -> Optional[str]:
+        """Get the stored path of an objective without loading the row."""
+        return (
+            db.query(self.model.path)
+            .filter(self.model.id == objective_id)
+            .scalar()
+        )
+
+    @staticmethod
+    def _path_ids(path: str) -> List[int]:
+        """Split a path like '/1/5/12/' into [1, 5, 12]."""
+        return [int(part) for part in path.strip("/").split("/") if part]
+
+    def _subtree_filter(self, path: str):
+        """
+        Filter matching a node and all of its descendants.
+
+        Expressed as an index-friendly range: every path below '/1/5/' sorts
+        between '/1/5/' and '/1/50' because '0' directly follows '/'.
+        """
+        return and_(self.model.path >= path, self.model.path < path[:-1] + "0")
+
+    def _reparent(
+        self, db: Session, *, obj: Objective, new_parent_id: Optional[int]
+    ) -> None:
+        """Point obj at a new parent and rewrite the paths of its subtree."""
+        parent_path = None
         if new_parent_id:
-            if objective_id == new_parent_id:
+            if obj.id == new_parent_id:
                 raise ValueError("Cannot move objective to itself")
 
-            ancestors = self.get_ancestors(db, new_parent_id)
-            if any(ancestor.id == objective_id for ancestor in ancestors):
+            parent_path = self._get_path(db, new_parent_id)
+            if parent_path is None:
+                raise ValueError("Parent objective not found")
+
+            # Target inside our own subtree → cycle
+            if obj.path and parent_path.startswith(obj.path):
                 raise ValueError("Cannot create circular reference")
 
+        old_path = obj.path
+        new_path = f"{parent_path or '/'}{obj.id}/"
+
+        if old_path and old_path != new_path:
+            (
+                db.query(self.model)
+                .filter(self._subtree_filter(old_path))
+                .update(
+                    {
+                        self.model.path: literal(new_path, String).concat(
+                            func.substr(self.model.path, len(old_path) + 1)
+                        )
+                    },
+                    synchronize_session=False,
+                )
+            )
+
         obj.parent_id = new_parent_id
-        obj.updated_at = datetime.now(timezone.utc)
-        db.add(obj)
+        obj.path = new_path
+
+    def rebuild_paths(self, db: Session) -> int:
+        """Recompute every path from parent_id (repair for legacy rows)."""
+        rows = db.query(self.model.id, self.model.parent_id).all()
+        parents = {row.id: row.parent_id for row in rows}
+        paths = {}
+
+        def resolve(objective_id: int) -> str:
+            if objective_id not in paths:
+                parent_id = parents.get(objective_id)
+                prefix = resolve(parent_id) if parent_id in parents else "/"
+                paths[objective_id] = f"{prefix}{objective_id}/"
+            return paths[objective_id]
+
+        for objective_id in parents:
+            resolve(objective_id)
+
+        db.bulk_update_mappings(
+            self.model, [{"id": oid, "path": path} for oid, path in paths.items()]
+        )
         db.commit()
-        db.refresh(obj)
-        return obj
+        return len(paths)
+
+    def get_subtrees(self, db: Session, root_ids: List[int]) -> List[tuple]:
+        """
+        Load every objective under the given roots (roots included) in one query.
+
+        Returns (Objective, owner_name) rows ordered by id.
+        """
+        from app.models.user import User
+
+        if not root_ids:
+            return []
+
+        root = aliased(self.model)
+        return (
+            db.query(self.model, User.full_name)
+            .join(
+                root,
+                and_(
+                    self.model.path >= root.path,
+                    self.model.path
+                    < func.substr(root.path, 1, func.length(root.path) - 1).concat("0"),
+                ),
+            )
+            .outerjoin(User, User.id == self.model.owner_id)
+            .filter(root.id.in_(root_ids))
+            .distinct()
+            .order_by(self.model.id)
+            .all()
+        )
+
+    def get_kpi_links_bulk(self, db: Session, objective_ids: List[int]) -> List[tuple]:
+        """
+        Load the KPI links of many objectives in one query.
+
+        Returns (objective_id, weight, KPI) rows ordered by link id.
+        """
+        if not objective_ids:
+            return []
+
+        return (
+            db.query(ObjectiveKPILink.objective_id, ObjectiveKPILink.weight, KPI)
+            .join(KPI, KPI.id == ObjectiveKPILink.kpi_id)
+            .filter(ObjectiveKPILink.objective_id.in_(objective_ids))
+            .order_by(ObjectiveKPILink.id)
+            .all()
+        )
 
     # KPI linking operations
     def link_kpi(
@@ -216,65 +486,164 @@ class ObjectiveCRUD:
         return [link.kpi for link in links]
 
     # Progress calculation
-    def calculate_progress(self, db: Session, objective_id: int) -> float:
+    @staticmethod
+    def _compute_progress(
+        children_progress: List[float], links: List[tuple], current: float
+    ) -> float:
         """
-        Calculate progress for an objective.
+        Progress rule shared by single-node and batched calculation.
 
         Logic:
         1. If has children objectives → average of children progress
         2. Else if has linked KPIs → weighted average of KPI progress
         3. Else → manual progress (already set)
         """
+        if children_progress:
+            return sum(children_progress) / len(children_progress)
+
+        if links:
+            total_weight = sum(weight for weight, _ in links)
+            if total_weight == 0:
+                return 0.0
+            return sum((progress or 0) * weight for weight, progress in links) / total_weight
+
+        return current
+
+    def calculate_progress(self, db: Session, objective_id: int) -> float:
+        """Calculate progress for an objective (see _compute_progress)."""
         obj = self.get(db, objective_id)
         if not obj:
             return 0.0
 
-        # Check for children
-        children = self.get_children(db, objective_id)
-        if children:
-            # Average of children progress
-            total_progress = sum(child.progress_percentage for child in children)
-            return total_progress / len(children) if children else 0.0
-
-        # Check for linked KPIs
+        children_progress = [
+            progress
+            for (progress,) in db.query(self.model.progress_percentage)
+            .filter(self.model.parent_id == objective_id)
+            .all()
+        ]
         links = (
-            db.query(ObjectiveKPILink)
+            db.query(ObjectiveKPILink.weight, KPI.progress_percentage)
+            .join(KPI, KPI.id == ObjectiveKPILink.kpi_id)
             .filter(ObjectiveKPILink.objective_id == objective_id)
             .all()
         )
-
-        if links:
-            # Weighted average of KPI progress
-            total_weight = sum(link.weight for link in links)
-            if total_weight == 0:
-                return 0.0
-
-            weighted_progress = sum(
-                (link.kpi.progress_percentage or 0) * link.weight for link in links
-            )
-            return weighted_progress / total_weight
-
-        # No children or KPIs, return current manual progress
-        return obj.progress_percentage
+        return self._compute_progress(children_progress, links, obj.progress_percentage)
 
     def recalculate_progress(self, db: Session, objective_id: int) -> Objective:
-        """Recalculate and update objective progress."""
+        """Recalculate and update objective progress (cascades to parents)."""
         obj = self.get(db, objective_id)
         if not obj:
             return None
 
-        new_progress = self.calculate_progress(db, objective_id)
-        obj.progress_percentage = new_progress
-        obj.updated_at = datetime.now(timezone.utc)
-        db.add(obj)
-        db.commit()
+        self.rollup_progress(db, objective_ids=[objective_id])
         db.refresh(obj)
+        return obj
 
-        # Recursively update parent progress
-        if obj.parent_id:
-            self.recalculate_progress(db, obj.parent_id)
+    def rollup_progress(
+        self,
+        db: Session,
+        *,
+        objective_ids: Iterable[int] = (),
+        kpi_ids: Iterable[int] = (),
+    ) -> Dict[int, float]:
+        """
+        Recompute progress for changed objectives/KPIs and all their ancestors.
 
-        return obj
+        Affected objectives are found through their materialized paths and
+        recomputed bottom-up from bulk-loaded children, link weights and KPI
+        progress. All changed values are written in one executemany and
+        committed (only flushed inside a unit_of_work). Returns
+        {objective_id: new_progress} for changed rows.
+        """
+        objective_ids = set(objective_ids)
+        kpi_ids = set(kpi_ids)
+        if not objective_ids and not kpi_ids:
+            return {}
+
+        seeds = []
+        if objective_ids:
+            seeds.append(self.model.id.in_(objective_ids))
+        if kpi_ids:
+            seeds.append(
+                self.model.id.in_(
+                    select(ObjectiveKPILink.objective_id).where(
+                        ObjectiveKPILink.kpi_id.in_(kpi_ids)
+                    )
+                )
+            )
+        paths = db.query(self.model.path).filter(or_(*seeds)).all()
+
+        affected = set()
+        for (path,) in paths:
+            if path:
+                affected.update(self._path_ids(path))
+
+        return self._rollup(db, affected)
+
+    def rollup_year(self, db: Session, year: int) -> Dict[int, float]:
+        """Recompute progress of every objective in a year (consistency repair)."""
+        affected = set()
+        for (path,) in db.query(self.model.path).filter(self.model.year == year).all():
+            if path:
+                affected.update(self._path_ids(path))
+
+        return self._rollup(db, affected)
+
+    def _rollup(self, db: Session, affected: set) -> Dict[int, float]:
+        """Recompute the affected objectives bottom-up and persist changes."""
+        if not affected:
+            return {}
+
+        # Affected nodes plus their direct children (children may be unaffected)
+        rows = (
+            db.query(
+                self.model.id,
+                self.model.parent_id,
+                self.model.path,
+                self.model.progress_percentage,
+            )
+            .filter(or_(self.model.id.in_(affected), self.model.parent_id.in_(affected)))
+            .all()
+        )
+        progress = {row.id: row.progress_percentage for row in rows}
+        depth = {row.id: row.path.count("/") if row.path else 0 for row in rows}
+        children = defaultdict(list)
+        for row in rows:
+            if row.parent_id in affected:
+                children[row.parent_id].append(row.id)
+
+        links = defaultdict(list)
+        for objective_id, weight, kpi_progress in (
+            db.query(ObjectiveKPILink.objective_id, ObjectiveKPILink.weight, KPI.progress_percentage)
+            .join(KPI, KPI.id == ObjectiveKPILink.kpi_id)
+            .filter(ObjectiveKPILink.objective_id.in_(affected))
+            .all()
+        ):
+            links[objective_id].append((weight, kpi_progress))
+
+        # Deepest first, so every child is final before its parent is computed
+        changed = {}
+        for objective_id in sorted(affected & progress.keys(), key=lambda oid: -depth[oid]):
+            new_progress = self._compute_progress(
+                [progress[child_id] for child_id in children[objective_id]],
+                links[objective_id],
+                progress[objective_id],
+            )
+            if new_progress != progress[objective_id]:
+                progress[objective_id] = new_progress
+                changed[objective_id] = new_progress
+
+        if changed:
+            now = datetime.now(timezone.utc)
+            db.execute(
+                update(self.model),
+                [
+                    {"id": oid, "progress_percentage": value, "updated_at": now}
+                    for oid, value in changed.items()
+                ],
+            )
+        commit_or_flush(db)
+        return changed
 
     # Statistics
     def get_stats(self, db: Session, **filters) -> dict:
@@ -0,0 +1,166 @@
+"""CRUD operations for background report jobs."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import commit_or_flush
+from app.models.report_job import ACTIVE_STATUSES, ReportJob
+
+
+def _utcnow() -> datetime:
+    # Stored naive, like the server_default timestamps
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CRUDReportJob:
+    """CRUD operations for report jobs."""
+
+    def get(self, db: Session, job_id: str) -> Optional[ReportJob]:
+        """Get report job by ID."""
+        return db.get(ReportJob, job_id)
+
+    def get_active(self, db: Session, *, spec_hash: str) -> Optional[ReportJob]:
+        """Get the queued or running job for a spec, if any."""
+        return db.execute(
+            select(ReportJob).where(
+                ReportJob.spec_hash == spec_hash,
+                ReportJob.status.in_(ACTIVE_STATUSES),
+            )
+        ).scalar_one_or_none()
+
+    def count_active(self, db: Session) -> int:
+        """Count queued and running jobs."""
+        return db.execute(
+            select(func.count()).select_from(ReportJob).where(ReportJob.status.in_(ACTIVE_STATUSES))
+        ).scalar()
+
+    def get_or_create(
+        self,
+        db: Session,
+        *,
+        report_type: str,
+        params: str,
+        spec_hash: str,
+        requested_by: int,
+    ) -> Tuple[ReportJob, bool]:
+        """
+        Return the active job for ``spec_hash`` or queue a new one.
+
+        Returns (job, created). Two requests racing for the same spec are
+        serialised by the partial unique index on active spec hashes: the
+        loser rolls back and joins the winner's job.
+        """
+        job = self.get_active(db, spec_hash=spec_hash)
+        if job:
+            return job, False
+
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            report_type=report_type,
+            params=params,
+            spec_hash=spec_hash,
+            requested_by=requested_by,
+            status="queued",
+            progress=0,
+        )
+        db.add(job)
+        try:
+            commit_or_flush(db, job)
+        except IntegrityError:
+            db.rollback()
+            job = self.get_active(db, spec_hash=spec_hash)
+            if job is None:
+                raise
+            return job, False
+        return job, True
+
+    def start(self, db: Session, job_id: str) -> Optional[ReportJob]:
+        """Mark a queued job as running; None if it is no longer queued."""
+        result = db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "queued")
+            .values(status="running", started_at=_utcnow())
+        )
+        commit_or_flush(db)
+        if not result.rowcount:
+            return None
+        job = self.get(db, job_id)
+        db.refresh(job)
+        return job
+
+    def set_progress(self, db: Session, job_id: str, progress: int) -> None:
+        """Update the progress of a running job."""
+        db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "running")
+            .values(progress=max(0, min(100, progress)))
+        )
+        commit_or_flush(db)
+
+    def complete(
+        self,
+        db: Session,
+        job_id: str,
+        *,
+        file_path: str,
+        file_name: str,
+        file_size: int,
+        ttl: timedelta,
+    ) -> None:
+        """Mark a job as completed with its rendered file."""
+        now = _utcnow()
+        db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id)
+            .values(
+                status="completed",
+                progress=100,
+                file_path=file_path,
+                file_name=file_name,
+                file_size=file_size,
+                finished_at=now,
+                expires_at=now + ttl,
+            )
+        )
+        commit_or_flush(db)
+
+    def fail(
+        self,
+        db: Session,
+        *,
+        error: str,
+        ttl: timedelta,
+        job_id: Optional[str] = None,
+    ) -> int:
+        """
+        Mark an active job as failed, or every active job if ``job_id`` is
+        None (jobs interrupted by a restart). Returns the number marked.
+        """
+        now = _utcnow()
+        query = update(ReportJob).where(ReportJob.status.in_(ACTIVE_STATUSES))
+        if job_id is not None:
+            query = query.where(ReportJob.id == job_id)
+        result = db.execute(
+            query.values(status="failed", error=error, finished_at=now, expires_at=now + ttl)
+        )
+        commit_or_flush(db)
+        return result.rowcount
+
+    def delete_expired(self, db: Session) -> List[Optional[str]]:
+        """Delete expired jobs and return their file paths for removal."""
+        paths = db.execute(
+            delete(ReportJob)
+            .where(ReportJob.expires_at <= _utcnow())
+            .returning(ReportJob.file_path)
+        ).scalars().all()
+        commit_or_flush(db)
+        return paths
+
+
+# Create singleton instance
+report_job_crud = CRUDReportJob()
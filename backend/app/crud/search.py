@@ -0,0 +1,152 @@
+"""Full-text search CRUD operations (SQLite FTS5)."""
+
+import html
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import literal_column, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models.search_index import (
+    CREATE_STATEMENTS,
+    KIND_COMMENT,
+    KIND_KPI,
+    KIND_NAMES,
+    KIND_OBJECTIVE,
+    POPULATE_STATEMENTS,
+    SEARCH_INDEX_TABLE,
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Private use characters that mark matches in snippet() output until the
+# text has been escaped (one typed by a user would at worst add a stray
+# <mark>, never other markup)
+_MARK_START = "\ue000"
+_MARK_END = "\ue001"
+
+
+def _highlight(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet, then turn its match markers into <mark> tags."""
+    return (
+        html.escape(snippet or "")
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+class CRUDSearch:
+    """CRUD operations for the full-text search index."""
+
+    @staticmethod
+    def build_match(term: str) -> Optional[str]:
+        """
+        Turn free text into an FTS5 MATCH expression.
+
+        Every word becomes a quoted prefix query and all words must match,
+        so 'rev gro' finds 'Revenue growth'. Returns None if the text has no
+        searchable words.
+        """
+        tokens = _TOKEN_RE.findall(term or "")
+        if not tokens:
+            return None
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def kpi_ids_matching(self, match: str):
+        """Subquery of KPI ids whose title/description match ``match``."""
+        return (
+            select(literal_column("rowid / 4"))
+            .select_from(table(SEARCH_INDEX_TABLE))
+            .where(text(f"{SEARCH_INDEX_TABLE} MATCH :search_match").bindparams(search_match=match))
+            .where(literal_column("rowid % 4") == KIND_KPI)
+        )
+
+    def search(
+        self,
+        db: Session,
+        *,
+        term: str,
+        kinds: Optional[Iterable[str]] = None,
+        owner_id: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked search across KPIs, objectives and comments.
+
+        Results are ordered by bm25 with titles weighted above bodies.
+        Titles are plain text; snippets are HTML, with the user's text
+        escaped and matches wrapped in <mark>. When ``owner_id`` is set,
+        only KPIs/objectives owned by that user and comments on their KPIs
+        are returned.
+        """
+        match = self.build_match(term)
+        if not match:
+            return []
+
+        codes = {code for code, name in KIND_NAMES.items() if not kinds or name in kinds}
+        if not codes:
+            return []
+
+        visibility = ""
+        if owner_id is not None:
+            visibility = (
+                "AND (k.user_id = :owner_id OR o.owner_id = :owner_id OR ck.user_id = :owner_id)"
+            )
+
+        rows = db.execute(
+            text(
+                f"""
+                SELECT s.rowid % 4 AS kind,
+                       s.rowid / 4 AS id,
+                       coalesce(k.title, o.title, ck.title) AS title,
+                       snippet({SEARCH_INDEX_TABLE}, -1, '{_MARK_START}', '{_MARK_END}', '…', 12)
+                           AS snippet,
+                       ck.id AS kpi_id,
+                       bm25({SEARCH_INDEX_TABLE}, 10.0, 1.0) AS rank
+                FROM {SEARCH_INDEX_TABLE} s
+                LEFT JOIN kpis k ON s.rowid % 4 = {KIND_KPI} AND k.id = s.rowid / 4
+                LEFT JOIN objectives o ON s.rowid % 4 = {KIND_OBJECTIVE} AND o.id = s.rowid / 4
+                LEFT JOIN kpi_comments c ON s.rowid % 4 = {KIND_COMMENT} AND c.id = s.rowid / 4
+                LEFT JOIN kpis ck ON ck.id = c.kpi_id
+                WHERE {SEARCH_INDEX_TABLE} MATCH :match
+                  AND s.rowid % 4 IN ({", ".join(str(code) for code in sorted(codes))})
+                  {visibility}
+                ORDER BY rank
+                LIMIT :limit
+                """
+            ),
+            {"match": match, "owner_id": owner_id, "limit": limit},
+        ).all()
+
+        return [
+            {
+                "type": KIND_NAMES[row.kind],
+                "id": row.id,
+                "title": row.title,
+                "snippet": _highlight(row.snippet),
+                "kpi_id": row.kpi_id if row.kind == KIND_COMMENT else None,
+                "rank": row.rank,
+            }
+            for row in rows
+        ]
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recreate and refill the search index from the source tables.
+
+        Used for databases that existed before the index, or after bulk
+        changes made with triggers disabled. Returns the number of entries.
+        """
+        for statement in CREATE_STATEMENTS:
+            db.execute(text(statement))
+        db.execute(text(f"DELETE FROM {SEARCH_INDEX_TABLE}"))
+        for statement in POPULATE_STATEMENTS:
+            db.execute(text(statement))
+        db.execute(text(
+            f"INSERT INTO {SEARCH_INDEX_TABLE}({SEARCH_INDEX_TABLE}) VALUES ('optimize')"
+        ))
+        db.commit()
+        return db.execute(text(f"SELECT count(*) FROM {SEARCH_INDEX_TABLE}")).scalar()
+
+
+search_crud = CRUDSearch()
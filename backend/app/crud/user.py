@@ -1,8 +1,10 @@
 """CRUD operations for User model."""
 
-from typing import Optional
+from typing import Iterable, List, Optional
 import json
 from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -78,6 +80,35 @@ class CRUDUser:
             return None
         return user
 
+    def get_notification_recipients(
+        self,
+        db: Session,
+        *,
+        user_ids: Optional[Iterable[int]] = None,
+        roles: Optional[Iterable[str]] = None,
+        department: Optional[str] = None,
+        preference: Optional[str] = None,
+    ) -> List[Row]:
+        """
+        Active users to notify, as (id, email, email_notifications) rows.
+
+        Targets ``user_ids`` and/or everyone with one of ``roles`` in
+        ``department``, excluding users who turned off the ``preference``
+        flag (e.g. "notify_kpi_submitted"). Only columns are loaded.
+        """
+        query = select(User.id, User.email, User.email_notifications).where(User.is_active == True)
+        if user_ids is not None:
+            query = query.where(User.id.in_(list(user_ids)))
+        if roles is not None:
+            query = query.where(User.role.in_(list(roles)))
+        if department is not None:
+            query = query.where(User.department == department)
+        if preference is not None:
+            if not preference.startswith("notify_") or not hasattr(User, preference):
+                raise ValueError(f"Unknown notification preference: {preference}")
+            query = query.where(getattr(User, preference) == True)
+        return db.execute(query.order_by(User.id)).all()
+
     def is_active(self, user: User) -> bool:
         """Check if user is active."""
         return user.is_active
@@ -1,8 +1,11 @@
 """Database configuration and session management."""
 
+from contextlib import contextmanager
+from typing import Iterator
+
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
 # Create SQLAlchemy engine
@@ -40,3 +43,41 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Group CRUD writes into a single transaction.
+
+    Inside the block, CRUD methods only flush (see commit_or_flush) and the
+    whole block is committed once on exit, or rolled back on error. Nested
+    blocks join the outermost one.
+    """
+    outer = db.info.get("unit_of_work", False)
+    db.info["unit_of_work"] = True
+    try:
+        yield db
+        if not outer:
+            db.commit()
+    except Exception:
+        if not outer:
+            db.rollback()
+        raise
+    finally:
+        db.info["unit_of_work"] = outer
+
+
+def commit_or_flush(db: Session, *refresh) -> None:
+    """
+    Commit pending changes, or only flush them inside a unit_of_work block.
+
+    Objects passed in ``refresh`` are reloaded after a real commit so server
+    defaults are available; inside a unit of work they load lazily instead.
+    """
+    if db.info.get("unit_of_work"):
+        db.flush()
+        return
+    db.commit()
+    for obj in refresh:
+        db.refresh(obj)
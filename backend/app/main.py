@@ -16,6 +16,7 @@ from app.api.v1 import auth, kpis, templates, files, comments, notifications, an
 from app.api.v1 import admin, admin_settings  # User management & admin settings endpoints
 from app.api.v1 import settings as settings_api
 from app.api.v1 import objectives  # OKR objectives management
+from app.api.v1 import search  # Full-text search
 
 # Configure logging
 logging.basicConfig(
@@ -76,6 +77,7 @@ app.include_router(admin_settings.router, prefix="/api/v1/admin/settings", tags=
 app.include_router(settings_api.router, prefix="/api/v1/settings", tags=["Settings"])
 app.include_router(upload.router, prefix="/api/v1/upload", tags=["Upload"])
 app.include_router(preferences.router, prefix="/api/v1/preferences", tags=["Preferences"])
+app.include_router(search.router, prefix="/api/v1/search", tags=["Search"])
 
 # Mount static files for uploads
 UPLOAD_DIR = Path("/data/uploads")
@@ -94,6 +96,18 @@ async def startup_event():
     from app.core.scheduler import start_scheduler
     start_scheduler()
 
+    # Start objective progress rollup worker
+    from app.core.progress_rollup import objective_rollup_queue
+    objective_rollup_queue.start()
+
+    # Start background report workers
+    from app.core.report_jobs import report_job_queue
+    report_job_queue.start()
+
+    # Start email delivery worker
+    from app.core.email_outbox import email_outbox_worker
+    email_outbox_worker.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -102,6 +116,18 @@ async def shutdown_event():
     from app.core.scheduler import shutdown_scheduler
     shutdown_scheduler()
 
+    # Stop rollup worker (flushes pending changes)
+    from app.core.progress_rollup import objective_rollup_queue
+    objective_rollup_queue.stop()
+
+    # Stop report workers (running reports finish first)
+    from app.core.report_jobs import report_job_queue
+    report_job_queue.stop()
+
+    # Stop email delivery worker (undelivered emails stay queued)
+    from app.core.email_outbox import email_outbox_worker
+    await email_outbox_worker.stop()
+
     logger.info("Shutting down application")
 
 
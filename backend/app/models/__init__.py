@@ -2,9 +2,16 @@
 
 from app.models.user import User
 from app.models.objective import Objective, ObjectiveKPILink
-from app.models.kpi import KPI, KPITemplate, KPIEvidence, KPIComment, KPIHistory
+from app.models.kpi import KPI, KPITemplate, KPIEvidence, KPIComment, KPIHistory, KPIMeasurement
 from app.models.notification import Notification
+from app.models.notification_counter import NotificationCounter
+from app.models.data_version import DataVersion
 from app.models.system import SystemSettings
+from app.models.report_job import ReportJob
+from app.models.kpi_rollup import KPIRollup
+from app.models.email_outbox import OutboxEmail
+from app.models.digest import DigestRun, ObjectiveProgressSnapshot
+from app.models import search_index  # noqa: F401  (registers FTS5 DDL on create_all)
 
 __all__ = [
     "User",
@@ -15,6 +22,13 @@ __all__ = [
     "KPIEvidence",
     "KPIComment",
     "KPIHistory",
+    "KPIMeasurement",
     "Notification",
+    "NotificationCounter",
     "SystemSettings",
+    "ReportJob",
+    "KPIRollup",
+    "OutboxEmail",
+    "DigestRun",
+    "ObjectiveProgressSnapshot",
 ]
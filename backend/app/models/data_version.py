@@ -0,0 +1,56 @@
+"""Write counters for the data reports are built from.
+
+SQLite triggers bump a named counter on every write to the table it
+tracks, in the same transaction and from every write path, so unlike an
+updated_at (whole seconds) it changes even for writes within the same
+second. A counter without a row is at 0.
+"""
+
+from sqlalchemy import DDL, Column, Integer, String, event
+
+from app.database import Base
+
+DATA_VERSION_TABLE = "data_versions"
+
+# Counter names
+KPIS = "kpis"
+USERS = "users"  # the fields a report shows about a user
+
+
+def _bump(name: str) -> str:
+    return (
+        f"INSERT INTO {DATA_VERSION_TABLE} (name, version) VALUES ('{name}', 1) "
+        f"ON CONFLICT(name) DO UPDATE SET version = version + 1;"
+    )
+
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS kpis_version_ai AFTER INSERT ON kpis BEGIN {_bump(KPIS)} END",
+    f"CREATE TRIGGER IF NOT EXISTS kpis_version_ad AFTER DELETE ON kpis BEGIN {_bump(KPIS)} END",
+    f"CREATE TRIGGER IF NOT EXISTS kpis_version_au AFTER UPDATE ON kpis BEGIN {_bump(KPIS)} END",
+    f"CREATE TRIGGER IF NOT EXISTS users_version_au "
+    f"AFTER UPDATE OF username, full_name, email, department, role ON users "
+    f"BEGIN {_bump(USERS)} END",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {name}"
+    for name in ("kpis_version_ai", "kpis_version_ad", "kpis_version_au", "users_version_au")
+]
+
+
+class DataVersion(Base):
+    """Number of writes to one tracked table."""
+
+    __tablename__ = DATA_VERSION_TABLE
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}: {self.version}>"
+
+
+# Databases created with metadata.create_all() (init_db.py) get the triggers too
+for _statement in CREATE_STATEMENTS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
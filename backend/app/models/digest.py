@@ -0,0 +1,42 @@
+"""Weekly digest run models."""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class DigestRun(Base):
+    """One weekly digest run and its progress checkpoint."""
+
+    __tablename__ = "digest_runs"
+
+    id = Column(Integer, primary_key=True)
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    status = Column(String(20), default="running", nullable=False)  # running, completed
+    last_user_id = Column(Integer, default=0, nullable=False)  # users up to this id are done
+    emails_queued = Column(Integer, default=0, nullable=False)
+    lease_until = Column(DateTime, nullable=True)  # set while a process works on the run
+    started_at = Column(DateTime, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # At most one run in progress: concurrent schedulers collide here
+        Index("ix_digest_runs_running", status, unique=True, sqlite_where=status == "running"),
+    )
+
+    def __repr__(self):
+        return f"<DigestRun {self.id} {self.status}>"
+
+
+class ObjectiveProgressSnapshot(Base):
+    """Objective progress as of a digest run, the baseline for the next run's deltas."""
+
+    __tablename__ = "objective_progress_snapshots"
+
+    run_id = Column(Integer, ForeignKey("digest_runs.id", ondelete="CASCADE"), primary_key=True)
+    objective_id = Column(Integer, primary_key=True)
+    progress = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ObjectiveProgressSnapshot run {self.run_id} objective {self.objective_id}>"
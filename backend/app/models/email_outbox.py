@@ -0,0 +1,39 @@
+"""Email outbox model."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+# Messages in these states are still to be delivered
+UNSENT_STATUSES = ("pending", "sending")
+
+
+class OutboxEmail(Base):
+    """An email waiting for (or done with) delivery by the outbox worker."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    recipients = Column(Text, nullable=False)  # JSON list of addresses
+    subject = Column(String(255), nullable=False)
+    body_html = Column(Text, nullable=False)
+    body_text = Column(Text, nullable=True)
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="SET NULL"), nullable=True)
+    status = Column(String(20), default="pending", nullable=False)  # pending, sending, sent, dead
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, server_default=func.now(), nullable=False)  # or lease expiry while sending
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Due messages, without the delivered history
+        Index(
+            "ix_email_outbox_due",
+            next_attempt_at,
+            sqlite_where=status.in_(UNSENT_STATUSES),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEmail {self.id} {self.status}>"
@@ -1,6 +1,9 @@
 """KPI related models."""
 
-from sqlalchemy import Boolean, Column, Integer, String, Text, Float, DateTime, ForeignKey
+from sqlalchemy import (
+    Boolean, Column, Integer, String, Text, Float, DateTime, ForeignKey, Index, case, or_,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -34,10 +37,23 @@ class KPI(Base):
     """Main KPI model."""
 
     __tablename__ = "kpis"
+    __table_args__ = (
+        # An external key identifies one KPI per period (kept by rollovers)
+        Index("ix_kpis_external_key_period", "external_key", "year", "quarter", unique=True),
+        # Covering index for per-user analytics and the rollup rebuild
+        Index(
+            "ix_kpis_year_user_id",
+            "year", "user_id", "status", "quarter", "category", "progress_percentage",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    template_id = Column(Integer, ForeignKey("kpi_templates.id", ondelete="SET NULL"), nullable=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    template_id = Column(
+        Integer, ForeignKey("kpi_templates.id", ondelete="SET NULL"), nullable=True
+    )
     year = Column(Integer, nullable=False, index=True)
     quarter = Column(String(10), nullable=False, index=True)
     title = Column(String(200), nullable=False)
@@ -45,8 +61,15 @@ class KPI(Base):
     category = Column(String(50), nullable=True)
     target_value = Column(String(100), nullable=True)
     current_value = Column(String(100), nullable=True)
+    # Numeric shadows of target_value/current_value, parsed on write
+    target_numeric = Column(Float, nullable=True)
+    current_numeric = Column(Float, nullable=True)
+    unit = Column(String(20), nullable=True)
+    # Whether a 'higher' or 'lower' value is better
+    direction = Column(String(10), default="higher", server_default="higher", nullable=False)
     progress_percentage = Column(Float, nullable=True)
     measurement_method = Column(String(50), nullable=True)
+    external_key = Column(String(100), nullable=True)  # id in the system feeding current values
     status = Column(String(20), default="draft", nullable=False, index=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -61,7 +84,49 @@ class KPI(Base):
     evidence = relationship("KPIEvidence", back_populates="kpi", cascade="all, delete-orphan")
     comments = relationship("KPIComment", back_populates="kpi", cascade="all, delete-orphan")
     history = relationship("KPIHistory", back_populates="kpi", cascade="all, delete-orphan")
-    objective_links = relationship("ObjectiveKPILink", back_populates="kpi", cascade="all, delete-orphan")
+    objective_links = relationship(
+        "ObjectiveKPILink", back_populates="kpi", cascade="all, delete-orphan"
+    )
+
+    @hybrid_property
+    def derived_progress(self):
+        """
+        Progress (0-100) implied by the numeric target and current values.
+
+        Higher-is-better KPIs score current / target, lower-is-better KPIs
+        score target / current (100 once current drops to zero or below).
+        None when either value is missing or a higher-is-better target is 0.
+        """
+        target, current = self.target_numeric, self.current_numeric
+        if target is None or current is None:
+            return None
+        if self.direction == "lower":
+            if current <= 0:
+                return 100.0
+            progress = target * 100.0 / current
+        elif target == 0:
+            return None
+        else:
+            progress = current * 100.0 / target
+        return max(0.0, min(100.0, progress))
+
+    @derived_progress.expression
+    def derived_progress(cls):
+        """SQL form of derived_progress for set-based updates and aggregates."""
+        return case(
+            (or_(cls.target_numeric.is_(None), cls.current_numeric.is_(None)), None),
+            (
+                cls.direction == "lower",
+                case(
+                    (cls.current_numeric <= 0, 100.0),
+                    else_=func.max(
+                        0.0, func.min(100.0, cls.target_numeric * 100.0 / cls.current_numeric)
+                    ),
+                ),
+            ),
+            (cls.target_numeric == 0, None),
+            else_=func.max(0.0, func.min(100.0, cls.current_numeric * 100.0 / cls.target_numeric)),
+        )
 
     def __repr__(self):
         return f"<KPI {self.title} - {self.year} {self.quarter}>"
@@ -128,3 +193,24 @@ class KPIHistory(Base):
 
     def __repr__(self):
         return f"<KPIHistory {self.action} on KPI {self.kpi_id}>"
+
+
+class KPIMeasurement(Base):
+    """Append-only time series of numeric KPI values."""
+
+    __tablename__ = "kpi_measurements"
+    __table_args__ = (
+        # Covers per-KPI range scans in time order; no separate kpi_id index
+        Index("ix_kpi_measurements_kpi_id_measured_at", "kpi_id", "measured_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kpi_id = Column(Integer, ForeignKey("kpis.id", ondelete="CASCADE"), nullable=False)
+    measured_at = Column(DateTime, server_default=func.now(), nullable=False)
+    value = Column(Float, nullable=False)
+
+    # Relationships (no collection on KPI: series are read with aggregate queries)
+    kpi = relationship("KPI")
+
+    def __repr__(self):
+        return f"<KPIMeasurement {self.value} on KPI {self.kpi_id} at {self.measured_at}>"
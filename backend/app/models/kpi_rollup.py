@@ -0,0 +1,112 @@
+"""Pre-aggregated KPI counts per (department, year, quarter, category, status).
+
+The rollup is kept current by SQLite triggers on ``kpis`` and ``users``, so
+every write path (ORM, bulk ingest, rollover, raw SQL) updates it in the same
+transaction. A KPI's department is its owner's. NULL departments and
+categories are stored as '' so they can be part of the primary key.
+"""
+
+from sqlalchemy import DDL, Column, Float, Integer, String, event
+
+from app.database import Base
+
+KPI_ROLLUP_TABLE = "kpi_rollups"
+
+_KEY = "department, year, quarter, category, status"
+
+_ACCUMULATE = (
+    "ON CONFLICT(department, year, quarter, category, status) DO UPDATE SET "
+    "kpi_count = kpi_count + excluded.kpi_count, "
+    "progress_sum = progress_sum + excluded.progress_sum, "
+    "progress_count = progress_count + excluded.progress_count;"
+)
+
+_DELETE_EMPTY = f"DELETE FROM {KPI_ROLLUP_TABLE} WHERE kpi_count = 0;"
+
+
+def _department(row: str) -> str:
+    return f"coalesce((SELECT department FROM users WHERE id = {row}.user_id), '')"
+
+
+def _add_row(row: str, sign: str) -> str:
+    """Upsert one KPI row (``new`` or ``old``) into the rollup with ``sign``."""
+    return (
+        f"INSERT INTO {KPI_ROLLUP_TABLE} ({_KEY}, kpi_count, progress_sum, progress_count) "
+        f"VALUES ({_department(row)}, {row}.year, {row}.quarter, coalesce({row}.category, ''), "
+        f"{row}.status, {sign}1, {sign}coalesce({row}.progress_percentage, 0), "
+        f"{sign}({row}.progress_percentage IS NOT NULL)) {_ACCUMULATE}"
+    )
+
+
+def _delete_if_empty(row: str) -> str:
+    """Drop the rollup row of a KPI row once no KPIs are left in it."""
+    return (
+        f"DELETE FROM {KPI_ROLLUP_TABLE} WHERE department = {_department(row)} "
+        f"AND year = {row}.year AND quarter = {row}.quarter "
+        f"AND category = coalesce({row}.category, '') AND status = {row}.status "
+        f"AND kpi_count = 0;"
+    )
+
+
+def _add_user(row: str, sign: str) -> str:
+    """Upsert all KPIs of a user into the rollup under ``row``'s department."""
+    return (
+        f"INSERT INTO {KPI_ROLLUP_TABLE} ({_KEY}, kpi_count, progress_sum, progress_count) "
+        f"SELECT coalesce({row}.department, ''), year, quarter, coalesce(category, ''), status, "
+        f"{sign}count(*), {sign}total(progress_percentage), {sign}count(progress_percentage) "
+        f"FROM kpis WHERE user_id = {row}.id GROUP BY 2, 3, 4, 5 {_ACCUMULATE}"
+    )
+
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_ai AFTER INSERT ON kpis "
+    f"BEGIN {_add_row('new', '+')} END",
+    f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_ad AFTER DELETE ON kpis "
+    f"BEGIN {_add_row('old', '-')} {_delete_if_empty('old')} END",
+    f"CREATE TRIGGER IF NOT EXISTS kpis_rollup_au "
+    f"AFTER UPDATE OF user_id, year, quarter, category, status, progress_percentage ON kpis "
+    f"BEGIN {_add_row('old', '-')} {_add_row('new', '+')} {_delete_if_empty('old')} END",
+    # Move a user's KPIs when their department changes
+    f"CREATE TRIGGER IF NOT EXISTS users_rollup_au AFTER UPDATE OF department ON users "
+    f"WHEN coalesce(old.department, '') <> coalesce(new.department, '') "
+    f"BEGIN {_add_user('old', '-')} {_add_user('new', '+')} {_DELETE_EMPTY} END",
+    # Delete a user's KPIs while the user (and so the department) still
+    # exists; the foreign key cascade would run after the user is gone
+    "CREATE TRIGGER IF NOT EXISTS users_rollup_bd BEFORE DELETE ON users "
+    "BEGIN DELETE FROM kpis WHERE user_id = old.id; END",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {name}"
+    for name in ("kpis_rollup_ai", "kpis_rollup_ad", "kpis_rollup_au", "users_rollup_au", "users_rollup_bd")
+]
+
+# Aggregates of the source tables, as (key..., kpi_count, progress_sum, progress_count)
+AGGREGATE_QUERY = (
+    "SELECT coalesce(u.department, ''), k.year, k.quarter, coalesce(k.category, ''), k.status, "
+    "count(*), total(k.progress_percentage), count(k.progress_percentage) "
+    "FROM kpis k JOIN users u ON u.id = k.user_id GROUP BY 1, 2, 3, 4, 5"
+)
+
+
+class KPIRollup(Base):
+    """KPI count and progress totals for one (department, year, quarter, category, status)."""
+
+    __tablename__ = KPI_ROLLUP_TABLE
+
+    department = Column(String(100), primary_key=True, default="")
+    year = Column(Integer, primary_key=True)
+    quarter = Column(String(10), primary_key=True)
+    category = Column(String(50), primary_key=True, default="")
+    status = Column(String(20), primary_key=True)
+    kpi_count = Column(Integer, nullable=False, default=0)
+    progress_sum = Column(Float, nullable=False, default=0.0)  # NULL progress counts as 0
+    progress_count = Column(Integer, nullable=False, default=0)  # KPIs with a progress value
+
+    def __repr__(self):
+        return f"<KPIRollup {self.department}/{self.year}/{self.quarter}/{self.category}/{self.status}>"
+
+
+# Databases created with metadata.create_all() (init_db.py) get the triggers too
+for _statement in CREATE_STATEMENTS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
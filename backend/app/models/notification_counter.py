@@ -0,0 +1,73 @@
+"""Per-user unread notification counters.
+
+The counters are kept current by SQLite triggers on ``notifications``, so
+every write path (ORM, bulk fan-out, mark-all-read, cleanup, the cascade
+from a deleted user) updates them in the same transaction. A user without
+a row has no unread notifications.
+"""
+
+from sqlalchemy import DDL, Column, ForeignKey, Integer, event
+
+from app.database import Base
+
+NOTIFICATION_COUNTER_TABLE = "notification_counters"
+
+
+def _increment(row: str) -> str:
+    """Count ``row`` (``new``) in its user's counter if it is unread."""
+    return (
+        f"INSERT INTO {NOTIFICATION_COUNTER_TABLE} (user_id, unread) "
+        f"SELECT {row}.user_id, 1 WHERE NOT {row}.is_read "
+        f"ON CONFLICT(user_id) DO UPDATE SET unread = unread + 1;"
+    )
+
+
+def _decrement(row: str) -> str:
+    """
+    Uncount ``row`` (``old``) if it was unread. An UPDATE, never an insert:
+    when a user is deleted, the cascade to their notifications must not
+    recreate the counter it already removed.
+    """
+    return (
+        f"UPDATE {NOTIFICATION_COUNTER_TABLE} SET unread = unread - 1 "
+        f"WHERE user_id = {row}.user_id AND NOT {row}.is_read;"
+    )
+
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS notifications_unread_ai AFTER INSERT ON notifications "
+    f"WHEN NOT new.is_read BEGIN {_increment('new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS notifications_unread_ad AFTER DELETE ON notifications "
+    f"WHEN NOT old.is_read BEGIN {_decrement('old')} END",
+    f"CREATE TRIGGER IF NOT EXISTS notifications_unread_au "
+    f"AFTER UPDATE OF user_id, is_read ON notifications "
+    f"WHEN old.is_read IS NOT new.is_read OR old.user_id IS NOT new.user_id "
+    f"BEGIN {_decrement('old')} {_increment('new')} END",
+]
+
+DROP_STATEMENTS = [
+    f"DROP TRIGGER IF EXISTS {name}"
+    for name in ("notifications_unread_ai", "notifications_unread_ad", "notifications_unread_au")
+]
+
+# Counters computed from the source table, as (user_id, unread)
+AGGREGATE_QUERY = (
+    "SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id"
+)
+
+
+class NotificationCounter(Base):
+    """Number of unread notifications of one user."""
+
+    __tablename__ = NOTIFICATION_COUNTER_TABLE
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<NotificationCounter user {self.user_id}: {self.unread}>"
+
+
+# Databases created with metadata.create_all() (init_db.py) get the triggers too
+for _statement in CREATE_STATEMENTS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
@@ -27,6 +27,7 @@ class Objective(Base):
     # Hierarchy
     parent_id = Column(Integer, ForeignKey("objectives.id", ondelete="CASCADE"), nullable=True, index=True)
     level = Column(String(20), nullable=False, index=True)  # 'company', 'unit', 'division', 'team', 'individual'
+    path = Column(String(255), nullable=True, index=True)  # Materialized path of ids from root, e.g. '/1/5/12/'
 
     # Ownership
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
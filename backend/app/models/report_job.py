@@ -0,0 +1,43 @@
+"""Background report job model."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+# Jobs in these states hold their spec hash, so identical requests share them
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ReportJob(Base):
+    """A PDF/Excel report rendered in the background."""
+
+    __tablename__ = "report_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    report_type = Column(String(10), nullable=False)  # pdf, excel
+    params = Column(Text, nullable=False)  # normalised filters as JSON
+    spec_hash = Column(String(64), nullable=False)
+    requested_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String(20), default="queued", nullable=False)  # queued, running, completed, failed
+    progress = Column(Integer, default=0, nullable=False)  # 0-100
+    file_path = Column(String(500), nullable=True)
+    file_name = Column(String(255), nullable=True)
+    file_size = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True, index=True)
+
+    __table_args__ = (
+        # At most one active job per spec: concurrent duplicates collide here
+        Index(
+            "ix_report_jobs_active_spec",
+            spec_hash,
+            unique=True,
+            sqlite_where=status.in_(ACTIVE_STATUSES),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ReportJob {self.id} {self.report_type} {self.status}>"
@@ -0,0 +1,74 @@
+"""SQLite FTS5 full-text search index for KPIs, objectives and comments.
+
+The index is a single FTS5 table holding (title, body) for every searchable
+row. The rowid encodes the source row as ``id * 4 + kind`` so triggers can
+update or delete an entry with a rowid lookup instead of scanning the index.
+"""
+
+from sqlalchemy import DDL, event
+
+from app.database import Base
+
+SEARCH_INDEX_TABLE = "search_index"
+
+# Entity kind codes stored in rowid % 4
+KIND_KPI = 1
+KIND_OBJECTIVE = 2
+KIND_COMMENT = 3
+
+KIND_NAMES = {KIND_KPI: "kpi", KIND_OBJECTIVE: "objective", KIND_COMMENT: "comment"}
+
+# (source table, kind, title expression, body expression, watched columns)
+_SOURCES = (
+    ("kpis", KIND_KPI, "{row}.title", "coalesce({row}.description, '')", "title, description"),
+    ("objectives", KIND_OBJECTIVE, "{row}.title", "coalesce({row}.description, '')", "title, description"),
+    ("kpi_comments", KIND_COMMENT, "''", "{row}.comment", "comment"),
+)
+
+
+def _trigger_statements():
+    """Build the triggers that keep the index in sync with its source tables."""
+    statements = []
+    for table, kind, title, body, columns in _SOURCES:
+        insert_new = (
+            f"INSERT INTO {SEARCH_INDEX_TABLE}(rowid, title, body) "
+            f"VALUES (new.id * 4 + {kind}, {title.format(row='new')}, {body.format(row='new')});"
+        )
+        delete_old = f"DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid = old.id * 4 + {kind};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {columns} ON {table} "
+            f"BEGIN {delete_old} {insert_new} END",
+        ]
+    return statements
+
+
+CREATE_STATEMENTS = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5("
+    "title, body, tokenize = 'unicode61 remove_diacritics 2')",
+    *_trigger_statements(),
+]
+
+DROP_STATEMENTS = [
+    *(
+        f"DROP TRIGGER IF EXISTS {table}_search_{suffix}"
+        for table, *_ in _SOURCES
+        for suffix in ("ai", "ad", "au")
+    ),
+    f"DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}",
+]
+
+# Statements that refill the index from the source tables
+POPULATE_STATEMENTS = [
+    f"INSERT INTO {SEARCH_INDEX_TABLE}(rowid, title, body) "
+    f"SELECT id * 4 + {kind}, {title.format(row=table)}, {body.format(row=table)} FROM {table}"
+    for table, kind, title, body, _ in _SOURCES
+]
+
+
+# Databases created with metadata.create_all() (init_db.py) get the index too
+for _statement in CREATE_STATEMENTS:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
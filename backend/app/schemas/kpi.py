@@ -1,7 +1,7 @@
 """KPI related schemas."""
 
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Literal, Optional, List
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -59,7 +59,10 @@ class KPIBase(BaseModel):
     target_value: Optional[str] = Field(None, max_length=100)
     current_value: Optional[str] = Field(None, max_length=100)
     progress_percentage: Optional[float] = Field(None, ge=0, le=100)
+    unit: Optional[str] = Field(None, max_length=20)
+    direction: Literal["higher", "lower"] = "higher"  # which way is better
     measurement_method: Optional[str] = Field(None, max_length=50)
+    external_key: Optional[str] = Field(None, max_length=100)  # for bulk value ingest
     template_id: Optional[int] = None
 
     @field_validator('quarter')
@@ -84,13 +87,18 @@ class KPIUpdate(BaseModel):
     target_value: Optional[str] = Field(None, max_length=100)
     current_value: Optional[str] = Field(None, max_length=100)
     progress_percentage: Optional[float] = Field(None, ge=0, le=100)
+    unit: Optional[str] = Field(None, max_length=20)
+    direction: Optional[Literal["higher", "lower"]] = None
     measurement_method: Optional[str] = Field(None, max_length=50)
+    external_key: Optional[str] = Field(None, max_length=100)
 
 
 class KPIResponse(KPIBase):
     """Schema for KPI response."""
     id: int
     user_id: int
+    target_numeric: Optional[float] = None
+    current_numeric: Optional[float] = None
     status: str
     created_at: datetime
     updated_at: datetime
@@ -104,10 +112,11 @@ class KPIResponse(KPIBase):
 class KPIListResponse(BaseModel):
     """Schema for KPI list response with pagination."""
     items: List[KPIResponse]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Opaque cursor for the next page
 
 
 # ============================================================================
@@ -197,15 +206,23 @@ class KPIStatistics(BaseModel):
     completion_rate: float = 0.0
 
 
+class QuarterlyStatistics(KPIStatistics):
+    """Schema for KPI statistics of a single quarter."""
+    year: int
+    quarter: str
+
+
 class DashboardStatistics(BaseModel):
     """Schema for dashboard statistics."""
     total_kpis: int = 0
+    draft: int = 0
     pending_approval: int = 0
     approved: int = 0
     rejected: int = 0
     my_kpis: int = 0
     average_progress: float = 0.0
-    quarterly_stats: List[dict] = []
+    completion_rate: float = 0.0
+    quarterly_stats: List[QuarterlyStatistics] = []
 
 
 # ============================================================================
@@ -225,3 +242,123 @@ class KPIApprove(BaseModel):
 class KPIReject(BaseModel):
     """Schema for rejecting a KPI."""
     reason: str = Field(..., min_length=1)
+
+
+class KPIBulkApprove(BaseModel):
+    """Schema for approving several KPIs at once."""
+    kpi_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    comment: Optional[str] = None
+
+
+class KPIBulkReject(BaseModel):
+    """Schema for rejecting several KPIs at once."""
+    kpi_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    reason: str = Field(..., min_length=1)
+
+
+class KPIRollover(BaseModel):
+    """Schema for opening a new period by cloning KPIs in bulk."""
+    year: int = Field(..., ge=2000, le=2100)
+    quarter: str = Field(..., pattern="^Q[1-4]$")
+    source: Literal["previous", "templates"] = "previous"
+    source_year: Optional[int] = Field(None, ge=2000, le=2100)  # defaults to the preceding quarter
+    source_quarter: Optional[str] = Field(None, pattern="^Q[1-4]$")
+    department: Optional[str] = None
+    user_ids: Optional[List[int]] = None
+    categories: Optional[List[str]] = None  # template categories (templates source only)
+    copy_links: bool = True  # copy objective links of cloned KPIs (previous source only)
+    dry_run: bool = False
+
+
+class KPIRolloverItem(BaseModel):
+    """Schema for a KPI created (or to be created) by a rollover."""
+    user_id: int
+    title: str
+    source_kpi_id: Optional[int] = None
+    template_id: Optional[int] = None
+
+
+class KPIRolloverResponse(BaseModel):
+    """Schema for rollover results."""
+    dry_run: bool
+    year: int
+    quarter: str
+    source_year: Optional[int] = None
+    source_quarter: Optional[str] = None
+    kpis_created: int = 0
+    links_created: int = 0
+    items: List[KPIRolloverItem] = []  # filled for dry runs only
+
+
+class KPIBulkActionResult(BaseModel):
+    """Schema for the outcome of a bulk action on one KPI."""
+    kpi_id: int
+    success: bool
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class KPIBulkActionResponse(BaseModel):
+    """Schema for bulk approve/reject results."""
+    succeeded: int = 0
+    failed: int = 0
+    results: List[KPIBulkActionResult] = []
+
+
+class KPIMeasurementCreate(BaseModel):
+    """Schema for one numeric measurement of a KPI."""
+    kpi_id: int
+    value: float
+    measured_at: Optional[datetime] = None  # defaults to now
+
+
+class KPIMeasurementBulkCreate(BaseModel):
+    """Schema for ingesting measurements in bulk."""
+    measurements: List[KPIMeasurementCreate] = Field(..., min_length=1, max_length=10000)
+    update_current: bool = True  # set each KPI's current value to its latest measurement
+
+
+class KPIMeasurementBulkResponse(BaseModel):
+    """Schema for bulk measurement ingest results."""
+    inserted: int = 0
+    kpis_updated: int = 0
+
+
+class KPITrendPoint(BaseModel):
+    """Schema for one bucket of a downsampled KPI series."""
+    bucket: date  # first day of the bucket
+    value: float
+    count: int  # measurements in the bucket
+
+
+class KPITrendSeries(BaseModel):
+    """Schema for the downsampled series of one KPI."""
+    kpi_id: int
+    title: str
+    unit: Optional[str] = None
+    points: List[KPITrendPoint] = []
+
+
+class KPITrendResponse(BaseModel):
+    """Schema for KPI trend queries."""
+    bucket: Literal["day", "week", "month"]
+    aggregate: Literal["last", "avg"]
+    series: List[KPITrendSeries] = []
+
+
+class KPIIngestReject(BaseModel):
+    """Schema for a rejected row of a bulk value ingest."""
+    line: int
+    kpi_id: Optional[int] = None
+    external_key: Optional[str] = None
+    error: str
+
+
+class KPIIngestResponse(BaseModel):
+    """Schema for bulk value ingest results."""
+    received: int = 0
+    applied: int = 0
+    rejected: int = 0
+    kpis_updated: int = 0
+    batches: int = 0
+    rejects: List[KPIIngestReject] = []  # first 1000 rejected rows
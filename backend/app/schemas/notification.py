@@ -1,7 +1,7 @@
 """Notification schemas."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -18,6 +18,12 @@ class NotificationCreate(NotificationBase):
     pass
 
 
+class NotificationBroadcast(NotificationBase):
+    """Schema for notifying all users with a role and/or in a department."""
+    roles: Optional[List[str]] = None
+    department: Optional[str] = Field(None, max_length=100)
+
+
 class NotificationResponse(NotificationBase):
     """Schema for notification response."""
     id: int
@@ -36,3 +42,8 @@ class NotificationUpdate(BaseModel):
 class UnreadCount(BaseModel):
     """Schema for unread notification count."""
     count: int
+
+
+class BroadcastResult(BaseModel):
+    """Schema for broadcast result."""
+    count: int
@@ -85,10 +85,11 @@ class ObjectiveDetail(ObjectiveResponse):
 class ObjectiveListResponse(BaseModel):
     """Schema for objective list response with pagination."""
     items: List["ObjectiveDetail"]
-    total: int
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Opaque cursor for the next page
 
 
 class ObjectiveTreeNode(BaseModel):
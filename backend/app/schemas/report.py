@@ -0,0 +1,31 @@
+"""Report job schemas."""
+
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+
+class ReportJobCreate(BaseModel):
+    """Schema for submitting a background report."""
+    report_type: Literal["pdf", "excel"]
+    user_id: Optional[int] = None
+    year: Optional[int] = None
+    quarter: Optional[str] = None
+    status: Optional[str] = None
+
+
+class ReportJobResponse(BaseModel):
+    """Schema for report job status."""
+    id: str
+    report_type: str
+    status: str  # queued, running, completed, failed
+    progress: int
+    file_name: Optional[str] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,20 @@
+"""Search schemas."""
+
+from typing import List, Literal, Optional
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    """Schema for a single full-text search hit."""
+    type: Literal["kpi", "objective", "comment"]
+    id: int
+    title: Optional[str] = None  # plain text
+    snippet: str  # HTML: escaped text with matches wrapped in <mark>
+    kpi_id: Optional[int] = None  # KPI the comment belongs to (comments only)
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Schema for search results."""
+    query: str
+    items: List[SearchResult]
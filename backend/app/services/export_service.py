@@ -0,0 +1,166 @@
+"""Raw data exports (CSV / NDJSON) streamed straight from the database."""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import or_, select
+
+from app.crud.kpi import kpi_crud
+from app.crud.objective import objective_crud
+from app.database import SessionLocal
+from app.models.kpi import KPI, KPIHistory
+from app.models.objective import Objective, ObjectiveKPILink
+from app.models.user import User
+
+DATASETS = ("kpis", "objectives", "objective-kpi-links", "kpi-history")
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+KPI_COLUMNS = (
+    KPI.id, KPI.user_id, KPI.template_id, KPI.year, KPI.quarter, KPI.title,
+    KPI.description, KPI.category, KPI.target_value, KPI.current_value,
+    KPI.target_numeric, KPI.current_numeric, KPI.unit, KPI.direction,
+    KPI.progress_percentage, KPI.measurement_method, KPI.external_key,
+    KPI.status, KPI.created_at, KPI.updated_at, KPI.submitted_at,
+    KPI.approved_at, KPI.approved_by,
+)
+
+OBJECTIVE_COLUMNS = (
+    Objective.id, Objective.parent_id, Objective.path, Objective.level,
+    Objective.title, Objective.description, Objective.owner_id,
+    Objective.department, Objective.year, Objective.quarter,
+    Objective.start_date, Objective.end_date, Objective.status,
+    Objective.progress_percentage, Objective.is_featured,
+    Objective.created_at, Objective.updated_at, Objective.created_by,
+)
+
+LINK_COLUMNS = (
+    ObjectiveKPILink.id, ObjectiveKPILink.objective_id, ObjectiveKPILink.kpi_id,
+    ObjectiveKPILink.weight, ObjectiveKPILink.created_at,
+)
+
+HISTORY_COLUMNS = (
+    KPIHistory.id, KPIHistory.kpi_id, KPIHistory.user_id, KPIHistory.action,
+    KPIHistory.old_value, KPIHistory.new_value, KPIHistory.created_at,
+)
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to something CSV/JSON can hold."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([["" if v is None else _plain(v) for v in row] for row in rows])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_encoder(keys: List[str]) -> Callable[[Sequence[Sequence[Any]]], bytes]:
+    def encode(rows):
+        return "".join(
+            json.dumps(dict(zip(keys, map(_plain, row))), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+    return encode
+
+
+class ExportService:
+    """Service for streaming raw data exports for BI tools."""
+
+    # Rows fetched per round trip and encoded per response chunk
+    BATCH_SIZE = 2000
+
+    def build_query(
+        self,
+        dataset: str,
+        current_user: User,
+        *,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None,
+        department: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ):
+        """
+        Build the SELECT for a dataset, limited to what the user may see.
+
+        Employees get their own KPIs and objectives (and the links and
+        history of those); managers get all KPIs and the objectives of their
+        department, as in the list endpoints; admins get everything.
+        """
+        if current_user.role == "employee":
+            user_id = current_user.id
+        elif current_user.role == "manager" and not department:
+            department = current_user.department
+
+        if dataset == "kpis":
+            return kpi_crud.select_rows(
+                columns=KPI_COLUMNS, user_id=user_id, year=year, quarter=quarter, status=status
+            )
+
+        if dataset == "objectives":
+            return objective_crud.select_rows(
+                columns=OBJECTIVE_COLUMNS,
+                owner_id=user_id,
+                year=year,
+                quarter=quarter,
+                status=status,
+                department=department,
+            )
+
+        if dataset == "objective-kpi-links":
+            query = select(*LINK_COLUMNS)
+            if user_id:
+                query = query.where(or_(
+                    ObjectiveKPILink.kpi_id.in_(select(KPI.id).where(KPI.user_id == user_id)),
+                    ObjectiveKPILink.objective_id.in_(
+                        select(Objective.id).where(Objective.owner_id == user_id)
+                    ),
+                ))
+            return query.order_by(ObjectiveKPILink.id)
+
+        if dataset == "kpi-history":
+            query = select(*HISTORY_COLUMNS)
+            if user_id:
+                query = query.where(KPIHistory.kpi_id.in_(select(KPI.id).where(KPI.user_id == user_id)))
+            if since:
+                query = query.where(KPIHistory.created_at >= since)
+            return query.order_by(KPIHistory.id)
+
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+    def stream(self, query, fmt: str) -> Iterator[bytes]:
+        """
+        Yield an export as CSV or NDJSON chunks.
+
+        The CSV header goes out before the query runs. Rows come from a
+        server-side cursor (yield_per) and each batch becomes one chunk, so
+        memory stays flat for any row count. The generator uses its own
+        session because it outlives the request's.
+        """
+        keys = [column.key for column in query.selected_columns]
+        if fmt == "csv":
+            encode = _encode_csv
+            yield _encode_csv([keys])
+        else:
+            encode = _ndjson_encoder(keys)
+
+        db = SessionLocal()
+        try:
+            result = db.execute(query.execution_options(yield_per=self.BATCH_SIZE))
+            for rows in result.partitions():
+                yield encode(rows)
+        finally:
+            db.close()
+
+
+# Singleton instance
+export_service = ExportService()
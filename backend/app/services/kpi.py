@@ -1,9 +1,12 @@
 """KPI business logic service."""
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List, Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.config import settings
+from app.database import unit_of_work
 from app.models.user import User
 from app.models.kpi import KPI, KPITemplate
 from app.schemas.kpi import (
@@ -16,17 +19,37 @@ from app.schemas.kpi import (
     KPISubmit,
     KPIApprove,
     KPIReject,
+    KPIBulkApprove,
+    KPIBulkReject,
+    KPIBulkActionResult,
+    KPIBulkActionResponse,
+    KPIRollover,
+    KPIRolloverResponse,
+    KPIMeasurementBulkCreate,
+    KPIMeasurementBulkResponse,
+    KPIIngestReject,
+    KPIIngestResponse,
+    KPITrendResponse,
     KPIStatistics,
     DashboardStatistics,
 )
-from app.crud.kpi import kpi_crud, kpi_template_crud
+from app.crud.kpi import kpi_crud, kpi_measurement_crud, kpi_template_crud
 from app.crud.notification import notification_crud
+from app.core.progress_rollup import objective_rollup_queue
+from app.services.notification_service import notification_service
+from app.utils.kpi_ingest import parse_rows
 import math
 
 
 class KPIService:
     """KPI service for business logic."""
 
+    # Rejected ingest rows listed individually in a response
+    _MAX_REPORTED_REJECTS = 1000
+
+    # Statuses in which a KPI (and so its current value) can be edited
+    _EDITABLE_STATUSES = ("draft", "rejected")
+
     def get_kpi(self, db: Session, kpi_id: int, current_user: User) -> KPIResponse:
         """Get a single KPI."""
         kpi = kpi_crud.get(db, kpi_id=kpi_id)
@@ -57,36 +80,41 @@ class KPIService:
         quarter: Optional[str] = None,
         status: Optional[str] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> KPIListResponse:
         """Get list of KPIs with filters."""
         # If employee, only show their own KPIs
         if current_user.role == "employee":
             user_id = current_user.id
 
-        items, total = kpi_crud.get_multi(
-            db,
-            skip=skip,
-            limit=limit,
-            user_id=user_id,
-            year=year,
-            quarter=quarter,
-            status=status,
-            search=search,
-        )
-
-        page = (skip // limit) + 1 if limit > 0 else 1
-        total_pages = math.ceil(total / limit) if limit > 0 else 1
+        try:
+            items, total, next_cursor = kpi_crud.get_multi(
+                db,
+                skip=skip,
+                limit=limit,
+                user_id=user_id,
+                year=year,
+                quarter=quarter,
+                status=status,
+                search=search,
+                cursor=cursor,
+                with_total=include_total,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        return KPIListResponse(
-            items=[KPIResponse.model_validate(item) for item in items],
-            total=total,
-            page=page,
-            page_size=limit,
-            total_pages=total_pages,
-        )
+        return self._list_response(items, total, next_cursor, skip=skip, limit=limit)
 
     def get_pending_approvals(
-        self, db: Session, current_user: User, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        current_user: User,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> KPIListResponse:
         """Get KPIs pending approval (managers only)."""
         if current_user.role not in ["admin", "manager"]:
@@ -95,10 +123,29 @@ class KPIService:
                 detail="Only managers can view pending approvals",
             )
 
-        items, total = kpi_crud.get_pending_approvals(db, skip=skip, limit=limit)
+        try:
+            items, total, next_cursor = kpi_crud.get_pending_approvals(
+                db, skip=skip, limit=limit, cursor=cursor, with_total=include_total
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        return self._list_response(items, total, next_cursor, skip=skip, limit=limit)
 
+    def _list_response(
+        self,
+        items: list,
+        total: Optional[int],
+        next_cursor: Optional[str],
+        *,
+        skip: int,
+        limit: int,
+    ) -> KPIListResponse:
+        """Build a paginated KPI list response."""
         page = (skip // limit) + 1 if limit > 0 else 1
-        total_pages = math.ceil(total / limit) if limit > 0 else 1
+        total_pages = None
+        if total is not None:
+            total_pages = math.ceil(total / limit) if limit > 0 else 1
 
         return KPIListResponse(
             items=[KPIResponse.model_validate(item) for item in items],
@@ -106,6 +153,7 @@ class KPIService:
             page=page,
             page_size=limit,
             total_pages=total_pages,
+            next_cursor=next_cursor,
         )
 
     def create_kpi(self, db: Session, kpi_in: KPICreate, current_user: User) -> KPIResponse:
@@ -118,67 +166,81 @@ class KPIService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Template not found or inactive",
                 )
+        if kpi_in.external_key:
+            self._check_external_key(db, kpi_in.external_key, kpi_in.year, kpi_in.quarter)
 
-        kpi = kpi_crud.create(db, obj_in=kpi_in, user_id=current_user.id)
+        # KPI and its history row are committed together
+        with unit_of_work(db):
+            kpi = kpi_crud.create(db, obj_in=kpi_in, user_id=current_user.id)
         return KPIResponse.model_validate(kpi)
 
     def update_kpi(
         self, db: Session, kpi_id: int, kpi_in: KPIUpdate, current_user: User
     ) -> KPIResponse:
         """Update a KPI."""
-        kpi = kpi_crud.get(db, kpi_id=kpi_id)
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="KPI not found",
-            )
+        with unit_of_work(db):
+            kpi = kpi_crud.get(db, kpi_id=kpi_id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="KPI not found",
+                )
 
-        # Check permissions
-        if not self._can_edit_kpi(kpi, current_user):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to edit this KPI",
-            )
+            # Check permissions
+            if not self._can_edit_kpi(kpi, current_user):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to edit this KPI",
+                )
 
-        # Can only edit draft or rejected KPIs
-        if kpi.status not in ["draft", "rejected"]:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot edit KPI with status: {kpi.status}",
-            )
+            # Can only edit draft or rejected KPIs
+            if kpi.status not in self._EDITABLE_STATUSES:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot edit KPI with status: {kpi.status}",
+                )
+            if kpi_in.external_key and kpi_in.external_key != kpi.external_key:
+                self._check_external_key(db, kpi_in.external_key, kpi.year, kpi.quarter)
+
+            old_progress = kpi.progress_percentage
+            kpi = kpi_crud.update(db, db_obj=kpi, obj_in=kpi_in, user_id=current_user.id)
+
+        # Propagate progress changes to linked objectives in the background
+        if kpi.progress_percentage != old_progress:
+            objective_rollup_queue.enqueue(kpi_ids=[kpi.id])
 
-        kpi = kpi_crud.update(db, db_obj=kpi, obj_in=kpi_in, user_id=current_user.id)
         return KPIResponse.model_validate(kpi)
 
     def delete_kpi(self, db: Session, kpi_id: int, current_user: User) -> dict:
         """Delete a KPI (draft only)."""
-        kpi = kpi_crud.get(db, kpi_id=kpi_id)
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="KPI not found",
-            )
+        with unit_of_work(db):
+            kpi = kpi_crud.get(db, kpi_id=kpi_id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="KPI not found",
+                )
 
-        # Check permissions
-        if not self._can_edit_kpi(kpi, current_user):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to delete this KPI",
-            )
+            # Check permissions
+            if not self._can_edit_kpi(kpi, current_user):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to delete this KPI",
+                )
 
-        # Can only delete draft KPIs
-        if kpi.status != "draft":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Can only delete draft KPIs",
-            )
+            # Can only delete draft KPIs
+            if kpi.status != "draft":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Can only delete draft KPIs",
+                )
 
-        success = kpi_crud.delete(db, kpi_id=kpi_id, user_id=current_user.id)
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to delete KPI",
-            )
+            success = kpi_crud.delete(db, kpi_id=kpi_id, user_id=current_user.id)
+            if not success:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Failed to delete KPI",
+                )
 
         return {"message": "KPI deleted successfully"}
 
@@ -186,30 +248,37 @@ class KPIService:
         self, db: Session, kpi_id: int, submit_data: KPISubmit, current_user: User
     ) -> KPIResponse:
         """Submit a KPI for approval."""
-        kpi = kpi_crud.get(db, kpi_id=kpi_id)
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="KPI not found",
-            )
+        with unit_of_work(db):
+            kpi = kpi_crud.get(db, kpi_id=kpi_id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="KPI not found",
+                )
 
-        # Check permissions
-        if kpi.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorized to submit this KPI",
-            )
+            # Check permissions
+            if kpi.user_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Not authorized to submit this KPI",
+                )
 
-        kpi = kpi_crud.submit_for_approval(db, kpi_id=kpi_id, user_id=current_user.id)
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot submit KPI in current status",
-            )
+            kpi = kpi_crud.submit_for_approval(db, kpi_id=kpi_id, user_id=current_user.id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot submit KPI in current status",
+                )
 
-        # Create notification for managers/admins
-        # Note: In a real system, you'd query for all managers/admins
-        # For now, we'll skip this as it requires user role queries
+            # Notify managers/admins in the same transaction
+            notification_service.notify_kpi_submitted(
+                db,
+                kpi_id=kpi.id,
+                kpi_title=kpi.title,
+                submitter=current_user,
+                year=kpi.year,
+                quarter=kpi.quarter,
+            )
 
         return KPIResponse.model_validate(kpi)
 
@@ -223,31 +292,36 @@ class KPIService:
                 detail="Only managers can approve KPIs",
             )
 
-        kpi = kpi_crud.get(db, kpi_id=kpi_id)
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="KPI not found",
+        # Status change, history, comment and notification commit together
+        with unit_of_work(db):
+            kpi = kpi_crud.get(db, kpi_id=kpi_id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="KPI not found",
+                )
+
+            kpi = kpi_crud.approve(
+                db, kpi_id=kpi_id, approver_id=current_user.id, comment=approve_data.comment
             )
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot approve KPI in current status",
+                )
 
-        kpi = kpi_crud.approve(
-            db, kpi_id=kpi_id, approver_id=current_user.id, comment=approve_data.comment
-        )
-        if not kpi:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot approve KPI in current status",
+            # Create notification for KPI owner
+            notification_crud.create(
+                db,
+                user_id=kpi.user_id,
+                title="KPI Approved",
+                message=f'Your KPI "{kpi.title}" has been approved by {current_user.full_name}.',
+                notification_type="success",
+                link=f"/kpis/{kpi.id}"
             )
 
-        # Create notification for KPI owner
-        notification_crud.create(
-            db,
-            user_id=kpi.user_id,
-            title="KPI Approved",
-            message=f'Your KPI "{kpi.title}" has been approved by {current_user.full_name}.',
-            notification_type="success",
-            link=f"/kpis/{kpi.id}"
-        )
+        # Queue the rollup only once the approval is committed
+        objective_rollup_queue.enqueue(kpi_ids=[kpi_id])
 
         return KPIResponse.model_validate(kpi)
 
@@ -261,33 +335,411 @@ class KPIService:
                 detail="Only managers can reject KPIs",
             )
 
-        kpi = kpi_crud.get(db, kpi_id=kpi_id)
-        if not kpi:
+        # Status change, history, comment and notification commit together
+        with unit_of_work(db):
+            kpi = kpi_crud.get(db, kpi_id=kpi_id)
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="KPI not found",
+                )
+
+            kpi = kpi_crud.reject(
+                db, kpi_id=kpi_id, approver_id=current_user.id, reason=reject_data.reason
+            )
+            if not kpi:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot reject KPI in current status",
+                )
+
+            # Create notification for KPI owner
+            notification_crud.create(
+                db,
+                user_id=kpi.user_id,
+                title="KPI Rejected",
+                message=f'Your KPI "{kpi.title}" has been rejected by {current_user.full_name}. Reason: {reject_data.reason}',
+                notification_type="error",
+                link=f"/kpis/{kpi.id}"
+            )
+
+        # Queue the rollup only once the rejection is committed
+        objective_rollup_queue.enqueue(kpi_ids=[kpi_id])
+
+        return KPIResponse.model_validate(kpi)
+
+    def bulk_approve_kpis(
+        self, db: Session, approve_data: KPIBulkApprove, current_user: User
+    ) -> KPIBulkActionResponse:
+        """Approve many submitted KPIs in one transaction (managers only)."""
+        return self._bulk_review(
+            db, approve_data.kpi_ids, current_user, approve=True, comment=approve_data.comment
+        )
+
+    def bulk_reject_kpis(
+        self, db: Session, reject_data: KPIBulkReject, current_user: User
+    ) -> KPIBulkActionResponse:
+        """Reject many submitted KPIs in one transaction (managers only)."""
+        return self._bulk_review(
+            db, reject_data.kpi_ids, current_user, approve=False, comment=reject_data.reason
+        )
+
+    def _bulk_review(
+        self,
+        db: Session,
+        kpi_ids: list,
+        current_user: User,
+        *,
+        approve: bool,
+        comment: Optional[str],
+    ) -> KPIBulkActionResponse:
+        """Approve or reject KPIs with set-based statements and report per-item results."""
+        verb = "approve" if approve else "reject"
+        if current_user.role not in ["admin", "manager"]:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="KPI not found",
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Only managers can {verb} KPIs",
+            )
+
+        # Managers can only review their own department, row by row
+        department = None
+        if current_user.role == "manager":
+            if not current_user.department:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Managers without a department cannot {verb} KPIs",
+                )
+            department = current_user.department
+
+        kpi_ids = list(dict.fromkeys(kpi_ids))  # de-duplicate, keep order
+        new_status = "approved" if approve else "rejected"
+
+        # Status changes, history, comments and notifications commit together
+        with unit_of_work(db):
+            reviewed, skipped = kpi_crud.bulk_review(
+                db, kpi_ids=kpi_ids, approver_id=current_user.id, approve=approve,
+                comment=comment, department=department,
             )
 
-        kpi = kpi_crud.reject(
-            db, kpi_id=kpi_id, approver_id=current_user.id, reason=reject_data.reason
+            if approve:
+                title, notification_type = "KPI Approved", "success"
+                suffix = "."
+            else:
+                title, notification_type = "KPI Rejected", "error"
+                suffix = f". Reason: {comment}"
+            notification_crud.create_many(db, notifications=[
+                {
+                    "user_id": row.user_id,
+                    "title": title,
+                    "message": f'Your KPI "{row.title}" has been {new_status} by {current_user.full_name}{suffix}',
+                    "type": notification_type,
+                    "link": f"/kpis/{row.id}",
+                }
+                for row in reviewed
+            ])
+
+        if reviewed:
+            objective_rollup_queue.enqueue(kpi_ids=[row.id for row in reviewed])
+
+        results = []
+        for kpi_id in kpi_ids:
+            if kpi_id not in skipped:
+                results.append(KPIBulkActionResult(kpi_id=kpi_id, success=True, status=new_status))
+            elif skipped[kpi_id] is None:
+                results.append(KPIBulkActionResult(kpi_id=kpi_id, success=False, error="KPI not found"))
+            elif department is not None and skipped[kpi_id].department != department:
+                results.append(KPIBulkActionResult(
+                    kpi_id=kpi_id,
+                    success=False,
+                    status=skipped[kpi_id].status,
+                    error=f"Not authorized to {verb} KPIs outside your department",
+                ))
+            else:
+                results.append(KPIBulkActionResult(
+                    kpi_id=kpi_id,
+                    success=False,
+                    status=skipped[kpi_id].status,
+                    error=f"Cannot {verb} KPI in current status",
+                ))
+
+        return KPIBulkActionResponse(
+            succeeded=len(reviewed),
+            failed=len(skipped),
+            results=results,
         )
-        if not kpi:
+
+    def rollover_kpis(
+        self, db: Session, rollover_data: KPIRollover, current_user: User
+    ) -> KPIRolloverResponse:
+        """Open a new period by cloning KPIs in bulk (managers only)."""
+        if current_user.role not in ["admin", "manager"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only managers can open a new KPI period",
+            )
+
+        # Managers can only roll over their own department
+        department = rollover_data.department
+        if current_user.role == "manager":
+            if not current_user.department:
+                # No department would mean no filter, i.e. every department
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Managers without a department cannot roll over KPIs",
+                )
+            if department and department != current_user.department:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="Managers can only roll over their own department",
+                )
+            department = current_user.department
+
+        from_templates = rollover_data.source == "templates"
+        source_year = source_quarter = None
+        if not from_templates:
+            source_year, source_quarter = self._previous_quarter(
+                rollover_data.year, rollover_data.quarter
+            )
+            source_year = rollover_data.source_year or source_year
+            source_quarter = rollover_data.source_quarter or source_quarter
+            if (source_year, source_quarter) == (rollover_data.year, rollover_data.quarter):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Source and target period must differ",
+                )
+
+        with unit_of_work(db):
+            result = kpi_crud.rollover(
+                db,
+                year=rollover_data.year,
+                quarter=rollover_data.quarter,
+                actor_id=current_user.id,
+                from_templates=from_templates,
+                source_year=source_year,
+                source_quarter=source_quarter,
+                department=department,
+                user_ids=rollover_data.user_ids,
+                categories=rollover_data.categories,
+                copy_links=rollover_data.copy_links,
+                dry_run=rollover_data.dry_run,
+            )
+
+        # New links change objective progress
+        if result["objective_ids"]:
+            objective_rollup_queue.enqueue(objective_ids=result["objective_ids"])
+
+        return KPIRolloverResponse(
+            dry_run=rollover_data.dry_run,
+            year=rollover_data.year,
+            quarter=rollover_data.quarter,
+            source_year=source_year,
+            source_quarter=source_quarter,
+            kpis_created=result["kpis_created"],
+            links_created=result["links_created"],
+            items=result["items"],
+        )
+
+    @staticmethod
+    def _previous_quarter(year: int, quarter: str) -> tuple:
+        """Return the (year, quarter) before the given one."""
+        number = int(quarter[1])
+        if number == 1:
+            return year - 1, "Q4"
+        return year, f"Q{number - 1}"
+
+    def ingest_measurements(
+        self, db: Session, measurement_data: KPIMeasurementBulkCreate, current_user: User
+    ) -> KPIMeasurementBulkResponse:
+        """
+        Append measurements in bulk and optionally refresh current values.
+
+        Current values only follow the measurements of KPIs the caller could
+        edit with update_kpi: their own, in draft or rejected.
+        """
+        kpi_ids = sorted({item.kpi_id for item in measurement_data.measurements})
+        access = kpi_crud.get_access(db, kpi_ids=kpi_ids)
+
+        missing = [kpi_id for kpi_id in kpi_ids if kpi_id not in access]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"KPIs not found: {', '.join(map(str, missing))}",
+            )
+
+        # Employees can only record values for their own KPIs
+        if current_user.role == "employee":
+            foreign = [kpi_id for kpi_id in kpi_ids if access[kpi_id].user_id != current_user.id]
+            if foreign:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Not authorized to record values for KPIs: {', '.join(map(str, foreign))}",
+                )
+
+        updated = []
+        with unit_of_work(db):
+            inserted = kpi_measurement_crud.create_many(
+                db, measurements=[item.model_dump() for item in measurement_data.measurements]
+            )
+            if measurement_data.update_current:
+                editable = [
+                    kpi_id for kpi_id in kpi_ids if self._can_edit_values(access[kpi_id], current_user)
+                ]
+                updated = kpi_measurement_crud.sync_current_values(
+                    db, kpi_ids=editable, user_id=current_user.id
+                )
+                if updated:
+                    kpi_crud.recalculate_progress(db, kpi_ids=updated)
+
+        if updated:
+            objective_rollup_queue.enqueue(kpi_ids=updated)
+
+        return KPIMeasurementBulkResponse(inserted=inserted, kpis_updated=len(updated))
+
+    def ingest_values(
+        self,
+        db: Session,
+        *,
+        content: str,
+        fmt: str,
+        current_user: User,
+        batch_size: int = settings.INGEST_BATCH_SIZE,
+    ) -> KPIIngestResponse:
+        """
+        Apply current values from a JSON lines or CSV upload.
+
+        Rows are processed and committed in batches of ``batch_size``: KPI
+        ids and external keys are resolved and ownership is checked with one
+        query each, measurements are inserted with executemany and each
+        changed KPI gets one history row per batch. Invalid rows, and rows
+        for KPIs update_kpi would not let the caller edit, are rejected
+        individually; committed batches stay committed if a later batch
+        fails.
+        """
+        rows = list(parse_rows(content, fmt))
+        if len(rows) > settings.INGEST_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.INGEST_MAX_ROWS} rows can be ingested at once",
+            )
+
+        result = KPIIngestResponse(received=len(rows))
+        updated = set()
+
+        def reject(line, row, error):
+            result.rejected += 1
+            if len(result.rejects) < self._MAX_REPORTED_REJECTS:
+                result.rejects.append(KPIIngestReject(
+                    line=line,
+                    kpi_id=row["kpi_id"] if row else None,
+                    external_key=row["external_key"] if row else None,
+                    error=error,
+                ))
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            changed = []
+            with unit_of_work(db):
+                keys = sorted({row["external_key"] for _, row, _ in batch if row and row["kpi_id"] is None})
+                key_ids = kpi_crud.resolve_external_keys(db, external_keys=keys) if keys else {}
+
+                resolved = []
+                for line, row, error in batch:
+                    if error:
+                        reject(line, None, error)
+                        continue
+                    kpi_id = row["kpi_id"]
+                    if kpi_id is None:
+                        # External keys resolve to the KPI of the value's period
+                        year, quarter = self._period_of(row["measured_at"])
+                        kpi_id = key_ids.get((row["external_key"], year, quarter))
+                        if kpi_id is None:
+                            reject(line, row, f"No KPI with this external_key in {year} {quarter}")
+                            continue
+                    resolved.append((line, row, kpi_id))
+
+                access = kpi_crud.get_access(db, kpi_ids=sorted({kpi_id for _, _, kpi_id in resolved}))
+                accepted = []
+                for line, row, kpi_id in resolved:
+                    # The same rules as update_kpi: the owner's draft or rejected KPIs
+                    if kpi_id not in access:
+                        reject(line, row, "KPI not found")
+                    elif not self._can_edit_kpi(access[kpi_id], current_user):
+                        reject(line, row, "Not authorized to update this KPI")
+                    elif access[kpi_id].status not in self._EDITABLE_STATUSES:
+                        reject(line, row, f"Cannot edit KPI with status: {access[kpi_id].status}")
+                    else:
+                        accepted.append({"kpi_id": kpi_id, "value": row["value"], "measured_at": row["measured_at"]})
+
+                if accepted:
+                    kpi_measurement_crud.create_many(db, measurements=accepted)
+                    changed = kpi_measurement_crud.sync_current_values(
+                        db, kpi_ids=sorted({item["kpi_id"] for item in accepted}), user_id=current_user.id
+                    )
+                    if changed:
+                        kpi_crud.recalculate_progress(db, kpi_ids=changed)
+
+            result.batches += 1
+            result.applied += len(accepted)
+            updated.update(changed)
+            if changed:
+                objective_rollup_queue.enqueue(kpi_ids=changed)
+
+        result.rejects.sort(key=lambda item: item.line)
+        result.kpis_updated = len(updated)
+        return result
+
+    @staticmethod
+    def _period_of(moment: Optional[datetime]) -> tuple:
+        """Return the (year, quarter) containing ``moment`` (default: now)."""
+        moment = moment or datetime.now(timezone.utc)
+        return moment.year, f"Q{(moment.month - 1) // 3 + 1}"
+
+    def _check_external_key(self, db: Session, external_key: str, year: int, quarter: str) -> None:
+        """Reject an external key already used by another KPI in the period."""
+        if kpi_crud.get_by_external_key(db, external_key=external_key, year=year, quarter=quarter):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"External key already used by another KPI in {year} {quarter}",
+            )
+
+    def get_trends(
+        self,
+        db: Session,
+        current_user: User,
+        *,
+        kpi_ids: Optional[List[int]] = None,
+        user_id: Optional[int] = None,
+        department: Optional[str] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: str = "week",
+        aggregate: str = "last",
+    ) -> KPITrendResponse:
+        """Get downsampled measurement series for the selected KPIs."""
+        # Employees only see their own KPIs
+        if current_user.role == "employee":
+            user_id = current_user.id
+        elif not (kpi_ids or user_id or department or year):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot reject KPI in current status",
+                detail="Select KPIs by kpi_ids, user_id, department or year",
             )
 
-        # Create notification for KPI owner
-        notification_crud.create(
+        series = kpi_measurement_crud.get_trends(
             db,
-            user_id=kpi.user_id,
-            title="KPI Rejected",
-            message=f'Your KPI "{kpi.title}" has been rejected by {current_user.full_name}. Reason: {reject_data.reason}',
-            notification_type="error",
-            link=f"/kpis/{kpi.id}"
+            kpi_ids=kpi_ids,
+            user_id=user_id,
+            department=department,
+            year=year,
+            quarter=quarter,
+            start=start,
+            end=end,
+            bucket=bucket,
+            aggregate=aggregate,
         )
-
-        return KPIResponse.model_validate(kpi)
+        return KPITrendResponse(bucket=bucket, aggregate=aggregate, series=series)
 
     def get_statistics(self, db: Session, current_user: User) -> KPIStatistics:
         """Get KPI statistics."""
@@ -297,26 +749,25 @@ class KPIService:
         return KPIStatistics(**stats)
 
     def get_dashboard_statistics(self, db: Session, current_user: User) -> DashboardStatistics:
-        """Get dashboard statistics."""
-        # Get overall stats
+        """Get dashboard statistics with a per-quarter breakdown (one query)."""
+        # Employees only see their own stats; others see overall stats plus their own count
         if current_user.role == "employee":
-            stats = kpi_crud.get_statistics(db, user_id=current_user.id)
-            my_kpis = stats["total_kpis"]
+            dashboard = kpi_crud.get_dashboard(db, user_id=current_user.id)
+            dashboard["my_kpis"] = dashboard["totals"]["total_kpis"]
         else:
-            stats = kpi_crud.get_statistics(db)
-            my_kpis = kpi_crud.get_statistics(db, user_id=current_user.id)["total_kpis"]
-
-        # Get quarterly stats (placeholder for now)
-        quarterly_stats = []
+            dashboard = kpi_crud.get_dashboard(db, my_user_id=current_user.id)
 
+        stats = dashboard["totals"]
         return DashboardStatistics(
             total_kpis=stats["total_kpis"],
+            draft=stats["draft"],
             pending_approval=stats["submitted"],
             approved=stats["approved"],
             rejected=stats["rejected"],
-            my_kpis=my_kpis,
+            my_kpis=dashboard["my_kpis"],
             average_progress=stats["average_progress"],
-            quarterly_stats=quarterly_stats,
+            completion_rate=stats["completion_rate"],
+            quarterly_stats=dashboard["quarters"],
         )
 
     def _can_view_kpi(self, kpi: KPI, user: User) -> bool:
@@ -332,6 +783,10 @@ class KPIService:
         # Only the owner can edit
         return kpi.user_id == user.id
 
+    def _can_edit_values(self, kpi: KPI, user: User) -> bool:
+        """Check if user can change a KPI's current value, as update_kpi would."""
+        return self._can_edit_kpi(kpi, user) and kpi.status in self._EDITABLE_STATUSES
+
 
 class KPITemplateService:
     """KPI template service for business logic."""
@@ -1,14 +1,18 @@
 """Enhanced notification service with email integration."""
 
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any, Sequence, Tuple
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 import logging
 
+from app.database import unit_of_work
 from app.models.user import User
 from app.models.notification import Notification
-from app.crud import notification as notification_crud
-from app.utils.email import email_service
+from app.models.email_outbox import OutboxEmail
+from app.crud.notification import notification_crud
+from app.crud.user import user as user_crud
+from app.core.email_outbox import email_outbox_worker
 from app.utils.email_templates import (
     kpi_submitted_email,
     kpi_approved_email,
@@ -20,6 +24,9 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# (user_id, title, message, type, link)
+NotificationSpec = Tuple[int, str, str, str, Optional[str]]
+
 
 class NotificationService:
     """Service for managing notifications (in-app and email)."""
@@ -40,7 +47,11 @@ class NotificationService:
         email_template_data: Optional[Dict[str, Any]] = None
     ) -> Notification:
         """
-        Create an in-app notification and optionally send email.
+        Create an in-app notification and optionally queue an email.
+
+        The email goes to the outbox in the same transaction as the
+        notification and is delivered by the outbox worker, so a slow mail
+        server never delays the request.
 
         Args:
             db: Database session
@@ -49,40 +60,116 @@ class NotificationService:
             message: Notification message
             type: Notification type (info, success, warning, error)
             link: Optional link for the notification
-            send_email: Whether to send email notification
+            send_email: Whether to queue an email notification
             email_template_data: Data for email template
 
         Returns:
             Created notification
         """
-        # Create in-app notification
-        notification = notification_crud.create(
-            db=db,
-            user_id=user_id,
-            title=title,
-            message=message,
-            type=type,
-            link=link
-        )
+        with unit_of_work(db):
+            # Create in-app notification
+            notification = notification_crud.create(
+                db,
+                user_id=user_id,
+                title=title,
+                message=message,
+                notification_type=type,
+                link=link
+            )
 
-        # Send email if enabled and requested
-        if send_email and email_template_data:
-            user = db.query(User).filter(User.id == user_id).first()
-            if user and user.email_notifications:
-                self._send_email_notification(user=user, data=email_template_data)
+            # Queue email if enabled and requested
+            if send_email and email_template_data:
+                user = db.query(User).filter(User.id == user_id).first()
+                if user and user.email_notifications:
+                    self._queue_email_notification(
+                        db, user=user, data=email_template_data, notification_id=notification.id
+                    )
 
         return notification
 
+    def notify_many(
+        self,
+        db: Session,
+        notifications: Iterable[NotificationSpec],
+        preference: Optional[str] = None,
+        email_template_data: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Create many in-app notifications, and optionally emails, at once.
+
+        Recipients are filtered by the ``preference`` flag in one query,
+        the notifications are inserted with one executemany and everything
+        commits once (or with the caller's unit_of_work).
+
+        Args:
+            db: Database session
+            notifications: (user_id, title, message, type, link) tuples
+            preference: User flag that must be on, e.g. "notify_kpi_submitted"
+            email_template_data: Data for one email template sent to every
+                recipient with email notifications on
+
+        Returns:
+            Number of notifications created
+        """
+        notifications = list(notifications)
+        if not notifications:
+            return 0
+
+        recipients = {
+            r.id: r for r in user_crud.get_notification_recipients(
+                db, user_ids={n[0] for n in notifications}, preference=preference
+            )
+        }
+        return self._fan_out(
+            db,
+            [(n, recipients[n[0]]) for n in notifications if n[0] in recipients],
+            email_template_data
+        )
+
+    def broadcast(
+        self,
+        db: Session,
+        title: str,
+        message: str,
+        type: str = "info",
+        link: Optional[str] = None,
+        roles: Optional[Iterable[str]] = None,
+        department: Optional[str] = None,
+        preference: Optional[str] = None,
+        exclude_user_id: Optional[int] = None,
+        email_template_data: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Notify every active user with one of ``roles`` in ``department``.
+
+        Either filter may be omitted. Users are selected as columns, never
+        loaded as User objects; otherwise this behaves like notify_many.
+
+        Returns:
+            Number of notifications created
+        """
+        recipients = user_crud.get_notification_recipients(
+            db, roles=roles, department=department, preference=preference
+        )
+        return self._fan_out(
+            db,
+            [
+                ((r.id, title, message, type, link), r)
+                for r in recipients if r.id != exclude_user_id
+            ],
+            email_template_data
+        )
+
     def notify_kpi_submitted(
         self,
         db: Session,
         kpi_id: int,
         kpi_title: str,
         submitter: User,
-        approvers: List[User],
         year: int,
-        quarter: str
-    ) -> None:
+        quarter: str,
+        approver_ids: Optional[List[int]] = None
+    ) -> int:
         """
         Notify approvers when a KPI is submitted.
 
@@ -91,45 +178,53 @@ class NotificationService:
             kpi_id: KPI ID
             kpi_title: KPI title
             submitter: User who submitted
-            approvers: List of users who can approve
             year: KPI year
             quarter: KPI quarter
+            approver_ids: Users who can approve; all managers and admins
+                (except the submitter) if None
+
+        Returns:
+            Number of approvers notified
         """
         link = f"/kpis/{kpi_id}"
         base_url = settings.CORS_ORIGINS[0] if settings.CORS_ORIGINS else "http://localhost"
         full_link = f"{base_url}{link}"
 
-        for approver in approvers:
-            # Check notification preference
-            if not approver.notify_kpi_submitted:
-                continue
+        title = "New KPI Submitted for Approval"
+        message = f"{submitter.full_name or submitter.username} submitted a KPI: {kpi_title}"
 
-            # Create in-app notification
-            title = "New KPI Submitted for Approval"
-            message = f"{submitter.full_name or submitter.username} submitted a KPI: {kpi_title}"
-
-            # Email template data
-            email_data = {
-                "kpi_title": kpi_title,
-                "submitter_name": submitter.full_name or submitter.username,
-                "year": year,
-                "quarter": quarter,
-                "link": full_link,
-                "template": "kpi_submitted"
-            }
-
-            self.create_notification(
-                db=db,
-                user_id=approver.id,
+        # Email template data
+        email_data = {
+            "kpi_title": kpi_title,
+            "submitter_name": submitter.full_name or submitter.username,
+            "year": year,
+            "quarter": quarter,
+            "link": full_link,
+            "template": "kpi_submitted"
+        }
+
+        if approver_ids is None:
+            count = self.broadcast(
+                db,
                 title=title,
                 message=message,
                 type="info",
                 link=link,
-                send_email=True,
+                roles=["admin", "manager"],
+                preference="notify_kpi_submitted",
+                exclude_user_id=submitter.id,
+                email_template_data=email_data
+            )
+        else:
+            count = self.notify_many(
+                db,
+                [(approver_id, title, message, "info", link) for approver_id in approver_ids],
+                preference="notify_kpi_submitted",
                 email_template_data=email_data
             )
 
-            logger.info(f"Notified user {approver.id} about KPI {kpi_id} submission")
+        logger.info(f"Notified {count} approvers about KPI {kpi_id} submission")
+        return count
 
     def notify_kpi_approved(
         self,
@@ -246,30 +341,29 @@ class NotificationService:
 
         logger.info(f"Notified user {owner.id} about KPI {kpi_id} rejection")
 
-    def notify_comment_mention(
+    def notify_comment_mentions(
         self,
         db: Session,
         kpi_id: int,
         kpi_title: str,
-        mentioned_user: User,
+        mentioned_user_ids: List[int],
         commenter: User,
         comment_text: str
-    ) -> None:
+    ) -> int:
         """
-        Notify user when they are mentioned in a comment.
+        Notify users when they are mentioned in a comment.
 
         Args:
             db: Database session
             kpi_id: KPI ID
             kpi_title: KPI title
-            mentioned_user: User who was mentioned
+            mentioned_user_ids: Users who were mentioned
             commenter: User who made the comment
             comment_text: Comment text
-        """
-        # Check notification preference
-        if not mentioned_user.notify_comment_mention:
-            return
 
+        Returns:
+            Number of users notified
+        """
         link = f"/kpis/{kpi_id}"
         base_url = settings.CORS_ORIGINS[0] if settings.CORS_ORIGINS else "http://localhost"
         full_link = f"{base_url}{link}"
@@ -285,65 +379,114 @@ class NotificationService:
             "template": "comment_mention"
         }
 
-        self.create_notification(
-            db=db,
-            user_id=mentioned_user.id,
-            title=title,
-            message=message,
-            type="info",
-            link=link,
-            send_email=True,
+        count = self.notify_many(
+            db,
+            [
+                (user_id, title, message, "info", link)
+                for user_id in dict.fromkeys(mentioned_user_ids)
+                if user_id != commenter.id
+            ],
+            preference="notify_comment_mention",
             email_template_data=email_data
         )
 
-        logger.info(f"Notified user {mentioned_user.id} about mention in KPI {kpi_id}")
+        logger.info(f"Notified {count} users about mentions in KPI {kpi_id}")
+        return count
 
-    def _send_email_notification(self, user: User, data: Dict[str, Any]) -> bool:
+    def _fan_out(
+        self,
+        db: Session,
+        targets: Sequence[Tuple[NotificationSpec, Row]],
+        email_template_data: Optional[Dict[str, Any]]
+    ) -> int:
+        """Insert (notification, recipient row) pairs and queue their emails in one transaction."""
+        if not targets:
+            return 0
+
+        with unit_of_work(db):
+            created = notification_crud.create_many_returning(db, notifications=[
+                {"user_id": user_id, "title": title, "message": message, "type": type, "link": link}
+                for (user_id, title, message, type, link), _ in targets
+            ])
+
+            email_content = None
+            if email_template_data and self.email_enabled:
+                email_content = self._render_email(email_template_data)
+            if email_content:
+                # One email per recipient, linked to (one of) their notifications
+                notification_ids = {row.user_id: row.id for row in created}
+                recipients = {recipient.id: recipient for _, recipient in targets}
+                email_outbox_worker.enqueue_many(db, [
+                    {
+                        "to_emails": [recipient.email],
+                        "subject": email_content["subject"],
+                        "body_html": email_content["html_body"],
+                        "body_text": email_content.get("text_body"),
+                        "notification_id": notification_ids[recipient.id],
+                    }
+                    for recipient in recipients.values()
+                    if recipient.email_notifications and recipient.email
+                ])
+
+        return len(created)
+
+    def _queue_email_notification(
+        self,
+        db: Session,
+        user: User,
+        data: Dict[str, Any],
+        notification_id: Optional[int] = None
+    ) -> Optional[OutboxEmail]:
         """
-        Send email notification using template.
+        Queue an email notification using template.
 
         Args:
+            db: Database session
             user: User to send email to
             data: Template data including 'template' key
+            notification_id: In-app notification the email belongs to
 
         Returns:
-            True if sent successfully
+            Queued outbox email, or None if not queued
         """
         if not self.email_enabled:
             logger.debug("Email notifications disabled")
-            return False
+            return None
 
         if not user.email:
             logger.warning(f"User {user.id} has no email address")
-            return False
+            return None
 
-        # Get template based on type
+        email_content = self._render_email(data)
+        if email_content is None:
+            return None
+
+        return email_outbox_worker.enqueue(
+            db,
+            to_emails=[user.email],
+            subject=email_content["subject"],
+            body_html=email_content["html_body"],
+            body_text=email_content.get("text_body"),
+            notification_id=notification_id
+        )
+
+    def _render_email(self, data: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Render the email template named by data['template'], or None if unknown."""
         template_name = data.get("template")
-        email_content = None
 
         if template_name == "kpi_submitted":
-            email_content = kpi_submitted_email(data)
+            return kpi_submitted_email(data)
         elif template_name == "kpi_approved":
-            email_content = kpi_approved_email(data)
+            return kpi_approved_email(data)
         elif template_name == "kpi_rejected":
-            email_content = kpi_rejected_email(data)
+            return kpi_rejected_email(data)
         elif template_name == "comment_mention":
-            email_content = comment_mention_email(data)
+            return comment_mention_email(data)
         elif template_name == "weekly_digest":
-            email_content = weekly_digest_email(data)
-        else:
-            logger.error(f"Unknown email template: {template_name}")
-            return False
-
-        # Send email
-        success = email_service.send_email(
-            to_emails=[user.email],
-            subject=email_content["subject"],
-            body_html=email_content["html_body"],
-            body_text=email_content.get("text_body")
-        )
+            return weekly_digest_email(data)
 
-        return success
+        logger.error(f"Unknown email template: {template_name}")
+        return None
 
 
 # Global notification service instance
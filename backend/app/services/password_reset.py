@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.crud.user import user as user_crud
 from app.utils.security import create_reset_token, verify_reset_token
-from app.utils.email import email_service
+from app.core.email_outbox import email_outbox_worker
 from app.utils.email_templates import password_reset_email
 from app.config import settings
 
@@ -19,7 +19,7 @@ class PasswordResetService:
         """
         Request password reset for user email.
 
-        Generates reset token, saves to DB, and sends email.
+        Generates reset token, saves to DB, and queues the email.
         Returns success message (doesn't reveal if email exists).
         """
         # Get user by email
@@ -51,7 +51,7 @@ class PasswordResetService:
         frontend_url = settings.CORS_ORIGINS[0] if settings.CORS_ORIGINS else "http://localhost:3000"
         reset_url = f"{frontend_url}/reset-password?token={reset_token}"
 
-        # Send email
+        # Queue email
         email_data = {
             "user_name": user.full_name or user.username,
             "reset_link": reset_url,
@@ -61,7 +61,8 @@ class PasswordResetService:
         email_content = password_reset_email(email_data)
 
         try:
-            email_service.send_email(
+            email_outbox_worker.enqueue(
+                db,
                 to_emails=[user.email],
                 subject=email_content["subject"],
                 body_html=email_content["html"],
@@ -69,7 +70,7 @@ class PasswordResetService:
             )
         except Exception as e:
             # Log error but don't fail the request
-            print(f"Failed to send password reset email: {e}")
+            print(f"Failed to queue password reset email: {e}")
             # Still return success to prevent enumeration
 
         return success_message
@@ -84,6 +84,7 @@ class PDFReportService:
         kpis: List[Dict[str, Any]],
         user_info: Dict[str, Any],
         filters: Dict[str, Any] = None,
+        summary: Dict[str, Any] = None,
     ) -> BytesIO:
         """
         Generate PDF report for KPIs.
@@ -92,6 +93,7 @@ class PDFReportService:
             kpis: List of KPI data dictionaries
             user_info: User information dict
             filters: Applied filters
+            summary: Aggregates from kpi_crud.get_value_summary
 
         Returns:
             BytesIO containing PDF data
@@ -113,7 +115,7 @@ class PDFReportService:
         story.extend(self._create_header(user_info, filters))
 
         # Add summary statistics
-        story.extend(self._create_summary_section(kpis))
+        story.extend(self._create_summary_section(summary or {}))
 
         # Add KPI list
         story.extend(self._create_kpi_table(kpis))
@@ -161,46 +163,29 @@ class PDFReportService:
 
         return elements
 
-    def _create_summary_section(self, kpis: List[Dict[str, Any]]) -> List:
-        """Create summary statistics section."""
+    def _create_summary_section(self, summary: Dict[str, Any]) -> List:
+        """Create summary statistics section from pre-computed aggregates."""
         elements = []
 
         # Section header
         header = Paragraph("Summary Statistics", self.styles["CustomSubtitle"])
         elements.append(header)
 
-        # Calculate statistics
-        total = len(kpis)
-        status_counts = {}
-        total_target = 0
-        total_actual = 0
-
-        for kpi in kpis:
-            status = kpi.get("status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-            # Sum targets and actuals
-            if kpi.get("target_value") is not None:
-                total_target += float(kpi["target_value"])
-            if kpi.get("actual_value") is not None:
-                total_actual += float(kpi["actual_value"])
-
-        # Achievement rate
-        achievement_rate = (
-            (total_actual / total_target * 100) if total_target > 0 else 0
-        )
+        total_target = summary.get("total_target", 0)
+        total_actual = summary.get("total_actual", 0)
 
         # Create summary table
         summary_data = [
             ["Metric", "Value"],
-            ["Total KPIs", str(total)],
-            ["Draft", str(status_counts.get("draft", 0))],
-            ["Submitted", str(status_counts.get("submitted", 0))],
-            ["Approved", str(status_counts.get("approved", 0))],
-            ["Rejected", str(status_counts.get("rejected", 0))],
+            ["Total KPIs", str(summary.get("total_kpis", 0))],
+            ["Draft", str(summary.get("draft", 0))],
+            ["Submitted", str(summary.get("submitted", 0))],
+            ["Approved", str(summary.get("approved", 0))],
+            ["Rejected", str(summary.get("rejected", 0))],
             ["Total Target", f"{total_target:,.2f}"],
             ["Total Actual", f"{total_actual:,.2f}"],
-            ["Achievement Rate", f"{achievement_rate:.1f}%"],
+            ["Achievement Rate", f"{summary.get('achievement_rate', 0):.1f}%"],
+            ["Average Progress", f"{summary.get('average_progress', 0):.1f}%"],
         ]
 
         summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
@@ -247,24 +232,22 @@ class PDFReportService:
 
         # Add KPI rows
         for kpi in kpis:
-            period = f"Q{kpi.get('quarter', 'N/A')} {kpi.get('year', '')}"
+            period = f"{kpi.get('quarter') or 'N/A'} {kpi.get('year', '')}"
+            unit = f" {kpi['unit']}" if kpi.get("unit") else ""
             target = (
-                f"{kpi.get('target_value', 0):,.2f}"
+                f"{kpi['target_value']:,.2f}{unit}"
                 if kpi.get("target_value") is not None
                 else "N/A"
             )
             actual = (
-                f"{kpi.get('actual_value', 0):,.2f}"
+                f"{kpi['actual_value']:,.2f}{unit}"
                 if kpi.get("actual_value") is not None
                 else "N/A"
             )
 
-            # Calculate progress
-            if kpi.get("target_value") and kpi.get("actual_value"):
-                progress_pct = (
-                    kpi["actual_value"] / kpi["target_value"] * 100
-                )
-                progress = f"{progress_pct:.1f}%"
+            # Progress is derived on write (honouring the KPI's direction)
+            if kpi.get("progress_percentage") is not None:
+                progress = f"{kpi['progress_percentage']:.1f}%"
             else:
                 progress = "N/A"
 
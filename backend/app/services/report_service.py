@@ -1,19 +1,105 @@
 """Report generation service."""
 
-from typing import List, Optional
+import hashlib
+import json
+from io import BytesIO
+from typing import IO, List, Optional, Tuple
+from fastapi import HTTPException, status as http_status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import datetime
-from io import BytesIO
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
 
+from app.core.report_jobs import EXTENSIONS, report_job_queue
+from app.models.data_version import KPIS, USERS, DataVersion
 from app.models.kpi import KPI
+from app.models.report_job import ReportJob
+from app.models.user import User
 from app.crud.kpi import kpi_crud
+from app.crud.report_job import report_job_crud
+from app.services.pdf_service import pdf_service
+from app.utils.report_cache import report_cache
+from app.utils.xlsx_export import write_xlsx
+
+
+def _digest(spec: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    ).hexdigest()
 
 
 class ReportService:
     """Service for generating reports."""
 
+    @staticmethod
+    def _report_spec(report_type: str, requester: User, params: dict) -> dict:
+        """
+        What a report depends on besides the KPI data: its type, the
+        filters and, for PDFs covering everyone, the requester shown in the
+        header.
+        """
+        header_user_id = requester.id if report_type == "pdf" and not params.get("user_id") else None
+        return {"report_type": report_type, "params": params, "header_user_id": header_user_id}
+
+    def get_report_version(
+        self,
+        db: Session,
+        *,
+        report_type: str,
+        requester: User,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> str:
+        """
+        Cache key of a report: its spec plus the version of its data.
+
+        The data version is the write counter of the KPIs (bumped by a
+        trigger on any insert, edit or delete, however close together) and,
+        for PDFs, that of the user fields shown in the header. It takes one
+        primary key lookup, so the key also serves as the report's ETag.
+        """
+        params = {"user_id": user_id, "year": year, "quarter": quarter, "status": status}
+        names = [KPIS, USERS] if report_type == "pdf" else [KPIS]
+        versions = dict(db.execute(
+            select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))
+        ).all())
+        version = [versions.get(name, 0) for name in names]
+
+        spec = self._report_spec(report_type, requester, params)
+        spec["version"] = version
+        return _digest(spec)
+
+    def get_report_file(
+        self,
+        db: Session,
+        *,
+        report_type: str,
+        requester: User,
+        cache_key: str,
+        **params
+    ) -> IO[bytes]:
+        """
+        Return an open file with the report for ``cache_key`` (from
+        get_report_version), rendering and caching it on a miss.
+
+        The file is opened here so a concurrent eviction cannot remove it
+        before it is read.
+        """
+        extension = EXTENSIONS[report_type]
+        path = report_cache.get(cache_key, extension)
+        if path:
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                pass
+
+        if report_type == "pdf":
+            report = self.generate_pdf_report(db, requester=requester, **params)
+        else:
+            report = self.generate_excel_report(db, **params)
+        return open(report_cache.put(cache_key, extension, report), "rb")
+
     def generate_excel_report(
         self,
         db: Session,
@@ -21,122 +107,195 @@ class ReportService:
         year: Optional[int] = None,
         quarter: Optional[str] = None,
         status: Optional[str] = None
-    ) -> BytesIO:
-        """Generate Excel report for KPIs."""
-        # Get KPIs
-        kpis, _ = kpi_crud.get_multi(
+    ) -> IO[bytes]:
+        """
+        Generate Excel report for KPIs.
+
+        All matching KPIs are streamed from the database into the workbook,
+        so memory use does not grow with the row count. Returns a rewound
+        temporary file; stream it with iter_file, which also closes it.
+        """
+        rows = kpi_crud.iter_rows(
             db,
-            skip=0,
-            limit=1000,
+            columns=(
+                KPI.id, KPI.title, KPI.year, KPI.quarter, KPI.category, KPI.status,
+                KPI.target_value, KPI.current_value, KPI.progress_percentage,
+                KPI.created_at, KPI.updated_at,
+            ),
             user_id=user_id,
             year=year,
             quarter=quarter,
-            status=status
+            status=status,
         )
 
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "KPI Report"
-
-        # Header style
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-
-        # Headers
         headers = ["ID", "Title", "Year", "Quarter", "Category", "Status",
                    "Target", "Current", "Progress %", "Created", "Updated"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center")
-
-        # Data rows
-        for row, kpi in enumerate(kpis, 2):
-            ws.cell(row=row, column=1, value=kpi.id)
-            ws.cell(row=row, column=2, value=kpi.title)
-            ws.cell(row=row, column=3, value=kpi.year)
-            ws.cell(row=row, column=4, value=kpi.quarter)
-            ws.cell(row=row, column=5, value=kpi.category or "N/A")
-            ws.cell(row=row, column=6, value=kpi.status)
-            ws.cell(row=row, column=7, value=kpi.target_value or "N/A")
-            ws.cell(row=row, column=8, value=kpi.current_value or "N/A")
-            ws.cell(row=row, column=9, value=kpi.progress_percentage or 0)
-            ws.cell(row=row, column=10, value=kpi.created_at.strftime("%Y-%m-%d"))
-            ws.cell(row=row, column=11, value=kpi.updated_at.strftime("%Y-%m-%d"))
-
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output
+        return write_xlsx(
+            (
+                (
+                    row.id,
+                    row.title,
+                    row.year,
+                    row.quarter,
+                    row.category or "N/A",
+                    row.status,
+                    row.target_value or "N/A",
+                    row.current_value or "N/A",
+                    row.progress_percentage or 0,
+                    row.created_at.strftime("%Y-%m-%d"),
+                    row.updated_at.strftime("%Y-%m-%d"),
+                )
+                for row in rows
+            ),
+            headers,
+            sheet_name="KPI Report",
+        )
 
-    def get_analytics_data(
+    def generate_pdf_report(
         self,
         db: Session,
+        *,
+        requester: User,
         user_id: Optional[int] = None,
-        year: Optional[int] = None
-    ) -> dict:
-        """Get analytics data for dashboards."""
-        # Get all KPIs
-        kpis, total = kpi_crud.get_multi(
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> BytesIO:
+        """
+        Generate PDF report for KPIs.
+
+        The header shows the user whose KPIs are reported, or the requester
+        when the report covers everyone.
+        """
+        target_user = db.get(User, user_id) if user_id else requester
+        if target_user is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        user_info = {
+            "full_name": target_user.full_name or target_user.username,
+            "email": target_user.email,
+            "department": target_user.department or "N/A",
+            "role": target_user.role,
+        }
+
+        kpis_data = [
+            {
+                "title": row.title,
+                "description": row.description,
+                "year": row.year,
+                "quarter": row.quarter,
+                "target_value": row.target_numeric,
+                "actual_value": row.current_numeric,
+                "unit": row.unit,
+                "progress_percentage": row.progress_percentage,
+                "status": row.status,
+                "category": row.category,
+            }
+            for row in kpi_crud.iter_rows(
+                db,
+                columns=(
+                    KPI.title, KPI.description, KPI.year, KPI.quarter,
+                    KPI.target_numeric, KPI.current_numeric, KPI.unit,
+                    KPI.progress_percentage, KPI.status, KPI.category,
+                ),
+                user_id=user_id,
+                year=year,
+                quarter=quarter,
+                status=status,
+            )
+        ]
+
+        filters = {}
+        if year:
+            filters["year"] = year
+        if quarter:
+            filters["quarter"] = quarter
+        if status:
+            filters["status"] = status
+
+        # Summary aggregates are computed in SQL
+        summary = kpi_crud.get_value_summary(
+            db, user_id=user_id, year=year, quarter=quarter, status=status
+        )
+
+        return pdf_service.generate_kpi_report(
+            kpis=kpis_data, user_info=user_info, filters=filters, summary=summary
+        )
+
+    def submit_report_job(
+        self,
+        db: Session,
+        *,
+        report_type: str,
+        current_user: User,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None,
+        quarter: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[ReportJob, bool]:
+        """
+        Queue a report for background rendering.
+
+        Identical requests (same _report_spec; employees are limited to
+        their own KPIs) share one job while it is queued or running.
+        Returns (job, created).
+        """
+        if current_user.role == "employee":
+            user_id = current_user.id
+
+        params = {"user_id": user_id, "year": year, "quarter": quarter, "status": status}
+        spec_hash = _digest(self._report_spec(report_type, current_user, params))
+
+        job = report_job_crud.get_active(db, spec_hash=spec_hash)
+        if job:
+            return job, False
+
+        if report_job_queue.is_full():
+            raise HTTPException(
+                status_code=http_status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many reports are being generated, please retry shortly",
+                headers={"Retry-After": "30"},
+            )
+
+        job, created = report_job_crud.get_or_create(
             db,
-            skip=0,
-            limit=10000,
-            user_id=user_id,
-            year=year
+            report_type=report_type,
+            params=json.dumps(params, sort_keys=True),
+            spec_hash=spec_hash,
+            requested_by=current_user.id,
         )
+        if created:
+            report_job_queue.submit(job.id)
+        return job, created
 
-        if not kpis:
-            return {
-                "total_kpis": 0,
-                "avg_progress": 0,
-                "completion_rate": 0,
-                "by_status": {},
-                "by_quarter": {},
-                "by_category": {}
-            }
+    def get_report_job(self, db: Session, job_id: str, current_user: User) -> ReportJob:
+        """Get a report job; employees only see reports of their own KPIs."""
+        job = report_job_crud.get(db, job_id)
+        if job and current_user.role == "employee":
+            if json.loads(job.params).get("user_id") != current_user.id:
+                job = None
+        if job is None:
+            raise HTTPException(
+                status_code=http_status.HTTP_404_NOT_FOUND,
+                detail="Report job not found"
+            )
+        return job
 
-        # Calculate metrics
-        total_kpis = len(kpis)
-        avg_progress = sum(k.progress_percentage or 0 for k in kpis) / total_kpis
-        approved = sum(1 for k in kpis if k.status == "approved")
-        completion_rate = (approved / total_kpis * 100) if total_kpis > 0 else 0
-
-        # By status
-        by_status = {}
-        for kpi in kpis:
-            by_status[kpi.status] = by_status.get(kpi.status, 0) + 1
-
-        # By quarter
-        by_quarter = {}
-        for kpi in kpis:
-            by_quarter[kpi.quarter] = by_quarter.get(kpi.quarter, 0) + 1
-
-        # By category
-        by_category = {}
-        for kpi in kpis:
-            cat = kpi.category or "Uncategorized"
-            by_category[cat] = by_category.get(cat, 0) + 1
-
-        return {
-            "total_kpis": total_kpis,
-            "avg_progress": round(avg_progress, 2),
-            "completion_rate": round(completion_rate, 2),
-            "by_status": by_status,
-            "by_quarter": by_quarter,
-            "by_category": by_category
-        }
+    def get_analytics_data(
+        self,
+        db: Session,
+        user_id: Optional[int] = None,
+        year: Optional[int] = None
+    ) -> dict:
+        """
+        Get analytics data for dashboards.
+
+        Totals and breakdowns by status, quarter, category, department and
+        objective are aggregated in SQL over every matching KPI.
+        """
+        return kpi_crud.get_breakdowns(db, user_id=user_id, year=year)
 
 
 # Singleton instance
@@ -1,9 +1,14 @@
 """Email utility functions for sending notifications."""
 
+import asyncio
 import smtplib
+import time
+import aiosmtplib
+from contextlib import asynccontextmanager
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple
 from datetime import datetime, timezone
 import logging
 
@@ -12,6 +17,154 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
+class SMTPSession:
+    """One pooled SMTP connection, replaced transparently if the server dropped it."""
+
+    def __init__(self, pool: "SMTPPool"):
+        self._pool = pool
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+
+    async def send(self, message: Message) -> None:
+        """
+        Send a message over this session's connection.
+
+        The connection is opened (or taken from the pool) on first use. If
+        a reused connection turns out to be closed by the server, the
+        message is sent again over a new one. SMTP errors are raised.
+        """
+        reused = True
+        if self._smtp is None:
+            self._smtp, reused = await self._pool._checkout()
+        try:
+            await self._smtp.send_message(message)
+            return
+        except (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused):
+            # Rejected message; the connection was reset and stays usable
+            raise
+        except Exception as e:
+            self._smtp.close()
+            self._smtp = None
+            if not reused or not isinstance(e, ConnectionError):
+                raise
+        self._smtp, _ = await self._pool._checkout(fresh=True)
+        await self._smtp.send_message(message)
+
+    def release(self) -> None:
+        """Return the connection to the pool."""
+        if self._smtp is not None:
+            self._pool._checkin(self._smtp)
+            self._smtp = None
+
+
+class SMTPPool:
+    """
+    Keep a few authenticated SMTP connections open for reuse.
+
+    A new connection costs a TCP connect, EHLO, STARTTLS and AUTH before
+    the first message can go out. Sessions from the pool keep their
+    connection across messages and hand it back for the next batch. At
+    most ``max_size`` sessions are open at once. Idle connections are
+    closed after ``idle_timeout`` seconds and checked with NOOP before
+    reuse once idle for ``check_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[aiosmtplib.SMTP]],
+        *,
+        max_size: int,
+        idle_timeout: float,
+        check_interval: float,
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def idle(self) -> int:
+        """Number of idle pooled connections."""
+        return len(self._idle)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[SMTPSession]:
+        """Borrow a session; waits while ``max_size`` sessions are in use."""
+        self._bind()
+        async with self._slots:
+            session = SMTPSession(self)
+            try:
+                yield session
+            finally:
+                session.release()
+
+    async def send_batch(self, messages: List[Message]) -> List[Optional[Exception]]:
+        """Send messages over one session. Returns the error of each message, or None."""
+        results: List[Optional[Exception]] = []
+        async with self.session() as session:
+            for message in messages:
+                try:
+                    await session.send(message)
+                    results.append(None)
+                except (aiosmtplib.SMTPException, OSError) as e:
+                    results.append(e)
+        return results
+
+    async def prune(self) -> None:
+        """Close connections that have been idle too long."""
+        self._bind()
+        now = time.monotonic()
+        expired = [smtp for smtp, last_used in self._idle if now - last_used > self.idle_timeout]
+        self._idle = [(smtp, last_used) for smtp, last_used in self._idle if smtp not in expired]
+        for smtp in expired:
+            await self._quit(smtp)
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        self._bind()
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            await self._quit(smtp)
+
+    def _bind(self) -> None:
+        # Connections and the semaphore belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._idle = []
+            self._slots = asyncio.Semaphore(self.max_size)
+
+    async def _checkout(self, fresh: bool = False) -> Tuple[aiosmtplib.SMTP, bool]:
+        """Return (connection, reused), preferring the most recently used idle one."""
+        while self._idle and not fresh:
+            smtp, last_used = self._idle.pop()
+            idle = time.monotonic() - last_used
+            if idle > self.idle_timeout or not smtp.is_connected:
+                smtp.close()
+                continue
+            if idle > self.check_interval:
+                try:
+                    await smtp.noop()
+                except Exception:
+                    smtp.close()
+                    continue
+            return smtp, True
+        return await self._connect(), False
+
+    def _checkin(self, smtp: aiosmtplib.SMTP) -> None:
+        if smtp.is_connected:
+            self._idle.append((smtp, time.monotonic()))
+
+    @staticmethod
+    async def _quit(smtp: aiosmtplib.SMTP) -> None:
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+
+
 class EmailService:
     """Email service for sending notifications."""
 
@@ -24,6 +177,37 @@ class EmailService:
         self.password = settings.SMTP_PASSWORD
         self.from_email = settings.SMTP_FROM
         self.use_tls = settings.SMTP_TLS
+        self.timeout = settings.SMTP_TIMEOUT
+        self.smtp_pool = SMTPPool(
+            self._connect,
+            max_size=settings.SMTP_POOL_SIZE,
+            idle_timeout=settings.SMTP_POOL_IDLE_SECONDS,
+            check_interval=settings.SMTP_POOL_CHECK_SECONDS,
+        )
+
+    def build_message(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None
+    ) -> MIMEMultipart:
+        """Build a multipart email with an optional plain text alternative."""
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self.from_email
+        message["To"] = ", ".join(to_emails)
+        message["Date"] = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+        # Add plain text version if provided
+        if body_text:
+            part1 = MIMEText(body_text, "plain")
+            message.attach(part1)
+
+        # Add HTML version
+        part2 = MIMEText(body_html, "html")
+        message.attach(part2)
+        return message
 
     def send_email(
         self,
@@ -53,21 +237,7 @@ class EmailService:
             return False
 
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = self.from_email
-            message["To"] = ", ".join(to_emails)
-            message["Date"] = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")
-
-            # Add plain text version if provided
-            if body_text:
-                part1 = MIMEText(body_text, "plain")
-                message.attach(part1)
-
-            # Add HTML version
-            part2 = MIMEText(body_html, "html")
-            message.attach(part2)
+            message = self.build_message(to_emails, subject, body_html, body_text)
 
             # Connect and send
             with smtplib.SMTP(self.host, self.port) as server:
@@ -84,6 +254,36 @@ class EmailService:
             logger.error(f"Failed to send email: {str(e)}")
             return False
 
+    async def send_email_async(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None
+    ) -> None:
+        """
+        Send an email over a pooled connection, without blocking the event loop.
+
+        Unlike send_email, failures are raised (aiosmtplib.SMTPException
+        or OSError) so the caller can decide whether to retry.
+        """
+        message = self.build_message(to_emails, subject, body_html, body_text)
+        async with self.smtp_pool.session() as session:
+            await session.send(message)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open an authenticated connection for the pool."""
+        smtp = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.user or None,
+            password=self.password or None,
+            start_tls=self.use_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        return smtp
+
 
 # Global email service instance
 email_service = EmailService()
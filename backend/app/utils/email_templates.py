@@ -350,12 +350,28 @@ def weekly_digest_email(data: Dict[str, Any]) -> Dict[str, str]:
     Email template for weekly activity digest.
 
     Args:
-        data: Dict containing user_name, period, stats, link
+        data: Dict containing user_name, period, stats, link. stats may
+            include objectives, a list of dicts with title, progress, delta
 
     Returns:
         Dict with subject, html_body, text_body
     """
     stats = data.get('stats', {})
+    objectives = stats.get('objectives', [])
+
+    objectives_html = ""
+    objectives_text = ""
+    if objectives:
+        rows = "".join(
+            f"<p>{o['title']}: {o['progress']}% ({o['delta']:+g})</p>" for o in objectives
+        )
+        objectives_html = f"""
+        <h3>Objective Progress</h3>
+        <div class="info-box">{rows}</div>
+"""
+        objectives_text = "\nObjective Progress:\n" + "".join(
+            f"- {o['title']}: {o['progress']}% ({o['delta']:+g})\n" for o in objectives
+        )
 
     content = f"""
         <h2>📊 Your Weekly Digest</h2>
@@ -364,11 +380,13 @@ def weekly_digest_email(data: Dict[str, Any]) -> Dict[str, str]:
 
         <div class="info-box">
             <p><span class="label">KPIs Updated:</span> {stats.get('kpis_updated', 0)}</p>
+            <p><span class="label">Status Changes:</span> {stats.get('status_changes', 0)}</p>
             <p><span class="label">Pending Approvals:</span> {stats.get('pending_approvals', 0)}</p>
             <p><span class="label">New Comments:</span> {stats.get('new_comments', 0)}</p>
+            <p><span class="label">Unread Notifications:</span> {stats.get('unread_notifications', 0)}</p>
             <p><span class="label">Average Progress:</span> {stats.get('avg_progress', 0)}%</p>
         </div>
-
+{objectives_html}
         <p>
             <a href="{data['link']}" class="button">View Dashboard</a>
         </p>
@@ -382,10 +400,12 @@ Hello {data['user_name']},
 Here's your activity summary for {data['period']}:
 
 - KPIs Updated: {stats.get('kpis_updated', 0)}
+- Status Changes: {stats.get('status_changes', 0)}
 - Pending Approvals: {stats.get('pending_approvals', 0)}
 - New Comments: {stats.get('new_comments', 0)}
+- Unread Notifications: {stats.get('unread_notifications', 0)}
 - Average Progress: {stats.get('avg_progress', 0)}%
-
+{objectives_text}
 View Dashboard: {data['link']}
 """
 
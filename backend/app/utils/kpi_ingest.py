@@ -0,0 +1,111 @@
+"""Parsing of bulk KPI value uploads (JSON lines or CSV)."""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.utils.kpi_values import parse_value
+
+FORMATS = ("jsonl", "csv")
+
+# Content types mapped to upload formats
+CONTENT_TYPES = {
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+    "text/csv": "csv",
+    "application/csv": "csv",
+}
+
+
+def _clean_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate one record and normalise it to
+    {"kpi_id", "external_key", "value", "measured_at"}.
+
+    Raises ValueError with a message suitable for a reject report.
+    """
+    kpi_id = raw.get("kpi_id")
+    external_key = raw.get("external_key")
+    if kpi_id in (None, ""):
+        kpi_id = None
+    else:
+        try:
+            kpi_id = int(kpi_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid kpi_id: {kpi_id!r}")
+    external_key = str(external_key).strip() if external_key not in (None, "") else None
+    if kpi_id is None and external_key is None:
+        raise ValueError("Either kpi_id or external_key is required")
+
+    value = raw.get("value")
+    if isinstance(value, bool):
+        raise ValueError(f"Value is not numeric: {value!r}")
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        number, _ = parse_value(value)
+    if number is None:
+        raise ValueError(f"Value is not numeric: {value!r}")
+
+    timestamp = raw.get("timestamp", raw.get("measured_at"))
+    measured_at = None
+    if timestamp not in (None, ""):
+        try:
+            measured_at = datetime.fromisoformat(str(timestamp).strip())
+        except ValueError:
+            raise ValueError(f"Invalid timestamp: {timestamp!r}")
+
+    return {
+        "kpi_id": kpi_id,
+        "external_key": external_key,
+        "value": number,
+        "measured_at": measured_at,
+    }
+
+
+def _records(content: str, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, raw record or parse error) from an upload."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(content))
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, ValueError("Invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            record = ValueError("Expected a JSON object")
+        yield line_number, record
+
+
+def parse_rows(
+    content: str, fmt: str
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse a JSON lines or CSV upload of KPI values.
+
+    Each record has ``kpi_id`` or ``external_key``, ``value`` (a number or
+    text such as '1,500 VND') and an optional ISO 8601 ``timestamp``. CSV
+    uploads need a header row. Yields (line number, row, None) for valid
+    records and (line number, None, error) for rejected ones.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    for line_number, record in _records(content, fmt):
+        if isinstance(record, ValueError):
+            yield line_number, None, str(record)
+            continue
+        try:
+            yield line_number, _clean_row(record), None
+        except ValueError as e:
+            yield line_number, None, str(e)
@@ -0,0 +1,88 @@
+"""Parsing of free-text KPI target/current values."""
+
+import re
+from typing import Optional, Tuple
+
+# Leading number with optional sign, grouping and decimal separators
+_NUMBER_RE = re.compile(r"^\s*([-+]?\d[\d.,\s]*)")
+# Magnitude words commonly written after the number
+_MULTIPLIERS = {
+    "k": 1e3,
+    "nghìn": 1e3,
+    "ngàn": 1e3,
+    "tr": 1e6,
+    "triệu": 1e6,
+    "tỷ": 1e9,
+    "tỉ": 1e9,
+}
+
+UNIT_MAX_LENGTH = 20
+
+
+def _to_number(raw: str) -> Optional[float]:
+    """Convert '1,234.5', '1.234,5', '1 234' or '12,5' to a float."""
+    raw = raw.replace(" ", "").rstrip(".,")
+    if not raw:
+        return None
+
+    if "," in raw and "." in raw:
+        # The right-most separator is the decimal one
+        if raw.rfind(",") > raw.rfind("."):
+            raw = raw.replace(".", "").replace(",", ".")
+        else:
+            raw = raw.replace(",", "")
+    elif "," in raw:
+        # '1,234,567' groups thousands; '12,5' is a decimal comma
+        if re.fullmatch(r"[-+]?\d{1,3}(,\d{3})+", raw):
+            raw = raw.replace(",", "")
+        else:
+            raw = raw.replace(",", ".")
+    elif re.fullmatch(r"[-+]?[1-9]\d{0,2}(\.\d{3})+", raw):
+        # '1.234.567' and '250.000' group thousands (VND style); '0.125' and
+        # '2.5' stay decimals
+        raw = raw.replace(".", "")
+
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def parse_value(value: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Split a KPI value such as '1,500 VND', '95%' or '2.5 triệu' into
+    (number, unit).
+
+    Magnitude words (k, triệu, tỷ, ...) are applied to the number. Returns
+    (None, None) when the text does not start with a number.
+    """
+    if value is None:
+        return None, None
+    match = _NUMBER_RE.match(str(value))
+    if not match:
+        return None, None
+
+    number = _to_number(match.group(1))
+    if number is None:
+        return None, None
+
+    rest = str(value)[match.end():].strip()
+    word = rest.split(" ", 1)[0].lower() if rest else ""
+    if word in _MULTIPLIERS:
+        number *= _MULTIPLIERS[word]
+        rest = rest[len(word):].strip()
+
+    unit = rest[:UNIT_MAX_LENGTH] or None
+    return number, unit
+
+
+def format_value(number: float, unit: Optional[str] = None) -> str:
+    """
+    Render a number (and unit) as KPI value text that parse_value reads back
+    to the same number, e.g. 1500000.0 -> '1500000 VND'.
+    """
+    text = f"{number:.15g}"
+    if "e" not in text and "." in text and _to_number(text) != number:
+        # '250.125' would read as thousands grouping; '250.1250' does not
+        text += "0"
+    return f"{text} {unit}" if unit else text
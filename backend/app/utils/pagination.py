@@ -0,0 +1,85 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(timestamp: Optional[str], row_id: int) -> str:
+    """Encode a (timestamp, id) position as an opaque URL-safe cursor."""
+    raw = json.dumps([timestamp, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(row_id, int) or not (timestamp is None or isinstance(timestamp, str)):
+        raise ValueError("Invalid cursor")
+    return timestamp, row_id
+
+
+def keyset_paginate(
+    query: Query,
+    *,
+    ts_column,
+    id_column,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Page a query newest-first by (ts_column, id_column).
+
+    With a cursor, rows strictly after that position are returned using an
+    index-friendly range instead of OFFSET. Without one, ``skip`` is used as
+    before. Either way, a cursor for the next page is returned (None on the
+    last page), computed by fetching one extra row.
+
+    Timestamps are compared as the raw stored text so the cursor matches the
+    stored value exactly (SQLite keeps server defaults without microseconds
+    and Python-set values with them).
+
+    Returns (items, next_cursor); items are entities for single-entity
+    queries and tuples otherwise.
+    """
+    single = len(query.column_descriptions) == 1
+    raw_ts = type_coerce(ts_column, String)
+
+    if cursor:
+        timestamp, last_id = decode_cursor(cursor)
+        if timestamp is None:
+            # NULL timestamps sort last in DESC order; only ids remain
+            query = query.filter(ts_column.is_(None), id_column < last_id)
+        else:
+            query = query.filter(
+                or_(
+                    raw_ts < timestamp,
+                    and_(raw_ts == timestamp, id_column < last_id),
+                    ts_column.is_(None),
+                )
+            )
+
+    query = (
+        query.add_columns(raw_ts.label("_cursor_ts"), id_column.label("_cursor_id"))
+        .order_by(ts_column.desc(), id_column.desc())
+    )
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+
+    items = [row[0] if single else tuple(row[:-2]) for row in rows]
+    return items, next_cursor
@@ -0,0 +1,80 @@
+"""Size-bounded on-disk cache of rendered reports."""
+
+import os
+import shutil
+import tempfile
+from typing import IO, Optional
+
+from app.config import settings
+
+
+class ReportCache:
+    """
+    Content-addressed report files, evicted least recently used first.
+
+    Files are named by their cache key, which already identifies the
+    content, so entries are never updated in place. A hit bumps the file's
+    mtime; when the directory grows past ``max_size`` bytes the files with
+    the oldest mtime are removed. All state is on disk, so the API process
+    and the report workers share one cache.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def get(self, key: str, extension: str) -> Optional[str]:
+        """Return the path of a cached report and mark it used, or None."""
+        path = self._path(key, extension)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, extension: str, fileobj: IO[bytes]) -> str:
+        """Store a report (closing ``fileobj``) and return its path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key, extension)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with fileobj, os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(fileobj, out)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove least recently used reports until under the size budget."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith(".part"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+# Global report cache instance
+report_cache = ReportCache(settings.REPORT_CACHE_DIR, settings.REPORT_CACHE_MAX_SIZE)
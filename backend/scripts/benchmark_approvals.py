@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark KPI approvals: per-statement commits vs one unit of work.
+
+Seeds submitted KPIs in a throwaway SQLite database (WAL, as in production)
+and approves them one per session, the way a request would, reporting
+approvals per second plus commits and queries per approval.
+
+Usage:
+    python scripts/benchmark_approvals.py [--kpis 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Use a throwaway database; must be configured before importing the app
+_tmpdir = tempfile.mkdtemp(prefix="kpi-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import engine, Base, SessionLocal
+from app.models import *  # noqa: F401,F403 - register all models
+from app.models.kpi import KPI
+from app.models.user import User
+from app.crud.kpi import kpi_crud
+from app.crud.notification import notification_crud
+from app.schemas.kpi import KPIApprove, KPIResponse
+from app.services.kpi import kpi_service
+
+
+class Counter:
+    """Count statements executed on the engine and session commits."""
+
+    def __init__(self):
+        self.queries = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(Session, "after_commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.queries += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+
+def seed(db, count):
+    """Insert a manager, an employee and ``count`` submitted KPIs."""
+    db.add_all([
+        User(id=1, email="manager@example.com", username="manager",
+             password_hash="x", full_name="Bench Manager", role="manager"),
+        User(id=2, email="employee@example.com", username="employee",
+             password_hash="x", full_name="Bench Employee", role="employee"),
+    ])
+    db.flush()
+    db.bulk_insert_mappings(KPI, [
+        dict(user_id=2, year=2025, quarter="Q1", title=f"KPI {i}",
+             progress_percentage=50.0, status="submitted")
+        for i in range(count)
+    ])
+    db.commit()
+
+
+def legacy_approve(db, kpi_id, approver, data):
+    """Previous flow: re-read the KPI, then commit after every statement."""
+    kpi = db.query(KPI).filter(KPI.id == kpi_id).first()
+    kpi = kpi_crud.approve(db, kpi_id=kpi.id, approver_id=approver.id, comment=data.comment)
+    notification_crud.create(
+        db, user_id=kpi.user_id, title="KPI Approved",
+        message=f'Your KPI "{kpi.title}" has been approved by {approver.full_name}.',
+        notification_type="success", link=f"/kpis/{kpi.id}",
+    )
+    return KPIResponse.model_validate(kpi)
+
+
+def unit_of_work_approve(db, kpi_id, approver, data):
+    """Current flow: KPIService.approve_kpi commits once."""
+    return kpi_service.approve_kpi(db, kpi_id, data, approver)
+
+
+def run(label, approve, kpi_ids, counter):
+    data = KPIApprove(comment="Looks good")
+    queries, commits = counter.queries, counter.commits
+    start = time.perf_counter()
+    for kpi_id in kpi_ids:
+        db = SessionLocal()
+        try:
+            approver = db.get(User, 1)
+            approve(db, kpi_id, approver, data)
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start
+    n = len(kpi_ids)
+    print(
+        f"{label:<8} approvals/s={n / elapsed:,.0f}  "
+        f"commits/approval={(counter.commits - commits) / n:.1f}  "
+        f"queries/approval={(counter.queries - queries) / n:.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kpis", type=int, default=500, help="Approvals per run")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    seed(db, args.kpis * 2)
+    db.close()
+    print(f"Seeded {args.kpis * 2:,} submitted KPIs in {_tmpdir}")
+
+    counter = Counter()
+    ids = list(range(1, args.kpis * 2 + 1))
+    run("before", legacy_approve, ids[:args.kpis], counter)
+    run("after", unit_of_work_approve, ids[args.kpis:], counter)
+
+
+if __name__ == "__main__":
+    main()
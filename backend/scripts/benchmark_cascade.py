@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark the objective cascade view: per-node queries vs bulk assembly.
+
+Builds a synthetic 5-level tree (~10k objectives, one linked KPI per
+individual objective) in a throwaway SQLite database and reports query
+count and latency for building the cascade of every company objective.
+
+Usage:
+    python scripts/benchmark_cascade.py [--units 4 --divisions 5 --teams 5 --individuals 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Use a throwaway database; must be configured before importing the app
+_tmpdir = tempfile.mkdtemp(prefix="kpi-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app.database import engine, Base, SessionLocal
+from app.models import *  # noqa: F401,F403 - register all models
+from app.models.objective import Objective, ObjectiveKPILink
+from app.models.kpi import KPI
+from app.models.user import User
+from app.crud.objective import objective_crud
+from app.schemas.objective import ObjectiveCascadeNode, KPISummary
+from app.api.v1.objectives import _build_cascade_nodes, _to_float
+
+LEVELS = ["company", "unit", "division", "team", "individual"]
+
+
+class QueryCounter:
+    """Count statements executed on the engine."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def seed(db, fanout):
+    """Insert the synthetic tree with bulk inserts; returns objective count."""
+    db.add(User(id=1, email="bench@example.com", username="bench",
+                password_hash="x", full_name="Bench User", role="admin"))
+    db.flush()
+
+    objectives, kpis, links = [], [], []
+    next_id = 1
+    frontier = [(None, "/")]
+    for depth, level in enumerate(LEVELS):
+        width = fanout[depth]
+        new_frontier = []
+        for parent_id, parent_path in frontier:
+            for _ in range(width):
+                oid = next_id
+                next_id += 1
+                path = f"{parent_path}{oid}/"
+                objectives.append(dict(
+                    id=oid, title=f"{level} {oid}", level=level, parent_id=parent_id,
+                    path=path, owner_id=1, created_by=1, year=2025,
+                    status="active", progress_percentage=0.0, is_featured=0,
+                ))
+                if level == "individual":
+                    kpis.append(dict(id=oid, user_id=1, year=2025, quarter="Q1",
+                                     title=f"KPI {oid}", target_value="100",
+                                     current_value="40", progress_percentage=40.0,
+                                     status="approved"))
+                    links.append(dict(objective_id=oid, kpi_id=oid, weight=1.0))
+                new_frontier.append((oid, path))
+        frontier = new_frontier
+
+    db.bulk_insert_mappings(Objective, objectives)
+    db.bulk_insert_mappings(KPI, kpis)
+    db.bulk_insert_mappings(ObjectiveKPILink, links)
+    db.commit()
+    return len(objectives)
+
+
+def legacy_cascade(db, roots):
+    """Previous implementation: recursive, several queries per node."""
+
+    def build(obj):
+        owner_name = obj.owner.full_name if obj.owner else None
+        kpis = []
+        for kpi in objective_crud.get_linked_kpis(db, obj.id):
+            link = db.query(ObjectiveKPILink).filter(
+                ObjectiveKPILink.objective_id == obj.id,
+                ObjectiveKPILink.kpi_id == kpi.id
+            ).first()
+            kpis.append(KPISummary(
+                id=kpi.id, title=kpi.title,
+                progress_percentage=kpi.progress_percentage or 0.0,
+                target_value=_to_float(kpi.target_value),
+                current_value=_to_float(kpi.current_value),
+                weight=link.weight if link else 1.0,
+            ))
+        children = objective_crud.get_children(db, obj.id)
+        return ObjectiveCascadeNode(
+            id=obj.id, title=obj.title, level=obj.level,
+            progress_percentage=obj.progress_percentage, status=obj.status,
+            year=obj.year, owner_id=obj.owner_id, owner_name=owner_name,
+            kpi_count=len(kpis), children_count=len(children), kpis=kpis,
+            children=[build(child) for child in children],
+        )
+
+    return [build(root) for root in roots]
+
+
+def run(label, builder, counter):
+    db = SessionLocal()
+    try:
+        roots = db.query(Objective).filter(Objective.level == "company").all()
+        before = counter.count
+        start = time.perf_counter()
+        result = builder(db, roots)
+        elapsed = time.perf_counter() - start
+        queries = counter.count - before
+    finally:
+        db.close()
+    print(f"{label:<8} queries={queries:<7} time={elapsed * 1000:,.0f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=5)
+    parser.add_argument("--units", type=int, default=4)
+    parser.add_argument("--divisions", type=int, default=5)
+    parser.add_argument("--teams", type=int, default=5)
+    parser.add_argument("--individuals", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    total = seed(db, [args.companies, args.units, args.divisions, args.teams, args.individuals])
+    db.close()
+    print(f"Seeded {total:,} objectives in {_tmpdir}")
+
+    counter = QueryCounter()
+    before = run("before", legacy_cascade, counter)
+    after = run("after", _build_cascade_nodes, counter)
+
+    assert [n.model_dump() for n in before] == [n.model_dump() for n in after], "outputs differ"
+    print("Outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark email delivery: one SMTP session per message vs pooled sessions.
+
+Starts a local aiosmtpd server and sends the same messages three ways,
+reporting messages per second and the SMTP connections opened:
+
+    smtplib   blocking session per message (the previous inline sending)
+    per-msg   aiosmtplib session per message
+    pooled    batches over pooled sessions (EmailService.smtp_pool)
+
+Every command the server handles is delayed by --latency milliseconds to
+stand in for the round trip to a remote relay. The local server does not
+offer STARTTLS or AUTH, so the cost of opening a real session (and the
+gain from pooling) is understated.
+
+Usage:
+    python scripts/benchmark_email.py [--messages 500] [--latency 2]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+from app.config import settings
+from app.utils.email import email_service
+
+
+class SlowHandler:
+    """Accept everything, counting connections and delaying each command."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = 0
+        self.messages = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        await asyncio.sleep(self.latency)
+        return responses
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        await asyncio.sleep(self.latency)
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        await asyncio.sleep(self.latency)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.messages += 1
+        return "250 OK"
+
+    async def handle_QUIT(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        return "221 Bye"
+
+
+def build_messages(count):
+    return [
+        email_service.build_message(
+            [f"user{i}@example.com"], f"KPI Submitted for Approval: KPI {i}",
+            "<p>A KPI was submitted for your approval.</p>", "A KPI was submitted.",
+        )
+        for i in range(count)
+    ]
+
+
+def run_smtplib(count):
+    for message in build_messages(count):
+        email_service.send_email(
+            [message["To"]], message["Subject"],
+            "<p>A KPI was submitted for your approval.</p>", "A KPI was submitted.",
+        )
+
+
+async def run_per_message(count):
+    for message in build_messages(count):
+        await aiosmtplib.send(
+            message, hostname=email_service.host, port=email_service.port, start_tls=False
+        )
+
+
+async def run_pooled(count):
+    messages = build_messages(count)
+    size = settings.EMAIL_OUTBOX_BATCH_SIZE
+    for start in range(0, count, size):
+        errors = await email_service.smtp_pool.send_batch(messages[start:start + size])
+        assert not any(errors), errors
+    await email_service.smtp_pool.close()
+
+
+def report(label, handler, count, elapsed):
+    connections, handler.connections = handler.connections, 0
+    sent, handler.messages = handler.messages, 0
+    assert sent == count, f"{label}: {sent} of {count} delivered"
+    print(
+        f"{label:<8} messages/s={count / elapsed:,.0f}  "
+        f"connections={connections}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500, help="Messages per run")
+    parser.add_argument("--latency", type=float, default=2.0, help="Milliseconds per SMTP command")
+    args = parser.parse_args()
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    handler = SlowHandler(args.latency / 1000)
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+
+    email_service.enabled = True
+    email_service.host, email_service.port = "127.0.0.1", port
+    email_service.user = email_service.password = ""
+    email_service.use_tls = False
+    print(f"SMTP server on port {port}, {args.latency:g} ms per command")
+
+    try:
+        start = time.perf_counter()
+        run_smtplib(args.messages)
+        report("smtplib", handler, args.messages, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        asyncio.run(run_per_message(args.messages))
+        report("per-msg", handler, args.messages, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        asyncio.run(run_pooled(args.messages))
+        report("pooled", handler, args.messages, time.perf_counter() - start)
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Rebuild the full-text search index from KPIs, objectives and comments."""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.crud.search import search_crud
+
+
+def rebuild_search_index():
+    """Create the index and triggers if missing, then refill it."""
+    db = SessionLocal()
+
+    try:
+        print("Rebuilding search index...")
+        count = search_crud.rebuild(db)
+        print(f"✅ Indexed {count} entries")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding search index: {e}")
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if rebuild_search_index() else 1)
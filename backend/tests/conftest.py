@@ -0,0 +1,118 @@
+"""
+Shared fixtures: a fresh database per test and a local SMTP server for
+email tests.
+"""
+
+import os
+import socket
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-email-tests")
+
+from aiosmtpd.controller import Controller
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers every table and trigger on Base.metadata)
+from app.database import Base
+from app.utils.email import email_service
+
+
+def _enable_foreign_keys(dbapi_conn, connection_record):
+    # As in app.database: the cascades and trigger tests depend on it
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@pytest.fixture
+def session_local_modules():
+    """
+    Modules whose ``SessionLocal`` should open sessions on the test
+    database, for code that opens its own sessions (workers, scheduled
+    jobs). Override in a test module, or parametrize it.
+    """
+    return []
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A fresh SQLite database file with all tables and triggers."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False}
+    )
+    event.listen(engine, "connect", _enable_foreign_keys)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine, monkeypatch, session_local_modules):
+    """Session factory on the test database, patched into ``session_local_modules``."""
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    for module in session_local_modules:
+        monkeypatch.setattr(module, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class RecordingHandler:
+    """SMTP handler that records messages and can reply with errors."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        self.sessions = []  # server side of each connection
+        self.replies = []  # replies for the next DATA commands, then "250 OK"
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        self.sessions.append(server)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.replies:
+            reply = self.replies.pop(0)
+            if not reply.startswith("250"):
+                return reply
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def use_smtp_server(monkeypatch, port: int) -> None:
+    """Point email_service at a plain (no TLS, no AUTH) server on localhost."""
+    monkeypatch.setattr(email_service, "enabled", True)
+    monkeypatch.setattr(email_service, "host", "127.0.0.1")
+    monkeypatch.setattr(email_service, "port", port)
+    monkeypatch.setattr(email_service, "user", "")
+    monkeypatch.setattr(email_service, "password", "")
+    monkeypatch.setattr(email_service, "use_tls", False)
+    monkeypatch.setattr(email_service, "timeout", 5)
+
+
+@pytest.fixture
+async def smtp_server(monkeypatch):
+    """Local SMTP server that email_service sends to."""
+    handler = RecordingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    use_smtp_server(monkeypatch, port)
+    yield handler
+    await email_service.smtp_pool.close()
+    controller.stop()
@@ -0,0 +1,170 @@
+"""Tests for the SQL-aggregated dashboard analytics.
+
+Run with: pytest backend/tests/test_analytics.py
+"""
+
+import pytest
+
+from app.crud.kpi import kpi_crud
+from app.crud.objective import objective_crud
+from app.models.kpi import KPI
+from app.models.kpi_rollup import KPIRollup
+from app.models.user import User
+from app.schemas.objective import ObjectiveCreate
+from app.services.report_service import report_service
+
+
+def python_breakdowns(kpis, objectives):
+    """The aggregation as it used to be done, over loaded KPI objects."""
+    def summary(group, **extra):
+        total = len(group)
+        approved = sum(1 for k in group if k.status == "approved")
+        return {
+            **extra,
+            "total_kpis": total,
+            "avg_progress": round(sum(k.progress_percentage or 0 for k in group) / total, 2),
+            "completion_rate": round(approved / total * 100, 2),
+        }
+
+    result = summary(kpis)
+    for key, value in (
+        ("by_status", lambda k: k.status),
+        ("by_quarter", lambda k: k.quarter),
+        ("by_category", lambda k: k.category or "Uncategorized"),
+    ):
+        result[key] = {}
+        for kpi in kpis:
+            result[key][value(kpi)] = result[key].get(value(kpi), 0) + 1
+
+    departments = sorted({k.user.department or "" for k in kpis})
+    result["by_department"] = [
+        summary(
+            [k for k in kpis if (k.user.department or "") == department],
+            department=department or "Unassigned",
+        )
+        for department in departments
+    ]
+    result["by_objective"] = [
+        summary(
+            [link.kpi for link in objective.kpi_links if link.kpi in kpis],
+            objective_id=objective.id, title=objective.title, level=objective.level,
+        )
+        for objective in objectives
+        if any(link.kpi in kpis for link in objective.kpi_links)
+    ]
+    return result
+
+
+@pytest.fixture
+def data(db):
+    """
+    Ann (Sales) and Bob (Finance) have 2025 KPIs, Cat (no department) has
+    one; Ann also has a 2024 KPI. Two objectives link some of them.
+    """
+    ann = User(email="ann@example.com", username="ann", password_hash="x", department="Sales")
+    bob = User(email="bob@example.com", username="bob", password_hash="x", department="Finance")
+    cat = User(email="cat@example.com", username="cat", password_hash="x", role="admin")
+    db.add_all([ann, bob, cat])
+    db.commit()
+
+    kpis = {}
+    for name, owner, year, quarter, status, category, progress in (
+        ("a1", ann, 2025, "Q1", "approved", "Sales", 100.0),
+        ("a2", ann, 2025, "Q2", "submitted", "Sales", 50.0),
+        ("a3", ann, 2025, "Q2", "draft", None, None),
+        ("b1", bob, 2025, "Q1", "approved", "Finance", 80.0),
+        ("b2", bob, 2025, "Q1", "rejected", None, 10.0),
+        ("c1", cat, 2025, "Q3", "draft", "Finance", 30.0),
+        ("old", ann, 2024, "Q4", "approved", "Sales", 90.0),
+    ):
+        kpis[name] = KPI(
+            user_id=owner.id, year=year, quarter=quarter, title=name, status=status,
+            category=category, progress_percentage=progress,
+        )
+    db.add_all(kpis.values())
+    db.commit()
+
+    objectives = []
+    for title, level, linked in (
+        ("growth", "company", ("a1", "b1", "old")),
+        ("costs", "team", ("b2",)),
+        ("unlinked", "team", ()),
+    ):
+        objective = objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(title=title, level=level, year=2025, owner_id=cat.id),
+            created_by=cat.id,
+        )
+        for name in linked:
+            objective_crud.link_kpi(db, objective_id=objective.id, kpi_id=kpis[name].id)
+        objectives.append(objective)
+    db.expire_all()
+    return {"ann": ann, "bob": bob, "kpis": kpis, "objectives": objectives}
+
+
+def test_known_totals_for_a_year(db, data):
+    analytics = report_service.get_analytics_data(db, year=2025)
+
+    # Progress 100 + 50 + 0 + 80 + 10 + 30 over 6 KPIs, 2 of them approved
+    assert (analytics["total_kpis"], analytics["avg_progress"], analytics["completion_rate"]) == (
+        6, 45.0, 33.33
+    )
+    assert analytics["by_status"] == {"approved": 2, "submitted": 1, "draft": 2, "rejected": 1}
+    assert analytics["by_quarter"] == {"Q1": 3, "Q2": 2, "Q3": 1}
+    assert analytics["by_category"] == {"Sales": 2, "Finance": 2, "Uncategorized": 2}
+    assert analytics["by_department"] == [
+        {"department": "Unassigned", "total_kpis": 1, "avg_progress": 30.0,
+         "completion_rate": 0},
+        {"department": "Finance", "total_kpis": 2, "avg_progress": 45.0,
+         "completion_rate": 50.0},
+        {"department": "Sales", "total_kpis": 3, "avg_progress": 50.0,
+         "completion_rate": 33.33},
+    ]
+    growth, costs, _ = data["objectives"]
+    # The 2024 KPI linked to "growth" is outside the year
+    assert analytics["by_objective"] == [
+        {"objective_id": growth.id, "title": "growth", "level": "company", "total_kpis": 2,
+         "avg_progress": 90.0, "completion_rate": 100.0},
+        {"objective_id": costs.id, "title": "costs", "level": "team", "total_kpis": 1,
+         "avg_progress": 10.0, "completion_rate": 0},
+    ]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"year": 2025},
+    {"year": 2024},
+    {"user": "ann"},
+    {"user": "ann", "year": 2025},
+    {"user": "bob"},
+])
+def test_matches_the_python_aggregation(db, data, filters):
+    user = data[filters.pop("user")] if "user" in filters else None
+    kpis = [
+        kpi for kpi in data["kpis"].values()
+        if (user is None or kpi.user_id == user.id)
+        and filters.get("year") in (None, kpi.year)
+    ]
+
+    analytics = report_service.get_analytics_data(
+        db, user_id=user.id if user else None, **filters
+    )
+
+    assert analytics == python_breakdowns(kpis, data["objectives"])
+
+
+def test_user_path_does_not_read_the_rollup(db, data):
+    # Emptied rollup: the single-user breakdown groups the KPIs directly
+    db.query(KPIRollup).delete()
+    db.commit()
+
+    assert kpi_crud.get_breakdowns(db, user_id=data["bob"].id)["total_kpis"] == 2
+    assert kpi_crud.get_breakdowns(db)["total_kpis"] == 0
+
+
+def test_no_kpis(db):
+    assert report_service.get_analytics_data(db, year=2025) == {
+        "total_kpis": 0, "avg_progress": 0, "completion_rate": 0,
+        "by_status": {}, "by_quarter": {}, "by_category": {},
+        "by_department": [], "by_objective": [],
+    }
@@ -0,0 +1,153 @@
+"""Tests for approving and rejecting many KPIs at once.
+
+Run with: pytest backend/tests/test_bulk_review.py
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.progress_rollup import objective_rollup_queue
+from app.models.kpi import KPI, KPIComment, KPIHistory
+from app.models.notification import Notification
+from app.models.user import User
+from app.schemas.kpi import KPIBulkApprove, KPIBulkReject
+from app.services.kpi import kpi_service
+
+
+@pytest.fixture(autouse=True)
+def no_rollups(monkeypatch):
+    monkeypatch.setattr(objective_rollup_queue, "enqueue", lambda **kwargs: None)
+
+
+@pytest.fixture
+def make_user(db):
+    def user(username, role="employee", department="Sales"):
+        user = User(
+            email=f"{username}@example.com", username=username, password_hash="x",
+            full_name=username.title(), role=role, department=department,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return user
+
+
+@pytest.fixture
+def make_kpi(db):
+    def kpi(owner, status="submitted", title="k"):
+        kpi = KPI(user_id=owner.id, year=2025, quarter="Q1", title=title, status=status)
+        db.add(kpi)
+        db.commit()
+        return kpi
+
+    return kpi
+
+
+def outcome(response):
+    return [(result.success, result.status, result.error) for result in response.results]
+
+
+def statuses(db, *kpis):
+    db.expire_all()
+    return [kpi.status for kpi in kpis]
+
+
+def test_only_submitted_kpis_change(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager")
+    owner = make_user("owner")
+    draft = make_kpi(owner, "draft")
+    submitted = make_kpi(owner)
+    approved = make_kpi(owner, "approved")
+
+    response = kpi_service.bulk_approve_kpis(
+        db, KPIBulkApprove(kpi_ids=[draft.id, submitted.id, approved.id, 999]), manager
+    )
+
+    assert (response.succeeded, response.failed) == (1, 3)
+    assert outcome(response) == [
+        (False, "draft", "Cannot approve KPI in current status"),
+        (True, "approved", None),
+        (False, "approved", "Cannot approve KPI in current status"),
+        (False, None, "KPI not found"),
+    ]
+    assert statuses(db, draft, submitted, approved) == ["draft", "approved", "approved"]
+    assert submitted.approved_by == manager.id and submitted.approved_at is not None
+
+
+def test_history_and_notifications_are_written_per_kpi(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager")
+    owner = make_user("owner")
+    other = make_user("other")
+    kpis = [make_kpi(owner, title="first"), make_kpi(other, title="second")]
+
+    kpi_service.bulk_reject_kpis(
+        db, KPIBulkReject(kpi_ids=[kpi.id for kpi in kpis], reason="Too vague"), manager
+    )
+
+    history = db.query(KPIHistory.kpi_id, KPIHistory.user_id, KPIHistory.action,
+                       KPIHistory.new_value).order_by(KPIHistory.kpi_id).all()
+    assert history == [
+        (kpis[0].id, manager.id, "rejected", "Rejected: Too vague"),
+        (kpis[1].id, manager.id, "rejected", "Rejected: Too vague"),
+    ]
+    assert db.query(KPIComment).count() == 2
+
+    notifications = db.query(Notification).order_by(Notification.user_id).all()
+    assert [(n.user_id, n.type, n.link) for n in notifications] == [
+        (owner.id, "error", f"/kpis/{kpis[0].id}"),
+        (other.id, "error", f"/kpis/{kpis[1].id}"),
+    ]
+    assert notifications[0].message == (
+        'Your KPI "first" has been rejected by Manager. Reason: Too vague'
+    )
+
+
+def test_manager_is_refused_outside_their_department_per_row(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager")
+    own = make_kpi(make_user("owner"))
+    foreign = make_kpi(make_user("stranger", department="Finance"))
+    unassigned = make_kpi(make_user("floater", department=None))
+
+    response = kpi_service.bulk_approve_kpis(
+        db, KPIBulkApprove(kpi_ids=[own.id, foreign.id, unassigned.id]), manager
+    )
+
+    refused = (False, "submitted", "Not authorized to approve KPIs outside your department")
+    assert outcome(response) == [(True, "approved", None), refused, refused]
+    # The refused rows did not stop the rest of the batch from committing
+    assert statuses(db, own, foreign, unassigned) == ["approved", "submitted", "submitted"]
+    assert db.query(KPIHistory.kpi_id).all() == [(own.id,)]
+    assert db.query(Notification).count() == 1
+
+
+def test_admin_reviews_every_department(db, make_user, make_kpi):
+    admin = make_user("admin", role="admin", department=None)
+    kpis = [make_kpi(make_user("a")), make_kpi(make_user("b", department="Finance"))]
+
+    response = kpi_service.bulk_approve_kpis(
+        db, KPIBulkApprove(kpi_ids=[kpi.id for kpi in kpis]), admin
+    )
+
+    assert (response.succeeded, response.failed) == (2, 0)
+
+
+def test_manager_without_a_department_is_refused(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager", department=None)
+    kpi = make_kpi(make_user("owner"))
+
+    with pytest.raises(HTTPException) as exc:
+        kpi_service.bulk_approve_kpis(db, KPIBulkApprove(kpi_ids=[kpi.id]), manager)
+
+    assert exc.value.status_code == 403
+    assert statuses(db, kpi) == ["submitted"]
+
+
+def test_employees_cannot_bulk_review(db, make_user, make_kpi):
+    employee = make_user("employee")
+    kpi = make_kpi(employee)
+
+    with pytest.raises(HTTPException) as exc:
+        kpi_service.bulk_reject_kpis(db, KPIBulkReject(kpi_ids=[kpi.id], reason="no"), employee)
+
+    assert exc.value.status_code == 403
@@ -0,0 +1,110 @@
+"""Tests for the KPI statistics and dashboard endpoints' aggregates.
+
+Run with: pytest backend/tests/test_dashboard_statistics.py
+"""
+
+import pytest
+
+from app.crud.kpi import kpi_crud
+from app.models.kpi import KPI
+from app.models.user import User
+from app.services.kpi import kpi_service
+
+
+@pytest.fixture
+def users(db):
+    users = {
+        "ann": User(email="ann@example.com", username="ann", password_hash="x"),
+        "bob": User(email="bob@example.com", username="bob", password_hash="x"),
+        "manager": User(email="m@example.com", username="manager", password_hash="x",
+                        role="manager"),
+    }
+    db.add_all(users.values())
+    db.commit()
+
+    ann, bob = users["ann"], users["bob"]
+    db.add_all([
+        KPI(user_id=owner.id, year=year, quarter=quarter, title="k", status=status,
+            progress_percentage=progress)
+        for owner, year, quarter, status, progress in (
+            (ann, 2025, "Q1", "draft", 20.0),
+            (ann, 2025, "Q1", "approved", 100.0),
+            (ann, 2025, "Q2", "submitted", None),
+            (bob, 2025, "Q1", "approved", 60.0),
+            (bob, 2025, "Q2", "rejected", 10.0),
+            (bob, 2024, "Q4", "submitted", 50.0),
+        )
+    ])
+    db.commit()
+    return users
+
+
+def counts(stats):
+    return {s: stats[s] for s in ("total_kpis", "draft", "submitted", "approved", "rejected")}
+
+
+def test_overall_statistics(db, users):
+    stats = kpi_crud.get_statistics(db)
+
+    assert counts(stats) == {
+        "total_kpis": 6, "draft": 1, "submitted": 2, "approved": 2, "rejected": 1
+    }
+    # Averaged over the five KPIs with progress: (20 + 100 + 60 + 10 + 50) / 5
+    assert stats["average_progress"] == 48.0
+    assert stats["completion_rate"] == 33.33
+
+
+def test_one_users_statistics(db, users):
+    stats = kpi_crud.get_statistics(db, user_id=users["ann"].id)
+
+    assert counts(stats) == {
+        "total_kpis": 3, "draft": 1, "submitted": 1, "approved": 1, "rejected": 0
+    }
+    assert (stats["average_progress"], stats["completion_rate"]) == (60.0, 33.33)
+
+
+def test_statistics_without_kpis(db):
+    stats = kpi_crud.get_statistics(db)
+
+    assert counts(stats) == dict.fromkeys(
+        ("total_kpis", "draft", "submitted", "approved", "rejected"), 0
+    )
+    assert (stats["average_progress"], stats["completion_rate"]) == (0.0, 0.0)
+
+
+def test_dashboard_breaks_down_by_quarter(db, users):
+    dashboard = kpi_service.get_dashboard_statistics(db, users["manager"])
+
+    assert (dashboard.total_kpis, dashboard.draft, dashboard.pending_approval,
+            dashboard.approved, dashboard.rejected) == (6, 1, 2, 2, 1)
+    assert (dashboard.average_progress, dashboard.completion_rate) == (48.0, 33.33)
+    assert dashboard.my_kpis == 0
+    assert [
+        (q.year, q.quarter, q.total_kpis, q.approved, q.average_progress, q.completion_rate)
+        for q in dashboard.quarterly_stats
+    ] == [
+        (2024, "Q4", 1, 0, 50.0, 0.0),
+        (2025, "Q1", 3, 2, 60.0, 66.67),
+        (2025, "Q2", 2, 0, 10.0, 0.0),
+    ]
+
+
+def test_employees_see_only_their_own_statistics(db, users):
+    ann = users["ann"]
+
+    dashboard = kpi_service.get_dashboard_statistics(db, ann)
+    assert (dashboard.total_kpis, dashboard.my_kpis, dashboard.pending_approval) == (3, 3, 1)
+    assert [(q.quarter, q.total_kpis) for q in dashboard.quarterly_stats] == [("Q1", 2), ("Q2", 1)]
+
+    assert kpi_service.get_statistics(db, ann).total_kpis == 3
+    assert kpi_service.get_statistics(db, users["manager"]).total_kpis == 6
+
+
+def test_statistics_follow_status_changes(db, users):
+    kpi = db.query(KPI).filter(KPI.status == "draft").one()
+    kpi.status = "submitted"
+    kpi.progress_percentage = 40.0
+    db.commit()
+
+    stats = kpi_crud.get_statistics(db)
+    assert (stats["draft"], stats["submitted"], stats["average_progress"]) == (0, 3, 52.0)
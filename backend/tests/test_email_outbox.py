@@ -0,0 +1,261 @@
+"""Tests for the email outbox and its delivery worker.
+
+Emails are delivered to a local aiosmtpd server.
+
+Run with: pytest backend/tests/test_email_outbox.py
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import app.core.email_outbox as email_outbox_module
+from app.core.email_outbox import EmailOutboxWorker
+from app.database import unit_of_work
+from app.models.email_outbox import OutboxEmail
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_service import notification_service
+from app.utils.email import email_service
+
+from conftest import free_port, use_smtp_server
+
+
+@pytest.fixture
+def session_local_modules():
+    # The worker opens its own sessions
+    return [email_outbox_module]
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="owner@example.com",
+        username="owner",
+        password_hash="x",
+        full_name="Owner",
+        role="employee",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def make_worker(**overrides) -> EmailOutboxWorker:
+    options = dict(
+        batch_size=10,
+        poll_interval=60,
+        lease=600,
+        rate=0,
+        max_attempts=3,
+        retry_base=30,
+        retry_max=3600,
+    )
+    options.update(overrides)
+    return EmailOutboxWorker(**options)
+
+
+def queue(worker, db, subject="Hello", to="owner@example.com"):
+    return worker.enqueue(db, to_emails=[to], subject=subject, body_html="<p>Hi</p>", body_text="Hi")
+
+
+def outbox(db):
+    db.expire_all()
+    return db.query(OutboxEmail).order_by(OutboxEmail.id).all()
+
+
+async def test_queued_email_is_delivered(db, smtp_server):
+    worker = make_worker()
+    queue(worker, db)
+
+    assert smtp_server.messages == []
+    assert await worker.process_batch() == 1
+
+    assert [m.rcpt_tos for m in smtp_server.messages] == [["owner@example.com"]]
+    assert b"Subject: Hello" in smtp_server.messages[0].content
+    (message,) = outbox(db)
+    assert message.status == "sent"
+    assert message.attempts == 1
+    assert message.sent_at is not None
+
+
+async def test_email_commits_with_notification(db, user, smtp_server, monkeypatch):
+    monkeypatch.setattr(notification_service, "email_enabled", True)
+    notification = notification_service.create_notification(
+        db,
+        user_id=user.id,
+        title="KPI approved",
+        message="Your KPI was approved",
+        email_template_data={
+            "template": "kpi_approved",
+            "kpi_title": "Revenue",
+            "approver_name": "Boss",
+            "year": 2025,
+            "quarter": "Q1",
+            "link": "http://localhost/kpis/1",
+        },
+    )
+
+    (message,) = outbox(db)
+    assert message.notification_id == notification.id
+    assert message.status == "pending"
+    assert message.subject.endswith("Revenue")
+
+
+async def test_rolled_back_email_is_not_queued(db, user, smtp_server):
+    worker = make_worker()
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            db.add(Notification(user_id=user.id, title="t", message="m", type="info"))
+            queue(worker, db)
+            raise RuntimeError("request failed")
+
+    assert outbox(db) == []
+    assert db.query(Notification).count() == 0
+    assert await worker.process_batch() == 0
+
+
+async def test_disabled_email_is_not_queued(db, monkeypatch):
+    monkeypatch.setattr(email_service, "enabled", False)
+    assert queue(make_worker(), db) is None
+    assert outbox(db) == []
+
+
+async def test_temporary_failure_is_retried_with_backoff(db, smtp_server):
+    worker = make_worker(retry_base=30)
+    smtp_server.replies = ["451 Try again later", "451 Try again later"]
+    queue(worker, db)
+
+    before = utcnow()
+    await worker.process_batch()
+    (message,) = outbox(db)
+    assert message.status == "pending"
+    assert message.attempts == 1
+    assert "451" in message.last_error
+    assert timedelta(seconds=29) < message.next_attempt_at - before < timedelta(seconds=32)
+
+    # Not due yet
+    assert await worker.process_batch() == 0
+
+    message.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+    before = utcnow()
+    await worker.process_batch()
+    (message,) = outbox(db)
+    assert message.attempts == 2
+    assert timedelta(seconds=59) < message.next_attempt_at - before < timedelta(seconds=62)
+
+    message.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+    await worker.process_batch()
+    (message,) = outbox(db)
+    assert message.status == "sent"
+    assert message.attempts == 3
+    assert len(smtp_server.messages) == 1
+
+
+def test_retry_delay_is_capped():
+    worker = make_worker(retry_base=30, retry_max=100)
+    assert [worker.retry_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+async def test_permanent_failure_is_dead_lettered(db, smtp_server):
+    worker = make_worker()
+    smtp_server.replies = ["550 Mailbox unavailable"]
+    queue(worker, db)
+
+    await worker.process_batch()
+
+    (message,) = outbox(db)
+    assert message.status == "dead"
+    assert message.attempts == 1
+    assert "550" in message.last_error
+
+
+async def test_dead_lettered_after_max_attempts(db, monkeypatch):
+    # Nothing listens on this port
+    use_smtp_server(monkeypatch, free_port())
+    worker = make_worker(max_attempts=2)
+    queue(worker, db)
+
+    await worker.process_batch()
+    (message,) = outbox(db)
+    assert message.status == "pending"
+
+    message.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+    await worker.process_batch()
+    (message,) = outbox(db)
+    assert message.status == "dead"
+    assert message.attempts == 2
+
+    message.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert await worker.process_batch() == 0
+
+
+async def test_send_rate_is_limited(db, smtp_server):
+    worker = make_worker(rate=20)
+    for i in range(6):
+        queue(worker, db, subject=f"Message {i}")
+
+    started = time.monotonic()
+    assert await worker.process_batch() == 6
+    elapsed = time.monotonic() - started
+
+    assert len(smtp_server.messages) == 6
+    assert elapsed >= 5 / 20
+
+
+async def test_batches_are_bounded_and_ordered(db, smtp_server):
+    worker = make_worker(batch_size=2)
+    for i in range(5):
+        queue(worker, db, subject=f"Message {i}")
+
+    assert [await worker.process_batch() for _ in range(4)] == [2, 2, 1, 0]
+    subjects = [m.content.split(b"Subject: ")[1].split(b"\r\n")[0] for m in smtp_server.messages]
+    assert subjects == [f"Message {i}".encode() for i in range(5)]
+
+
+async def test_expired_claim_is_delivered_again(db, smtp_server):
+    worker = make_worker()
+    queue(worker, db)
+
+    # A worker claimed the email and died before sending it
+    worker._claim()
+    assert await worker.process_batch() == 0
+    (message,) = outbox(db)
+    assert message.status == "sending"
+
+    message.next_attempt_at = utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert await worker.process_batch() == 1
+    (message,) = outbox(db)
+    assert message.status == "sent"
+    assert message.attempts == 2
+
+
+async def test_worker_wakes_when_email_is_committed(db, user, smtp_server):
+    worker = make_worker(poll_interval=60)
+    worker.start()
+    try:
+        await asyncio.sleep(0.1)  # first (empty) poll
+
+        def request():
+            with unit_of_work(db):
+                db.add(Notification(user_id=user.id, title="t", message="m", type="info"))
+                queue(worker, db)
+
+        await asyncio.to_thread(request)
+        for _ in range(50):
+            if smtp_server.messages:
+                break
+            await asyncio.sleep(0.05)
+        assert len(smtp_server.messages) == 1
+    finally:
+        await worker.stop()
@@ -0,0 +1,164 @@
+"""Tests for the CSV/NDJSON raw data exports.
+
+Run with: pytest backend/tests/test_exports.py
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+import app.services.export_service as export_service_module
+from app.crud.objective import objective_crud
+from app.models.kpi import KPI, KPIHistory
+from app.models.user import User
+from app.schemas.objective import ObjectiveCreate
+from app.services.export_service import export_service
+
+
+@pytest.fixture
+def session_local_modules():
+    # The stream outlives the request and opens its own session
+    return [export_service_module]
+
+
+@pytest.fixture
+def make_user(db):
+    def user(username, role="employee", department="Sales"):
+        user = User(email=f"{username}@example.com", username=username, password_hash="x",
+                    role=role, department=department)
+        db.add(user)
+        db.commit()
+        return user
+
+    return user
+
+
+@pytest.fixture
+def data(db, make_user):
+    """Two employees in different departments, each with a KPI and an objective."""
+    data = {"ann": make_user("ann"), "bob": make_user("bob", department="Finance")}
+    for name in ("ann", "bob"):
+        owner = data[name]
+        kpi = KPI(user_id=owner.id, year=2025, quarter="Q1", title=f"{name} kpi")
+        db.add(kpi)
+        db.commit()
+        db.add(KPIHistory(kpi_id=kpi.id, user_id=owner.id, action="created"))
+        objective = objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(
+                title=f"{name} goal", level="team", year=2025, owner_id=owner.id,
+                department=owner.department,
+            ),
+            created_by=owner.id,
+        )
+        objective_crud.link_kpi(db, objective_id=objective.id, kpi_id=kpi.id)
+        data[f"{name} kpi"], data[f"{name} goal"] = kpi, objective
+    return data
+
+
+def export(dataset, user, fmt="csv", **filters):
+    """The export as a list of chunks, as the response streams it."""
+    query = export_service.build_query(dataset, user, **filters)
+    return list(export_service.stream(query, fmt))
+
+
+def csv_rows(chunks):
+    return list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+
+def test_csv_starts_with_the_header_row(data):
+    chunks = export("kpis", data["ann"])
+
+    header = csv_rows(chunks[:1])
+    assert header == [["id", "user_id", "template_id", "year", "quarter", "title",
+                       "description", "category", "target_value", "current_value",
+                       "target_numeric", "current_numeric", "unit", "direction",
+                       "progress_percentage", "measurement_method", "external_key",
+                       "status", "created_at", "updated_at", "submitted_at",
+                       "approved_at", "approved_by"]]
+    row = dict(zip(header[0], csv_rows(chunks)[1]))
+    assert (row["title"], row["description"]) == ("ann kpi", "")
+    assert row["created_at"] == data["ann kpi"].created_at.isoformat()
+
+
+def test_header_is_sent_even_without_rows(data):
+    assert len(csv_rows(export("kpis", data["ann"], year=2030))) == 1
+
+
+def test_csv_escapes_separators_quotes_and_newlines(db, data):
+    title = 'Revenue, "net"\nper quarter'
+    data["ann kpi"].title = title
+    db.commit()
+
+    rows = csv_rows(export("kpis", data["ann"]))
+    assert rows[1][rows[0].index("title")] == title
+
+
+def test_ndjson_is_one_object_per_line(db, data):
+    data["ann kpi"].title = 'Ünïcode "quoted"\nline'
+    db.commit()
+
+    lines = b"".join(export("kpis", data["ann"], "ndjson")).decode("utf-8").splitlines()
+
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["title"] == 'Ünïcode "quoted"\nline'
+    assert record["description"] is None
+    assert record["created_at"] == data["ann kpi"].created_at.isoformat()
+
+
+def test_rows_are_streamed_in_batches(data, make_user, monkeypatch):
+    monkeypatch.setattr(export_service, "BATCH_SIZE", 1)
+    admin = make_user("admin", role="admin", department=None)
+
+    # One chunk per batch of one row, after the CSV header
+    assert len(export("kpis", admin, "ndjson")) == 2
+    assert len(export("kpis", admin)) == 3
+
+
+def test_employees_export_only_their_own_data(data):
+    ann, bob = data["ann"], data["bob"]
+
+    def ids(dataset, column, **filters):
+        rows = csv_rows(export(dataset, ann, **filters))
+        return [int(row[rows[0].index(column)]) for row in rows[1:]]
+
+    # Asking for someone else's data is ignored
+    assert ids("kpis", "user_id", user_id=bob.id) == [ann.id]
+    assert ids("objectives", "owner_id", user_id=bob.id) == [ann.id]
+    assert ids("objective-kpi-links", "kpi_id") == [data["ann kpi"].id]
+    assert ids("kpi-history", "kpi_id") == [data["ann kpi"].id]
+
+
+def test_managers_export_all_kpis_and_their_departments_objectives(data, make_user):
+    manager = make_user("manager", role="manager")
+
+    kpis = csv_rows(export("kpis", manager))
+    assert [row[kpis[0].index("title")] for row in kpis[1:]] == ["ann kpi", "bob kpi"]
+
+    objectives = csv_rows(export("objectives", manager))
+    assert [row[objectives[0].index("title")] for row in objectives[1:]] == ["ann goal"]
+
+
+def test_objectives_come_parents_first(db, data, make_user):
+    admin = make_user("admin", role="admin", department=None)
+    parent = data["ann goal"]
+    child = objective_crud.create(
+        db,
+        obj_in=ObjectiveCreate(title="child", level="team", year=2025, owner_id=admin.id,
+                               parent_id=parent.id),
+        created_by=admin.id,
+    )
+    objective_crud.create(
+        db,
+        obj_in=ObjectiveCreate(title="grandchild", level="team", year=2025, owner_id=admin.id,
+                               parent_id=child.id),
+        created_by=admin.id,
+    )
+
+    rows = csv_rows(export("objectives", admin))
+    assert [row[rows[0].index("title")] for row in rows[1:]] == [
+        "ann goal", "child", "grandchild", "bob goal"
+    ]
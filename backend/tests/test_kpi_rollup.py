@@ -0,0 +1,102 @@
+"""Tests for the trigger-maintained KPI rollup and its rebuild.
+
+Run with: pytest backend/tests/test_kpi_rollup.py
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.crud.kpi_rollup import kpi_rollup_crud
+from app.models.kpi import KPI
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    users = [
+        User(email="a@example.com", username="a", password_hash="x", department="Sales"),
+        User(email="b@example.com", username="b", password_hash="x"),
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def add_kpi(db, user, **fields):
+    fields = {"year": 2025, "quarter": "Q1", "title": "k", "status": "draft", **fields}
+    kpi = KPI(user_id=user.id, **fields)
+    db.add(kpi)
+    db.commit()
+    return kpi
+
+
+def rollup(db):
+    """Rollup rows keyed by (department, category, status)."""
+    return {
+        (department, category, status): (count, progress_sum, progress_count)
+        for department, category, status, count, progress_sum, progress_count in db.execute(text(
+            "SELECT department, category, status, kpi_count, progress_sum, progress_count "
+            "FROM kpi_rollups"
+        ))
+    }
+
+
+def test_rollup_follows_kpi_changes(db, users):
+    alice, bob = users
+    first = add_kpi(db, alice, category="Finance", progress_percentage=40.0)
+    add_kpi(db, alice, category="Finance", progress_percentage=20.0)
+    add_kpi(db, bob)
+    assert rollup(db) == {
+        ("Sales", "Finance", "draft"): (2, 60.0, 2),
+        ("", "", "draft"): (1, 0.0, 0),
+    }
+
+    first.status = "submitted"
+    db.commit()
+    first.category = "Growth"
+    first.progress_percentage = 70.0
+    db.commit()
+    assert rollup(db) == {
+        ("Sales", "Finance", "draft"): (1, 20.0, 1),
+        ("Sales", "Growth", "submitted"): (1, 70.0, 1),
+        ("", "", "draft"): (1, 0.0, 0),
+    }
+
+    db.delete(first)
+    db.commit()
+    assert ("Sales", "Growth", "submitted") not in rollup(db)
+    assert kpi_rollup_crud.rebuild(db) == {"groups": 2, "drifted": 0}
+
+
+def test_rollup_follows_department_changes_and_user_deletes(db, users):
+    alice, bob = users
+    add_kpi(db, alice, progress_percentage=50.0)
+    add_kpi(db, bob, progress_percentage=30.0)
+
+    alice.department = "IT"
+    db.commit()
+    assert rollup(db) == {
+        ("IT", "", "draft"): (1, 50.0, 1),
+        ("", "", "draft"): (1, 30.0, 1),
+    }
+
+    db.execute(text("DELETE FROM users WHERE id = :id"), {"id": alice.id})
+    db.commit()
+    assert rollup(db) == {("", "", "draft"): (1, 30.0, 1)}
+    assert kpi_rollup_crud.rebuild(db) == {"groups": 1, "drifted": 0}
+
+
+def test_rebuild_repairs_drift(db, users):
+    alice, _ = users
+    add_kpi(db, alice, progress_percentage=50.0)
+    db.execute(text("UPDATE kpi_rollups SET kpi_count = 9"))
+    db.execute(text("DROP TRIGGER kpis_rollup_ai"))
+    db.commit()
+    add_kpi(db, alice, quarter="Q2")
+
+    assert kpi_rollup_crud.rebuild(db) == {"groups": 2, "drifted": 2}
+    assert kpi_rollup_crud.rebuild(db) == {"groups": 2, "drifted": 0}
+
+    # The missing trigger is recreated
+    add_kpi(db, alice, quarter="Q3")
+    assert kpi_rollup_crud.rebuild(db) == {"groups": 3, "drifted": 0}
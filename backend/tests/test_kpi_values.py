@@ -0,0 +1,136 @@
+"""Tests for bulk KPI measurements and uploads, and which current values they may change.
+
+Run with: pytest backend/tests/test_kpi_values.py
+"""
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.v1.kpis import _read_body
+from app.core.progress_rollup import objective_rollup_queue
+from app.models.kpi import KPI, KPIMeasurement
+from app.models.user import User
+from app.schemas.kpi import KPIMeasurementBulkCreate
+from app.services.kpi import kpi_service
+
+
+@pytest.fixture(autouse=True)
+def no_rollups(monkeypatch):
+    # Objective rollups are not under test
+    monkeypatch.setattr(objective_rollup_queue, "enqueue", lambda **kwargs: None)
+
+
+@pytest.fixture
+def users(db):
+    owner = User(email="owner@example.com", username="owner", password_hash="x")
+    manager = User(email="boss@example.com", username="boss", password_hash="x", role="manager")
+    db.add_all([owner, manager])
+    db.commit()
+    return owner, manager
+
+
+@pytest.fixture
+def kpis(db, users):
+    """One KPI of the owner's in each status."""
+    owner, _ = users
+    kpis = {
+        status: KPI(
+            user_id=owner.id, year=2025, quarter="Q1", title=status, status=status,
+            target_value="100", target_numeric=100.0, current_value="10", current_numeric=10.0,
+        )
+        for status in ("draft", "rejected", "submitted", "approved")
+    }
+    db.add_all(kpis.values())
+    db.commit()
+    return kpis
+
+
+def current_values(db, kpis):
+    db.expire_all()
+    return {status: kpi.current_numeric for status, kpi in kpis.items()}
+
+
+def test_measurements_only_move_editable_current_values(db, users, kpis):
+    owner, _ = users
+    response = kpi_service.ingest_measurements(
+        db,
+        KPIMeasurementBulkCreate(measurements=[
+            {"kpi_id": kpi.id, "value": 50} for kpi in kpis.values()
+        ]),
+        owner,
+    )
+
+    assert (response.inserted, response.kpis_updated) == (4, 2)
+    assert current_values(db, kpis) == {
+        "draft": 50.0, "rejected": 50.0, "submitted": 10.0, "approved": 10.0,
+    }
+    assert kpis["draft"].progress_percentage == 50.0
+    # Locked KPIs still get the measurement
+    assert db.query(KPIMeasurement).count() == 4
+
+
+def test_managers_record_but_do_not_change_others_values(db, users, kpis):
+    _, manager = users
+    response = kpi_service.ingest_measurements(
+        db,
+        KPIMeasurementBulkCreate(measurements=[{"kpi_id": kpis["draft"].id, "value": 50}]),
+        manager,
+    )
+
+    assert (response.inserted, response.kpis_updated) == (1, 0)
+    assert current_values(db, kpis)["draft"] == 10.0
+
+
+def test_ingest_rejects_rows_the_caller_cannot_edit(db, users, kpis):
+    owner, manager = users
+    content = "\n".join(
+        f'{{"kpi_id": {kpi.id}, "value": 50}}' for kpi in kpis.values()
+    )
+    response = kpi_service.ingest_values(db, content=content, fmt="jsonl", current_user=owner)
+
+    assert (response.applied, response.rejected, response.kpis_updated) == (2, 2, 2)
+    assert [reject.error for reject in response.rejects] == [
+        "Cannot edit KPI with status: submitted", "Cannot edit KPI with status: approved",
+    ]
+    assert current_values(db, kpis) == {
+        "draft": 50.0, "rejected": 50.0, "submitted": 10.0, "approved": 10.0,
+    }
+
+    response = kpi_service.ingest_values(
+        db, content=f'{{"kpi_id": {kpis["draft"].id}, "value": 70}}', fmt="jsonl",
+        current_user=manager,
+    )
+    assert (response.applied, response.rejected) == (0, 1)
+    assert response.rejects[0].error == "Not authorized to update this KPI"
+    assert current_values(db, kpis)["draft"] == 50.0
+
+
+def upload(chunks, content_length=None):
+    """A request whose body arrives in ``chunks``; records how many were read."""
+    received = []
+
+    async def receive():
+        received.append(1)
+        more = len(received) < len(chunks)
+        return {"type": "http.request", "body": chunks[len(received) - 1], "more_body": more}
+
+    headers = [(b"content-length", str(content_length).encode())] if content_length else []
+    return Request({"type": "http", "headers": headers}, receive), received
+
+
+async def test_upload_size_is_capped_while_reading():
+    request, received = upload([b"12345", b"67890"])
+    assert await _read_body(request, 10) == b"1234567890"
+
+    # Oversized by its Content-Length: refused before reading
+    request, received = upload([b"12345"], content_length=11)
+    with pytest.raises(HTTPException) as exc:
+        await _read_body(request, 10)
+    assert (exc.value.status_code, received) == (413, [])
+
+    # Chunked or understated: cut off at the chunk that passes the limit
+    request, received = upload([b"123456", b"789012", b"345678"], content_length=6)
+    with pytest.raises(HTTPException) as exc:
+        await _read_body(request, 10)
+    assert (exc.value.status_code, len(received)) == (413, 2)
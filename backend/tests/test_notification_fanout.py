@@ -0,0 +1,92 @@
+"""Tests for bulk notification fan-out and broadcasts.
+
+Run with: pytest backend/tests/test_notification_fanout.py
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.models.email_outbox import OutboxEmail
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notification_service import notification_service
+from app.utils.email import email_service
+
+
+@pytest.fixture(autouse=True)
+def email_enabled(monkeypatch):
+    monkeypatch.setattr(email_service, "enabled", True)
+    monkeypatch.setattr(notification_service, "email_enabled", True)
+
+
+def add_user(db, name, **fields):
+    user = User(email=f"{name}@example.com", username=name, password_hash="x", **fields)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def notified(db):
+    db.expire_all()
+    return sorted(n.user_id for n in db.query(Notification))
+
+
+def emailed(db):
+    return sorted(json.loads(m.recipients)[0] for m in db.query(OutboxEmail))
+
+
+def test_kpi_submitted_fans_out_in_one_insert(db, engine):
+    submitter = add_user(db, "owner")
+    admin = add_user(db, "admin", role="admin")
+    manager = add_user(db, "manager", role="manager")
+    opted_out = add_user(db, "optout", role="manager", notify_kpi_submitted=False)
+    no_email = add_user(db, "noemail", role="manager", email_notifications=False)
+    add_user(db, "inactive", role="manager", is_active=False)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    count = notification_service.notify_kpi_submitted(
+        db, kpi_id=1, kpi_title="Revenue", submitter=submitter, year=2025, quarter="Q1"
+    )
+
+    assert count == 3
+    assert notified(db) == [admin.id, manager.id, no_email.id]
+    assert opted_out.id not in notified(db)
+    assert emailed(db) == ["admin@example.com", "manager@example.com"]
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert [s.split()[2] for s in inserts] == ["notifications", "email_outbox"]
+
+
+def test_mentions_skip_commenter_duplicates_and_opted_out(db):
+    commenter = add_user(db, "commenter")
+    alice = add_user(db, "alice")
+    bob = add_user(db, "bob", notify_comment_mention=False)
+
+    count = notification_service.notify_comment_mentions(
+        db, kpi_id=1, kpi_title="Revenue",
+        mentioned_user_ids=[alice.id, alice.id, bob.id, commenter.id, 9999],
+        commenter=commenter, comment_text="@alice @bob",
+    )
+
+    assert count == 1
+    assert notified(db) == [alice.id]
+    assert emailed(db) == ["alice@example.com"]
+
+
+def test_broadcast_by_department_and_role(db):
+    sales = [add_user(db, f"sales{i}", department="Sales") for i in range(3)]
+    add_user(db, "it", department="IT")
+    sales_manager = add_user(db, "salesmgr", department="Sales", role="manager")
+
+    assert notification_service.broadcast(
+        db, title="All hands", message="Friday", department="Sales", roles=["employee"]
+    ) == 3
+    assert notified(db) == [u.id for u in sales]
+    # No email template, no emails
+    assert emailed(db) == []
+
+    notification_service.broadcast(db, title="Managers", message="Sync", roles=["manager"])
+    assert sales_manager.id in notified(db)
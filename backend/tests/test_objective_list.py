@@ -0,0 +1,158 @@
+"""Tests for the objective list with owner, parent and count details.
+
+Run with: pytest backend/tests/test_objective_list.py
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.api.v1.objectives import list_objectives
+from app.crud.objective import objective_crud
+from app.models.kpi import KPI
+from app.models.user import User
+from app.schemas.objective import ObjectiveCreate
+
+
+@pytest.fixture
+def users(db):
+    users = {
+        "ann": User(email="ann@example.com", username="ann", password_hash="x",
+                    full_name="Ann Smith", department="Sales"),
+        "bob": User(email="bob@example.com", username="bob", password_hash="x",
+                    department="Finance"),
+        "admin": User(email="admin@example.com", username="admin", password_hash="x",
+                      role="admin"),
+        "manager": User(email="manager@example.com", username="manager", password_hash="x",
+                        role="manager", department="Sales"),
+    }
+    db.add_all(users.values())
+    db.commit()
+    return users
+
+
+@pytest.fixture
+def tree(db, users):
+    """
+    company (ann) → unit (ann) → team a (bob), team b (ann, 2024);
+    company has two KPIs linked, unit one.
+    """
+    ann, bob = users["ann"], users["bob"]
+    nodes = {}
+    for name, owner, level, year, parent in (
+        ("company", ann, "company", 2025, None),
+        ("unit", ann, "unit", 2025, "company"),
+        ("team a", bob, "team", 2025, "unit"),
+        ("team b", ann, "team", 2024, "unit"),
+    ):
+        nodes[name] = objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(
+                title=name, level=level, year=year, owner_id=owner.id,
+                department=owner.department, parent_id=nodes[parent].id if parent else None,
+            ),
+            created_by=owner.id,
+        )
+    for name, links in (("company", 2), ("unit", 1)):
+        for _ in range(links):
+            kpi = KPI(user_id=ann.id, year=2025, quarter="Q1", title="k")
+            db.add(kpi)
+            db.commit()
+            objective_crud.link_kpi(db, objective_id=nodes[name].id, kpi_id=kpi.id)
+    return nodes
+
+
+def details(rows):
+    """{title: (owner name, parent title, children, KPIs)} of detail rows."""
+    return {
+        objective.title: (owner_name, parent_title, children, kpis)
+        for objective, owner_name, parent_title, children, kpis in rows
+    }
+
+
+def test_rows_carry_owner_parent_and_counts(db, tree):
+    rows, next_cursor = objective_crud.get_multi_with_details(db)
+
+    assert next_cursor is None
+    assert details(rows) == {
+        "company": ("Ann Smith", None, 1, 2),
+        "unit": ("Ann Smith", "company", 2, 1),
+        # Falls back to the username without a full name
+        "team a": ("bob", "unit", 0, 0),
+        "team b": ("Ann Smith", "unit", 0, 0),
+    }
+
+
+def test_page_is_a_single_query(db, engine, tree):
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    rows, _ = objective_crud.get_multi_with_details(db, year=2025)
+
+    assert len(rows) == 3
+    assert len(statements) == 1
+
+
+def test_filters_apply_to_rows_and_count(db, users, tree):
+    for filters, titles in (
+        ({}, {"company", "unit", "team a", "team b"}),
+        ({"year": 2025}, {"company", "unit", "team a"}),
+        ({"owner_id": users["ann"].id, "year": 2025}, {"company", "unit"}),
+        ({"level": "team"}, {"team a", "team b"}),
+        ({"department": "Finance"}, {"team a"}),
+        ({"status": "completed"}, set()),
+    ):
+        rows, _ = objective_crud.get_multi_with_details(db, **filters)
+        assert set(details(rows)) == titles
+        assert objective_crud.count(db, **filters) == len(titles)
+
+
+def test_pages_follow_the_cursor(db, tree):
+    rows, next_cursor = objective_crud.get_multi_with_details(db, limit=3)
+    assert len(rows) == 3 and next_cursor
+
+    rest, next_cursor = objective_crud.get_multi_with_details(db, limit=3, cursor=next_cursor)
+    assert len(rest) == 1 and next_cursor is None
+    assert set(details(rows + rest)) == {"company", "unit", "team a", "team b"}
+
+
+def list_as(db, user, **params):
+    """Call the list endpoint with its query defaults."""
+    params = {
+        "skip": 0, "limit": 100, "owner_id": None, "level": None, "year": None,
+        "quarter": None, "status": None, "department": None, "cursor": None,
+        "include_total": True, **params,
+    }
+    return list_objectives(**params, db=db, current_user=user)
+
+
+def test_total_respects_the_filters_not_the_page(db, users, tree):
+    response = list_as(db, users["admin"], year=2025, limit=2)
+
+    assert (response.total, response.total_pages, len(response.items)) == (3, 2, 2)
+    assert response.next_cursor
+    company = next(item for item in list_as(db, users["admin"]).items
+                   if item.title == "company")
+    assert (company.owner_name, company.children_count, company.kpi_count) == (
+        "Ann Smith", 1, 2
+    )
+
+
+def test_total_can_be_skipped(db, users, tree):
+    response = list_as(db, users["admin"], include_total=False)
+
+    assert (response.total, response.total_pages, len(response.items)) == (None, None, 4)
+
+
+def test_role_scoping_applies_to_the_total(db, users, tree):
+    # Employees see their own objectives, managers their department's
+    for user, total in ((users["bob"], 1), (users["manager"], 3), (users["admin"], 4)):
+        response = list_as(db, user)
+        assert response.total == len(response.items) == total
+
+    # An employee asking for someone else's objectives still gets their own
+    response = list_as(db, users["bob"], owner_id=users["ann"].id)
+    assert [item.title for item in response.items] == ["team a"]
+    assert response.total == 1
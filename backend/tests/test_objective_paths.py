@@ -0,0 +1,109 @@
+"""Tests for the materialized paths of the objective hierarchy.
+
+Run with: pytest backend/tests/test_objective_paths.py
+"""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.api.v1.objectives import delete_objective, move_objective
+from app.core.progress_rollup import objective_rollup_queue
+from app.crud.objective import objective_crud
+from app.models.objective import Objective
+from app.models.user import User
+from app.schemas.objective import ObjectiveCreate
+
+
+@pytest.fixture(autouse=True)
+def no_rollups(monkeypatch):
+    # Progress rollups are not under test
+    monkeypatch.setattr(objective_rollup_queue, "enqueue", lambda **kwargs: None)
+
+
+@pytest.fixture
+def admin(db):
+    admin = User(email="admin@example.com", username="admin", password_hash="x", role="admin")
+    db.add(admin)
+    db.commit()
+    return admin
+
+
+@pytest.fixture
+def tree(db, admin):
+    """company → (unit → division → team), company → other unit."""
+    nodes = {}
+    for name, level, parent in (
+        ("company", "company", None),
+        ("unit", "unit", "company"),
+        ("division", "division", "unit"),
+        ("team", "team", "division"),
+        ("other", "unit", "company"),
+    ):
+        nodes[name] = objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(
+                title=name, level=level, year=2025, owner_id=admin.id,
+                parent_id=nodes[parent].id if parent else None,
+            ),
+            created_by=admin.id,
+        )
+    return nodes
+
+
+def paths(db):
+    db.expire_all()
+    return {o.title: o.path for o in db.query(Objective)}
+
+
+def path_of(*nodes):
+    return "/" + "".join(f"{node.id}/" for node in nodes)
+
+
+def test_moving_a_subtree_rewrites_its_paths(db, admin, tree):
+    company, unit, division, team, other = tree.values()
+    move_objective(unit.id, new_parent_id=other.id, db=db, current_user=admin)
+
+    assert paths(db) == {
+        "company": path_of(company),
+        "other": path_of(company, other),
+        "unit": path_of(company, other, unit),
+        "division": path_of(company, other, unit, division),
+        "team": path_of(company, other, unit, division, team),
+    }
+    assert [a.title for a in objective_crud.get_ancestors(db, team.id)] == [
+        "company", "other", "unit", "division",
+    ]
+    assert [d.title for d in objective_crud.get_descendants(db, other.id)] == [
+        "unit", "division", "team",
+    ]
+
+
+@pytest.mark.parametrize("target, error", [
+    ("team", "Cannot create circular reference"),
+    ("unit", "Cannot move objective to itself"),
+])
+def test_moves_into_own_subtree_are_rejected(db, admin, tree, target, error):
+    before = paths(db)
+    with pytest.raises(HTTPException) as exc:
+        move_objective(tree["unit"].id, new_parent_id=tree[target].id, db=db, current_user=admin)
+
+    assert (exc.value.status_code, exc.value.detail) == (400, error)
+    assert paths(db) == before
+
+
+def test_deleting_removes_the_whole_subtree(db, admin, tree):
+    company, unit, _, _, other = tree.values()
+    delete_objective(unit.id, db=db, current_user=admin)
+
+    assert paths(db) == {"company": path_of(company), "other": path_of(company, other)}
+
+
+def test_rebuild_paths_repairs_missing_and_stale_paths(db, tree):
+    expected = paths(db)
+    db.execute(text("UPDATE objectives SET path = NULL WHERE title IN ('company', 'team')"))
+    db.execute(text("UPDATE objectives SET path = '/999/' WHERE title = 'division'"))
+    db.commit()
+
+    assert objective_crud.rebuild_paths(db) == 5
+    assert paths(db) == expected
@@ -0,0 +1,128 @@
+"""Tests for the batched, bottom-up objective progress rollup.
+
+Run with: pytest backend/tests/test_objective_rollup.py
+"""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.crud.objective import objective_crud
+from app.database import unit_of_work
+from app.models.kpi import KPI
+from app.models.user import User
+from app.schemas.objective import ObjectiveCreate
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x", role="admin")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def make_objective(db, user):
+    """Create an objective, under ``parent`` if given."""
+
+    def objective(title, parent=None, year=2025, level="team"):
+        return objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(
+                title=title, level=level, year=year, owner_id=user.id,
+                parent_id=parent.id if parent else None,
+            ),
+            created_by=user.id,
+        )
+
+    return objective
+
+
+@pytest.fixture
+def make_kpi(db, user):
+    """Create a KPI linked to ``objectives``."""
+
+    def kpi(progress, *objectives, weight=1.0):
+        kpi = KPI(user_id=user.id, year=2025, quarter="Q1", title="k", progress_percentage=progress)
+        db.add(kpi)
+        db.commit()
+        for objective in objectives:
+            objective_crud.link_kpi(db, objective_id=objective.id, kpi_id=kpi.id, weight=weight)
+        return kpi
+
+    return kpi
+
+
+def progress(db, *objectives):
+    db.expire_all()
+    return [objective.progress_percentage for objective in objectives]
+
+
+def test_kpi_change_rolls_up_through_every_level(db, make_objective, make_kpi):
+    company = make_objective("company", level="company")
+    unit = make_objective("unit", company, level="unit")
+    team_a = make_objective("team a", unit)
+    team_b = make_objective("team b", unit)
+    other = make_objective("other", company, level="unit")
+    kpi = make_kpi(40.0, team_a)
+    make_kpi(80.0, team_b)
+    make_kpi(10.0, other)
+    objective_crud.rollup_year(db, 2025)
+    assert progress(db, team_a, team_b, unit, other, company) == [40.0, 80.0, 60.0, 10.0, 35.0]
+
+    kpi.progress_percentage = 100.0
+    db.commit()
+    changed = objective_crud.rollup_progress(db, kpi_ids=[kpi.id])
+
+    # Children are final before their parents are computed
+    assert changed == {team_a.id: 100.0, unit.id: 90.0, company.id: 50.0}
+    assert progress(db, team_a, unit, company, other) == [100.0, 90.0, 50.0, 10.0]
+
+
+def test_links_are_weighted(db, make_objective, make_kpi):
+    objective = make_objective("weighted")
+    make_kpi(100.0, objective, weight=3.0)
+    make_kpi(0.0, objective, weight=1.0)
+    make_kpi(None, objective, weight=0.0)
+
+    assert objective_crud.rollup_progress(db, objective_ids=[objective.id]) == {objective.id: 75.0}
+
+
+def test_changes_are_written_in_one_executemany(db, engine, make_objective, make_kpi):
+    company = make_objective("company", level="company")
+    teams = [make_objective(f"team {i}", company) for i in range(3)]
+    kpi = make_kpi(30.0, *teams)
+
+    updates = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany:
+            statement.startswith("UPDATE") and updates.append((executemany, len(parameters))),
+    )
+    assert len(objective_crud.rollup_progress(db, kpi_ids=[kpi.id])) == 4
+    assert updates == [(True, 4)]
+
+
+def test_year_mode_repairs_drift_in_that_year_only(db, make_objective, make_kpi):
+    company = make_objective("company", level="company")
+    team = make_objective("team", company)
+    make_kpi(50.0, team)
+    earlier = make_objective("earlier", year=2024)
+    make_kpi(20.0, earlier)
+    db.execute(text("UPDATE objectives SET progress_percentage = 7"))
+    db.commit()
+
+    assert objective_crud.rollup_year(db, 2025) == {team.id: 50.0, company.id: 50.0}
+    assert progress(db, team, company, earlier) == [50.0, 50.0, 7.0]
+
+
+def test_rollup_joins_a_unit_of_work(db, make_objective, make_kpi):
+    objective = make_objective("team")
+    make_kpi(50.0, objective)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            objective_crud.rollup_progress(db, objective_ids=[objective.id])
+            raise RuntimeError("rolled back")
+
+    assert progress(db, objective) == [0.0]
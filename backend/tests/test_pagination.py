@@ -0,0 +1,87 @@
+"""Tests for keyset (cursor) pagination.
+
+Run with: pytest backend/tests/test_pagination.py
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.models.kpi import KPI
+from app.models.user import User
+from app.services.kpi import kpi_service
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x", role="admin")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def kpis(db, user):
+    """Seven KPIs; several share a created_at, stored with and without microseconds."""
+    created = [
+        datetime(2025, 1, 1, 9, 0, 0),
+        datetime(2025, 1, 1, 9, 0, 0),
+        datetime(2025, 1, 1, 9, 0, 0, 500000),
+        datetime(2025, 1, 2, 9, 0, 0),
+        datetime(2025, 1, 2, 9, 0, 0),
+        datetime(2025, 1, 2, 9, 0, 0),
+        datetime(2025, 1, 3, 9, 0, 0),
+    ]
+    kpis = [
+        KPI(user_id=user.id, year=2025, quarter="Q1", title=f"KPI {i}", created_at=moment)
+        for i, moment in enumerate(created)
+    ]
+    db.add_all(kpis)
+    db.commit()
+    # As a server default stores it: no microseconds
+    db.execute(text(
+        "UPDATE kpis SET created_at = '2025-01-02 09:00:00' WHERE created_at LIKE '2025-01-02%'"
+    ))
+    db.commit()
+    return kpis
+
+
+def all_pages(db, limit):
+    pages, cursor = [], None
+    while True:
+        items, cursor = keyset_paginate(
+            db.query(KPI), ts_column=KPI.created_at, id_column=KPI.id, cursor=cursor, limit=limit
+        )
+        pages.append([kpi.id for kpi in items])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_pages_cover_every_row_once_newest_first(db, kpis, limit):
+    pages = all_pages(db, limit)
+    ids = [kpi_id for page in pages for kpi_id in page]
+
+    # Ties on created_at are broken by id, descending
+    assert ids == [kpis[i].id for i in (6, 5, 4, 3, 2, 1, 0)]
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_skip_without_cursor_matches_cursor_pages(db, kpis):
+    items, cursor = keyset_paginate(
+        db.query(KPI), ts_column=KPI.created_at, id_column=KPI.id, skip=2, limit=2
+    )
+
+    assert [kpi.id for kpi in items] == all_pages(db, 2)[1]
+    assert decode_cursor(cursor) == ("2025-01-02 09:00:00", kpis[3].id)
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor(None, 1)[:-2], "WyJ4IiwieSJd"])
+def test_invalid_cursor_is_a_bad_request(db, user, kpis, cursor):
+    with pytest.raises(HTTPException) as exc:
+        kpi_service.get_kpis(db, user, cursor=cursor)
+
+    assert (exc.value.status_code, exc.value.detail) == (400, "Invalid cursor")
@@ -0,0 +1,189 @@
+"""Tests for the debounced objective rollup queue and the writes that feed it.
+
+Run with: pytest backend/tests/test_progress_rollup_queue.py
+"""
+
+import threading
+import time
+
+import pytest
+
+import app.core.progress_rollup as progress_rollup_module
+from app.api.v1.objectives import delete_objective, move_objective, update_objective
+from app.core.progress_rollup import ObjectiveRollupQueue, objective_rollup_queue
+from app.crud.objective import objective_crud
+from app.models.kpi import KPI
+from app.models.user import User
+from app.schemas.kpi import KPIUpdate
+from app.schemas.objective import ObjectiveCreate, ObjectiveUpdate
+from app.services.kpi import kpi_service
+
+
+@pytest.fixture
+def session_local_modules():
+    # flush() opens its own session
+    return [progress_rollup_module]
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    objective_rollup_queue._drain()
+    yield
+    objective_rollup_queue._drain()
+
+
+class Recorder:
+    """Stands in for objective_crud.rollup_progress, recording each batch."""
+
+    def __init__(self):
+        self.calls = []
+        self.called = threading.Event()
+
+    def __call__(self, db, *, objective_ids, kpi_ids):
+        self.calls.append((time.monotonic(), set(objective_ids), set(kpi_ids)))
+        self.called.set()
+        return {}
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(objective_crud, "rollup_progress", recorder)
+    return recorder
+
+
+@pytest.fixture
+def worker():
+    queues = []
+
+    def start(debounce, max_delay):
+        queue = ObjectiveRollupQueue(debounce=debounce, max_delay=max_delay)
+        queue.start()
+        queues.append(queue)
+        return queue
+
+    yield start
+    for queue in queues:
+        queue.stop()
+
+
+def test_burst_is_rolled_up_once_after_it_goes_quiet(session_factory, recorder, worker):
+    queue = worker(debounce=0.2, max_delay=5)
+    for kpi_id in (1, 2, 3):
+        queue.enqueue(kpi_ids=[kpi_id])
+        time.sleep(0.02)
+    queue.enqueue(objective_ids=[7])
+
+    assert recorder.called.wait(2)
+    time.sleep(0.3)
+    assert [(objective_ids, kpi_ids) for _, objective_ids, kpi_ids in recorder.calls] == [
+        ({7}, {1, 2, 3}),
+    ]
+
+
+def test_steady_stream_is_rolled_up_after_max_delay(session_factory, recorder, worker):
+    queue = worker(debounce=1.0, max_delay=0.2)
+    started = time.monotonic()
+    while time.monotonic() - started < 0.8:
+        queue.enqueue(kpi_ids=[1])
+        time.sleep(0.05)
+
+    # The debounce never ran out, but max_delay bounded the wait
+    assert recorder.calls
+    assert recorder.calls[0][0] - started < 0.6
+
+
+def test_flush_runs_pending_ids_synchronously(session_factory, recorder):
+    objective_rollup_queue.enqueue(kpi_ids=[1, 2])
+    objective_rollup_queue.enqueue(kpi_ids=[2], objective_ids=[5])
+
+    objective_rollup_queue.flush()
+    assert [(objective_ids, kpi_ids) for _, objective_ids, kpi_ids in recorder.calls] == [
+        ({5}, {1, 2}),
+    ]
+    assert objective_rollup_queue.flush() == {}
+    assert len(recorder.calls) == 1
+
+
+@pytest.fixture
+def admin(db):
+    admin = User(email="admin@example.com", username="admin", password_hash="x", role="admin")
+    db.add(admin)
+    db.commit()
+    return admin
+
+
+@pytest.fixture
+def tree(db, admin):
+    """
+    company → unit a → (team a: KPI at 80%, sibling: KPI at 40%),
+    company → unit b → team b: KPI at 20%.
+    """
+    nodes = {}
+    for name, level, parent in (
+        ("company", "company", None),
+        ("unit a", "unit", "company"),
+        ("unit b", "unit", "company"),
+        ("team a", "team", "unit a"),
+        ("team b", "team", "unit b"),
+        ("sibling", "team", "unit a"),
+    ):
+        nodes[name] = objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(
+                title=name, level=level, year=2025, owner_id=admin.id,
+                parent_id=nodes[parent].id if parent else None,
+            ),
+            created_by=admin.id,
+        )
+    for name, progress in (("team a", 80.0), ("team b", 20.0), ("sibling", 40.0)):
+        kpi = KPI(
+            user_id=admin.id, year=2025, quarter="Q1", title=name, progress_percentage=progress
+        )
+        db.add(kpi)
+        db.commit()
+        objective_crud.link_kpi(db, objective_id=nodes[name].id, kpi_id=kpi.id)
+        nodes[f"{name} kpi"] = kpi
+    objective_crud.rollup_year(db, 2025)
+    return nodes
+
+
+def progress(db, tree, *names):
+    db.expire_all()
+    return [tree[name].progress_percentage for name in names]
+
+
+def test_tree_starts_rolled_up(db, tree):
+    # unit a averages team a and sibling; company averages the units
+    assert progress(db, tree, "unit a", "unit b", "company") == [60.0, 20.0, 40.0]
+
+
+def test_kpi_progress_change_reaches_the_ancestors(db, admin, tree):
+    kpi_service.update_kpi(db, tree["team a kpi"].id, KPIUpdate(progress_percentage=100.0), admin)
+    assert progress(db, tree, "unit a", "company") == [60.0, 40.0]
+
+    objective_rollup_queue.flush()
+    assert progress(db, tree, "team a", "unit a", "company") == [100.0, 70.0, 45.0]
+
+
+def test_move_refreshes_old_and_new_ancestors(db, admin, tree):
+    move_objective(tree["team a"].id, new_parent_id=tree["unit b"].id, db=db, current_user=admin)
+    objective_rollup_queue.flush()
+
+    assert progress(db, tree, "unit a", "unit b", "company") == [40.0, 50.0, 45.0]
+
+
+def test_reparent_through_update_refreshes_old_and_new_ancestors(db, admin, tree):
+    update_objective(
+        tree["team a"].id, ObjectiveUpdate(parent_id=tree["unit b"].id), db=db, current_user=admin
+    )
+    objective_rollup_queue.flush()
+
+    assert progress(db, tree, "unit a", "unit b", "company") == [40.0, 50.0, 45.0]
+
+
+def test_delete_refreshes_the_ancestors(db, admin, tree):
+    delete_objective(tree["team a"].id, db=db, current_user=admin)
+    objective_rollup_queue.flush()
+
+    assert progress(db, tree, "unit a", "company") == [40.0, 30.0]
@@ -0,0 +1,210 @@
+"""Tests for background report jobs and their endpoints.
+
+Run with: pytest backend/tests/test_report_jobs.py
+"""
+
+import json
+import os
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+
+import app.core.report_jobs as report_jobs_module
+from app.api.v1.analytics import download_report_job, get_report_job
+from app.config import settings
+from app.core.report_jobs import ReportJobQueue, render_report_job, report_job_queue
+from app.crud.report_job import report_job_crud
+from app.models.kpi import KPI
+from app.models.report_job import ReportJob
+from app.models.user import User
+from app.services.report_service import report_service
+from app.utils.report_cache import report_cache
+
+
+@pytest.fixture
+def session_local_modules():
+    # Workers and the queue open their own sessions
+    return [report_jobs_module]
+
+
+@pytest.fixture(autouse=True)
+def report_directories(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(report_cache, "directory", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def submitted(monkeypatch):
+    """Job ids handed to the process pool, which is not started in tests."""
+    job_ids = []
+    monkeypatch.setattr(report_job_queue, "submit", job_ids.append)
+    return job_ids
+
+
+@pytest.fixture
+def make_user(db):
+    def user(username, role="employee"):
+        user = User(email=f"{username}@example.com", username=username, password_hash="x",
+                    role=role)
+        db.add(user)
+        db.commit()
+        return user
+
+    return user
+
+
+@pytest.fixture
+def employee(db, make_user):
+    employee = make_user("employee")
+    db.add(KPI(user_id=employee.id, year=2025, quarter="Q1", title="Revenue"))
+    db.commit()
+    return employee
+
+
+def submit(db, user, report_type="excel", **params):
+    job, _ = report_service.submit_report_job(
+        db, report_type=report_type, current_user=user, year=2025, **params
+    )
+    return job
+
+
+def render(db, job):
+    """Run the job as a worker would, in its own session."""
+    render_report_job(job.id)
+    db.expire_all()
+
+
+def reload(db, job):
+    db.expire_all()
+    return db.get(ReportJob, job.id)
+
+
+def test_job_is_queued_then_rendered(db, employee, submitted):
+    job = submit(db, employee)
+    assert (job.status, job.progress) == ("queued", 0)
+    assert submitted == [job.id]
+    # Employees are limited to their own KPIs
+    assert json.loads(job.params)["user_id"] == employee.id
+
+    render(db, job)
+
+    job = reload(db, job)
+    assert (job.status, job.progress, job.error) == ("completed", 100, None)
+    assert job.started_at is not None and job.finished_at is not None
+    assert job.expires_at > job.finished_at
+    assert job.file_path == os.path.join(settings.REPORT_DIR, f"{job.id}.xlsx")
+    assert job.file_name == "kpi_report_2025_all.xlsx"
+    assert job.file_size == os.path.getsize(job.file_path)
+    assert not os.path.exists(f"{job.file_path}.part")
+    with zipfile.ZipFile(job.file_path) as workbook:
+        assert "Revenue" in "".join(
+            workbook.read(name).decode("utf-8") for name in workbook.namelist()
+        )
+
+
+def test_identical_requests_share_the_active_job(db, employee, submitted):
+    job = submit(db, employee)
+    assert submit(db, employee).id == job.id
+    assert submit(db, employee, report_type="pdf").id != job.id
+    assert len(submitted) == 2
+
+
+def test_rendering_error_fails_the_job(db, employee, monkeypatch):
+    job = submit(db, employee)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(report_service, "get_report_file", broken)
+    render(db, job)
+
+    job = reload(db, job)
+    assert (job.status, job.error) == ("failed", "renderer crashed")
+    assert job.file_path is None and job.expires_at is not None
+    # A new request is no longer joined to the failed job
+    assert submit(db, employee).id != job.id
+
+
+def test_job_that_is_no_longer_queued_is_skipped(db, employee):
+    job = submit(db, employee)
+    report_job_crud.start(db, job.id)
+
+    render(db, job)
+
+    assert reload(db, job).status == "running"
+    assert not os.path.exists(settings.REPORT_DIR)
+
+
+def test_job_that_never_ran_is_failed(db, employee):
+    job = submit(db, employee)
+    future = Future()
+    future.cancel()
+
+    report_job_queue._on_done(job.id, future)
+
+    job = reload(db, job)
+    assert (job.status, job.error) == ("failed", "Cancelled by server shutdown")
+
+
+def test_start_fails_jobs_left_running_by_a_previous_run(db, employee, make_user):
+    running, queued = submit(db, employee), submit(db, employee, report_type="pdf")
+    report_job_crud.start(db, running.id)
+    finished = submit(db, make_user("other"))
+    render(db, finished)
+
+    queue = ReportJobQueue(max_workers=1, max_pending=1)
+    queue.start()
+    queue.stop()
+
+    for job in (running, queued):
+        job = reload(db, job)
+        assert (job.status, job.error) == ("failed", "Interrupted by server restart")
+    assert reload(db, finished).status == "completed"
+
+
+def test_download_of_a_finished_job(db, employee):
+    job = submit(db, employee)
+    render(db, job)
+
+    response = download_report_job(job.id, db=db, current_user=employee)
+
+    assert response.path == reload(db, job).file_path
+    assert response.filename == "kpi_report_2025_all.xlsx"
+
+
+def test_download_before_the_job_finishes_is_refused(db, employee):
+    job = submit(db, employee)
+
+    with pytest.raises(HTTPException) as exc:
+        download_report_job(job.id, db=db, current_user=employee)
+
+    assert exc.value.status_code == 409
+
+
+def test_download_after_the_file_is_removed_is_gone(db, employee):
+    job = submit(db, employee)
+    render(db, job)
+    os.remove(reload(db, job).file_path)
+
+    with pytest.raises(HTTPException) as exc:
+        download_report_job(job.id, db=db, current_user=employee)
+
+    assert exc.value.status_code == 410
+
+
+def test_employees_only_see_their_own_jobs(db, employee, make_user):
+    job = submit(db, employee)
+    render(db, job)
+    manager = make_user("manager", role="manager")
+
+    assert get_report_job(job.id, db=db, current_user=manager).id == job.id
+    for endpoint in (get_report_job, download_report_job):
+        with pytest.raises(HTTPException) as exc:
+            endpoint(job.id, db=db, current_user=make_user(f"other_{endpoint.__name__}"))
+        assert exc.value.status_code == 404
+
+    with pytest.raises(HTTPException) as exc:
+        get_report_job("missing", db=db, current_user=manager)
+    assert exc.value.status_code == 404
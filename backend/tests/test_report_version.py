@@ -0,0 +1,62 @@
+"""Tests for report cache keys (and so ETags) following every data change.
+
+Run with: pytest backend/tests/test_report_version.py
+"""
+
+import zipfile
+
+import pytest
+
+from app.models.kpi import KPI
+from app.models.user import User
+from app.services.report_service import report_service
+from app.utils.report_cache import report_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "directory", str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def kpi(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x", role="admin")
+    db.add(user)
+    db.commit()
+    kpi = KPI(user_id=user.id, year=2025, quarter="Q1", title="Old title", status="draft")
+    db.add(kpi)
+    db.commit()
+    return kpi
+
+
+def download(db, requester, report_type="excel"):
+    """Cache key and workbook text of a report, as the download endpoint gets them."""
+    key = report_service.get_report_version(db, report_type=report_type, requester=requester)
+    with report_service.get_report_file(
+        db, report_type=report_type, requester=requester, cache_key=key
+    ) as report, zipfile.ZipFile(report) as workbook:
+        text = "".join(workbook.read(name).decode("utf-8") for name in workbook.namelist())
+    return key, text
+
+
+def test_edit_in_the_same_second_changes_the_download(db, kpi):
+    key, text = download(db, kpi.user)
+    assert "Old title" in text
+    assert download(db, kpi.user)[0] == key
+
+    # Well within updated_at's one-second resolution
+    kpi.title = "New title"
+    db.commit()
+
+    new_key, text = download(db, kpi.user)
+    assert new_key != key
+    assert "New title" in text and "Old title" not in text
+
+
+def test_pdf_key_follows_the_header_user(db, kpi):
+    user = kpi.user
+    key = report_service.get_report_version(db, report_type="pdf", requester=user)
+
+    user.department = "Sales"
+    db.commit()
+    assert report_service.get_report_version(db, report_type="pdf", requester=user) != key
@@ -0,0 +1,233 @@
+"""Tests for opening a new KPI period by rolling KPIs over in bulk.
+
+Run with: pytest backend/tests/test_rollover.py
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.progress_rollup import objective_rollup_queue
+from app.crud.objective import objective_crud
+from app.models.kpi import KPI, KPIHistory, KPITemplate
+from app.models.objective import ObjectiveKPILink
+from app.models.user import User
+from app.schemas.kpi import KPIRollover
+from app.schemas.objective import ObjectiveCreate
+from app.services.kpi import kpi_service
+
+
+@pytest.fixture(autouse=True)
+def enqueued(monkeypatch):
+    """Objective ids queued for a rollup."""
+    enqueued = []
+    monkeypatch.setattr(
+        objective_rollup_queue, "enqueue",
+        lambda objective_ids=(), **kwargs: enqueued.extend(objective_ids),
+    )
+    return enqueued
+
+
+@pytest.fixture
+def make_user(db):
+    def user(username, role="employee", department="Sales"):
+        user = User(
+            email=f"{username}@example.com", username=username, password_hash="x",
+            role=role, department=department,
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    return user
+
+
+@pytest.fixture
+def admin(make_user):
+    return make_user("admin", role="admin", department=None)
+
+
+@pytest.fixture
+def make_objective(db, admin):
+    def objective(title="goal"):
+        return objective_crud.create(
+            db,
+            obj_in=ObjectiveCreate(title=title, level="team", year=2025, owner_id=admin.id),
+            created_by=admin.id,
+        )
+
+    return objective
+
+
+@pytest.fixture
+def make_kpi(db):
+    def kpi(owner, title, quarter="Q1", **values):
+        kpi = KPI(user_id=owner.id, year=2025, quarter=quarter, title=title, **values)
+        db.add(kpi)
+        db.commit()
+        return kpi
+
+    return kpi
+
+
+def rollover(db, user, **data):
+    return kpi_service.rollover_kpis(
+        db, KPIRollover(year=2025, quarter="Q2", **data), user
+    )
+
+
+def created(db, quarter="Q2"):
+    """(owner, title) of the KPIs in a period."""
+    return sorted(
+        db.query(KPI.user_id, KPI.title).filter(KPI.year == 2025, KPI.quarter == quarter).all()
+    )
+
+
+def test_clones_the_previous_period(db, admin, make_user, make_kpi):
+    owner = make_user("owner")
+    source = make_kpi(
+        owner, "Revenue", description="d", category="sales", target_value="1,000 EUR",
+        target_numeric=1000.0, unit="EUR", direction="higher", status="approved",
+        current_value="900 EUR", progress_percentage=90.0,
+    )
+
+    response = rollover(db, admin)
+
+    assert (response.source_year, response.source_quarter) == (2025, "Q1")
+    assert response.kpis_created == 1
+    clone = db.query(KPI).filter(KPI.quarter == "Q2").one()
+    assert (clone.user_id, clone.title, clone.description, clone.category) == (
+        owner.id, "Revenue", "d", "sales"
+    )
+    assert (clone.target_value, clone.target_numeric, clone.unit, clone.direction) == (
+        "1,000 EUR", 1000.0, "EUR", "higher"
+    )
+    # A fresh draft: status and progress are not carried over
+    assert clone.status == "draft"
+    assert clone.current_value is None and not clone.progress_percentage
+    assert clone.id != source.id
+    assert db.query(KPIHistory.kpi_id, KPIHistory.action).all() == [(clone.id, "created")]
+
+
+def test_clones_active_templates_for_the_users_role(db, admin, make_user):
+    employee = make_user("employee")
+    manager = make_user("manager", role="manager")
+    db.add_all([
+        KPITemplate(name="Everyone", category="general"),
+        KPITemplate(name="Managers", category="general", role="manager"),
+        KPITemplate(name="Retired", category="general", is_active=False),
+        KPITemplate(name="Other category", category="finance"),
+    ])
+    db.commit()
+
+    response = rollover(db, admin, source="templates", categories=["general"])
+
+    assert response.kpis_created == 4  # including the admin's own "Everyone"
+    assert created(db) == sorted([
+        (admin.id, "Everyone"),
+        (employee.id, "Everyone"),
+        (manager.id, "Everyone"),
+        (manager.id, "Managers"),
+    ])
+    assert all(kpi.template.name == kpi.title for kpi in db.query(KPI))
+
+
+def test_dry_run_writes_nothing(db, admin, make_user, make_objective, make_kpi):
+    owner = make_user("owner")
+    objective = make_objective()
+    source = make_kpi(owner, "Revenue")
+    objective_crud.link_kpi(db, objective_id=objective.id, kpi_id=source.id)
+
+    response = rollover(db, admin, dry_run=True)
+
+    assert (response.kpis_created, response.links_created) == (1, 1)
+    assert [(item.user_id, item.title, item.source_kpi_id) for item in response.items] == [
+        (owner.id, "Revenue", source.id)
+    ]
+    assert created(db) == []
+    assert db.query(KPIHistory).count() == 0
+    assert db.query(ObjectiveKPILink).count() == 1
+
+
+def test_existing_kpis_in_the_target_period_are_skipped(db, admin, make_user, make_kpi):
+    owner = make_user("owner")
+    make_kpi(owner, "Revenue")
+    make_kpi(owner, "Churn")
+    make_kpi(owner, "Revenue", quarter="Q2", status="submitted")
+
+    assert rollover(db, admin).kpis_created == 1
+    assert created(db) == sorted([(owner.id, "Churn"), (owner.id, "Revenue")])
+
+    # Rerunning is safe
+    assert rollover(db, admin).kpis_created == 0
+    assert len(created(db)) == 2
+
+
+def test_objective_links_and_external_key_are_copied(
+    db, admin, make_user, make_objective, make_kpi, enqueued
+):
+    owner = make_user("owner")
+    goals = [make_objective("first"), make_objective("second")]
+    source = make_kpi(owner, "Revenue", external_key="crm-revenue")
+    for goal, weight in zip(goals, (0.25, 0.75)):
+        objective_crud.link_kpi(db, objective_id=goal.id, kpi_id=source.id, weight=weight)
+    taken = make_kpi(owner, "Churn", external_key="crm-churn")
+    make_kpi(make_user("other"), "Churn", quarter="Q2", external_key="crm-churn")
+
+    response = rollover(db, admin)
+
+    assert (response.kpis_created, response.links_created) == (2, 2)
+    clones = {
+        kpi.title: kpi
+        for kpi in db.query(KPI).filter(KPI.quarter == "Q2", KPI.user_id == owner.id)
+    }
+    assert clones["Revenue"].external_key == "crm-revenue"
+    # Already used in the target period, so not copied
+    assert clones["Churn"].external_key is None and taken.external_key == "crm-churn"
+    links = db.query(ObjectiveKPILink.objective_id, ObjectiveKPILink.weight).filter(
+        ObjectiveKPILink.kpi_id == clones["Revenue"].id
+    ).order_by(ObjectiveKPILink.objective_id).all()
+    assert links == [(goals[0].id, 0.25), (goals[1].id, 0.75)]
+    assert sorted(enqueued) == [goal.id for goal in goals]
+
+
+def test_links_are_not_copied_when_disabled(db, admin, make_user, make_objective, make_kpi):
+    objective = make_objective()
+    source = make_kpi(make_user("owner"), "Revenue")
+    objective_crud.link_kpi(db, objective_id=objective.id, kpi_id=source.id)
+
+    response = rollover(db, admin, copy_links=False)
+
+    assert (response.kpis_created, response.links_created) == (1, 0)
+    assert db.query(ObjectiveKPILink).count() == 1
+
+
+def test_manager_rolls_over_their_own_department_only(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager")
+    own = make_user("own")
+    make_kpi(own, "Revenue")
+    make_kpi(make_user("stranger", department="Finance"), "Revenue")
+
+    assert rollover(db, manager).kpis_created == 1
+    assert created(db) == [(own.id, "Revenue")]
+
+    with pytest.raises(HTTPException) as exc:
+        rollover(db, manager, department="Finance")
+    assert exc.value.status_code == 403
+
+
+def test_manager_without_a_department_is_refused(db, make_user, make_kpi):
+    manager = make_user("manager", role="manager", department=None)
+    make_kpi(make_user("owner"), "Revenue")
+
+    with pytest.raises(HTTPException) as exc:
+        rollover(db, manager)
+
+    assert exc.value.status_code == 403
+    assert created(db) == []
+
+
+def test_employees_cannot_roll_over(db, make_user):
+    with pytest.raises(HTTPException) as exc:
+        rollover(db, make_user("employee"))
+
+    assert exc.value.status_code == 403
@@ -0,0 +1,28 @@
+"""Tests for full-text search results.
+
+Run with: pytest backend/tests/test_search.py
+"""
+
+import pytest
+
+from app.crud.search import search_crud
+from app.models.kpi import KPI
+from app.models.user import User
+
+
+def test_snippet_escapes_text_and_marks_matches(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x")
+    db.add(user)
+    db.commit()
+    db.add(KPI(
+        user_id=user.id, year=2025, quarter="Q1", title="<b>Sales</b> & growth",
+        description='<img src=x onerror="alert(1)"> revenue',
+    ))
+    db.commit()
+
+    [result] = search_crud.search(db, term="revenue")
+
+    assert result["title"] == "<b>Sales</b> & growth"
+    assert result["snippet"] == (
+        "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>revenue</mark>"
+    )
@@ -0,0 +1,127 @@
+"""Tests for the pooled SMTP transport.
+
+Run with: pytest backend/tests/test_smtp_pool.py
+"""
+
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from app.utils.email import SMTPPool, email_service
+
+def messages(count):
+    return [
+        email_service.build_message(["owner@example.com"], f"Message {i}", "<p>Hi</p>", "Hi")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def pool():
+    pool = SMTPPool(email_service._connect, max_size=2, idle_timeout=60, check_interval=60)
+    yield pool
+    await pool.close()
+
+
+async def test_batch_uses_one_connection(pool, smtp_server):
+    assert await pool.send_batch(messages(5)) == [None] * 5
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+
+
+async def test_connection_is_reused_across_batches(pool, smtp_server):
+    await pool.send_batch(messages(2))
+    await email_service.send_email_async(["owner@example.com"], "Single", "<p>Hi</p>")
+    await pool.send_batch(messages(2))
+
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 2  # this pool's and email_service's own
+    assert pool.idle == 1
+
+
+async def test_rejected_message_keeps_the_connection(pool, smtp_server):
+    smtp_server.replies = ["550 Mailbox unavailable"]
+
+    results = await pool.send_batch(messages(3))
+
+    assert results[0].code == 550
+    assert results[1:] == [None, None]
+    assert smtp_server.connections == 1
+
+
+async def test_idle_connections_expire(smtp_server):
+    pool = SMTPPool(email_service._connect, max_size=2, idle_timeout=0.05, check_interval=60)
+    await pool.send_batch(messages(1))
+    assert pool.idle == 1
+
+    await asyncio.sleep(0.1)
+    await pool.prune()
+    assert pool.idle == 0
+
+    await pool.send_batch(messages(1))
+    assert smtp_server.connections == 2
+    await pool.close()
+
+
+async def test_connection_closed_by_server_is_replaced(pool, smtp_server):
+    await pool.send_batch(messages(1))
+
+    # The server drops the idle connection
+    server = smtp_server.sessions[0]
+    server.loop.call_soon_threadsafe(server.transport.close)
+    await asyncio.sleep(0.1)
+
+    assert await pool.send_batch(messages(1)) == [None]
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.connections == 2
+
+
+async def test_send_on_stale_connection_is_retried(pool, smtp_server):
+    await pool.send_batch(messages(1))
+
+    # The server closed the connection but the client has not noticed yet
+    stale = pool._idle[0][0]
+
+    async def disconnected(*args, **kwargs):
+        stale.close()
+        raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+
+    stale.send_message = disconnected
+
+    assert await pool.send_batch(messages(1)) == [None]
+    assert len(smtp_server.messages) == 2
+    assert smtp_server.connections == 2
+
+
+async def test_failed_health_check_replaces_connection(smtp_server):
+    pool = SMTPPool(email_service._connect, max_size=2, idle_timeout=60, check_interval=0)
+    await pool.send_batch(messages(1))
+
+    async def broken_noop(*args, **kwargs):
+        raise aiosmtplib.SMTPServerDisconnected("Connection lost")
+
+    pool._idle[0][0].noop = broken_noop
+
+    assert await pool.send_batch(messages(1)) == [None]
+    assert smtp_server.connections == 2
+    await pool.close()
+
+
+async def test_sessions_are_limited(smtp_server):
+    pool = SMTPPool(email_service._connect, max_size=1, idle_timeout=60, check_interval=60)
+    order = []
+
+    async def send(name):
+        async with pool.session() as session:
+            order.append(f"{name} start")
+            await session.send(messages(1)[0])
+            await asyncio.sleep(0.05)
+            order.append(f"{name} end")
+
+    await asyncio.gather(send("a"), send("b"))
+
+    assert order == ["a start", "a end", "b start", "b end"]
+    assert smtp_server.connections == 1
+    await pool.close()
@@ -0,0 +1,79 @@
+"""Tests for unit_of_work and commit_or_flush.
+
+Run with: pytest backend/tests/test_unit_of_work.py
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.crud.notification import notification_crud
+from app.database import commit_or_flush, unit_of_work
+from app.models.notification import Notification
+from app.models.user import User
+
+
+@pytest.fixture
+def commits(db):
+    """Number of commits on the session so far."""
+    count = []
+    event.listen(db, "after_commit", lambda session: count.append(1))
+    return count
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def stored(session_factory):
+    """Notifications visible to another connection, i.e. committed."""
+    other = session_factory()
+    try:
+        return other.query(Notification).count()
+    finally:
+        other.close()
+
+
+def test_crud_calls_flush_inside_and_commit_once_on_exit(db, session_factory, user, commits):
+    with unit_of_work(db):
+        first = notification_crud.create(db, user_id=user.id, title="a", message="m")
+        with unit_of_work(db):
+            notification_crud.create(db, user_id=user.id, title="b", message="m")
+        notification_crud.create_many(db, notifications=[
+            {"user_id": user.id, "title": "c", "message": "m"},
+        ])
+
+        # Flushed (ids assigned) but not committed
+        assert first.id is not None
+        assert commits == []
+        assert stored(session_factory) == 0
+
+    assert len(commits) == 1
+    assert stored(session_factory) == 3
+
+
+def test_exception_rolls_back_every_write(db, session_factory, user, commits):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            notification_crud.create(db, user_id=user.id, title="a", message="m")
+            with unit_of_work(db):
+                notification_crud.create(db, user_id=user.id, title="b", message="m")
+            raise RuntimeError("failed")
+
+    assert commits == []
+    assert db.query(Notification).count() == stored(session_factory) == 0
+    assert not db.info.get("unit_of_work")
+
+
+def test_commit_or_flush_commits_outside_a_unit_of_work(db, session_factory, user, commits):
+    notification = Notification(user_id=user.id, title="a", message="m")
+    db.add(notification)
+    commit_or_flush(db, notification)
+
+    assert len(commits) == 1
+    assert stored(session_factory) == 1
+    # Refreshed after the commit, so server defaults are loaded
+    assert notification.created_at is not None
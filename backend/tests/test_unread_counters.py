@@ -0,0 +1,98 @@
+"""Tests for the trigger-maintained unread notification counters.
+
+Run with: pytest backend/tests/test_unread_counters.py
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.crud.notification import notification_crud
+from app.database import unit_of_work
+from app.models.notification import Notification
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    users = [User(email=f"u{i}@example.com", username=f"u{i}", password_hash="x") for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def unread(db, user):
+    return notification_crud.count_unread(db, user_id=user.id)
+
+
+def actual_unread(db, user):
+    return db.query(Notification).filter(
+        Notification.user_id == user.id, Notification.is_read == False
+    ).count()
+
+
+def test_counter_follows_every_write_path(db, users):
+    alice, bob = users
+    first = notification_crud.create(db, user_id=alice.id, title="t", message="m")
+    notification_crud.create_many(db, notifications=[
+        {"user_id": alice.id, "title": "t", "message": "m"},
+        {"user_id": alice.id, "title": "t", "message": "m"},
+        {"user_id": bob.id, "title": "t", "message": "m"},
+    ])
+    assert (unread(db, alice), unread(db, bob)) == (3, 1)
+
+    notification_crud.mark_as_read(db, notification_id=first.id)
+    notification_crud.mark_as_read(db, notification_id=first.id)
+    assert unread(db, alice) == 2
+
+    notification_crud.delete(db, notification_id=first.id)  # already read
+    assert unread(db, alice) == 2
+
+    notification_crud.mark_all_as_read(db, user_id=alice.id)
+    assert unread(db, alice) == 0
+
+    db.execute(text("UPDATE notifications SET user_id = :bob"), {"bob": bob.id})
+    db.execute(text("UPDATE notifications SET is_read = 0"))
+    db.commit()
+    assert (unread(db, alice), unread(db, bob)) == (0, 3) == (
+        actual_unread(db, alice), actual_unread(db, bob)
+    )
+
+    # The user's counter and notifications go together
+    bob_id = bob.id
+    db.execute(text("DELETE FROM users WHERE id = :bob"), {"bob": bob_id})
+    db.commit()
+    assert notification_crud.count_unread(db, user_id=bob_id) == 0
+    assert db.execute(text("SELECT count(*) FROM notification_counters")).scalar() == 1
+
+
+def test_reconcile_repairs_drift(db, users):
+    alice, bob = users
+    notification_crud.create(db, user_id=alice.id, title="t", message="m")
+    notification_crud.create(db, user_id=bob.id, title="t", message="m")
+    assert notification_crud.reconcile_unread_counts(db) == {"users": 2, "drifted": 0}
+
+    db.execute(text("UPDATE notification_counters SET unread = 7"))
+    db.execute(text("DROP TRIGGER notifications_unread_ai"))
+    db.commit()
+    notification_crud.create(db, user_id=alice.id, title="t", message="m")
+
+    assert notification_crud.reconcile_unread_counts(db) == {"users": 2, "drifted": 2}
+    assert (unread(db, alice), unread(db, bob)) == (2, 1)
+
+    # The missing trigger is recreated
+    notification_crud.create(db, user_id=alice.id, title="t", message="m")
+    assert unread(db, alice) == 3
+
+
+def test_reconcile_joins_a_unit_of_work(db, users):
+    alice, _ = users
+    notification_crud.create(db, user_id=alice.id, title="t", message="m")
+    db.execute(text("UPDATE notification_counters SET unread = 7"))
+    db.commit()
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            assert notification_crud.reconcile_unread_counts(db)["drifted"] == 1
+            raise RuntimeError("rolled back")
+
+    assert db.execute(text("SELECT unread FROM notification_counters")).scalar() == 7
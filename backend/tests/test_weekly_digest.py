@@ -0,0 +1,151 @@
+"""Tests for the weekly digest run and its checkpoints.
+
+Digests are queued on the email outbox; nothing is delivered.
+
+Run with: pytest backend/tests/test_weekly_digest.py
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import app.core.weekly_digest as weekly_digest_module
+from app.config import settings
+from app.core.email_outbox import email_outbox_worker
+from app.core.weekly_digest import run_weekly_digest
+from app.models.digest import DigestRun
+from app.models.email_outbox import OutboxEmail
+from app.models.kpi import KPI, KPIComment, KPIHistory
+from app.models.objective import Objective
+from app.models.user import User
+from app.utils.email import email_service
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.fixture
+def session_local_modules():
+    return [weekly_digest_module]
+
+
+@pytest.fixture(autouse=True)
+def digest_settings(monkeypatch):
+    monkeypatch.setattr(email_service, "enabled", True)
+    monkeypatch.setattr(settings, "DIGEST_BATCH_SIZE", 2)
+
+
+@pytest.fixture
+def users(db):
+    """A manager and five employees, each with a submitted KPI the manager commented on."""
+    manager = User(email="boss@example.com", username="boss", password_hash="x", role="manager")
+    db.add(manager)
+    db.flush()
+    employees = []
+    for i in range(5):
+        user = User(email=f"user{i}@example.com", username=f"user{i}", password_hash="x")
+        db.add(user)
+        db.flush()
+        kpi = KPI(
+            user_id=user.id, year=utcnow().year, quarter="Q1", title=f"KPI {i}",
+            status="submitted", progress_percentage=20.0 * i,
+        )
+        db.add(kpi)
+        db.flush()
+        db.add(KPIHistory(kpi_id=kpi.id, user_id=user.id, action="submitted"))
+        db.add(KPIComment(kpi_id=kpi.id, user_id=manager.id, comment="Looks good"))
+        employees.append(user)
+    db.add(User(email="quiet@example.com", username="quiet", password_hash="x", weekly_digest=False))
+    db.commit()
+    return manager, employees
+
+
+def recipients(db):
+    db.expire_all()
+    return [json.loads(m.recipients)[0] for m in db.query(OutboxEmail).order_by(OutboxEmail.id)]
+
+
+def test_digest_is_queued_for_active_users(db, users):
+    manager, employees = users
+    result = run_weekly_digest(now=utcnow() + timedelta(seconds=1))
+
+    assert result["emails_queued"] == 6
+    assert recipients(db) == [manager.email] + [u.email for u in employees]
+    body = db.query(OutboxEmail).filter(OutboxEmail.recipients.contains("user3")).one().body_text
+    assert "Status Changes: 1" in body
+    assert "New Comments: 1" in body
+    assert "Average Progress: 60.0%" in body
+    assert db.query(DigestRun).one().status == "completed"
+
+
+def test_interrupted_run_resumes_without_duplicates(db, users, monkeypatch):
+    enqueue_many = email_outbox_worker.enqueue_many
+    calls = []
+
+    def failing(session, messages):
+        calls.append(len(messages))
+        if len(calls) == 2:
+            raise RuntimeError("process died")
+        return enqueue_many(session, messages)
+
+    monkeypatch.setattr(email_outbox_worker, "enqueue_many", failing)
+    with pytest.raises(RuntimeError):
+        run_weekly_digest(now=utcnow() + timedelta(seconds=1))
+
+    run = db.query(DigestRun).one()
+    assert (run.status, run.emails_queued) == ("running", 2)
+    assert len(recipients(db)) == 2
+
+    monkeypatch.setattr(email_outbox_worker, "enqueue_many", enqueue_many)
+    assert run_weekly_digest(resume_only=True) == {"run_id": run.id, "emails_queued": 4}
+
+    sent = recipients(db)
+    assert len(sent) == len(set(sent)) == 6
+    db.expire_all()
+    assert db.query(DigestRun).one().status == "completed"
+
+
+def test_leased_run_is_not_resumed(db, users):
+    db.add(DigestRun(
+        period_start=utcnow() - timedelta(days=7), period_end=utcnow(),
+        lease_until=utcnow() + timedelta(minutes=5),
+    ))
+    db.commit()
+
+    assert run_weekly_digest() == {}
+    assert recipients(db) == []
+
+
+def test_objective_progress_is_reported_as_change_since_last_run(db, users):
+    manager, _ = users
+    objective = Objective(
+        title="Grow revenue", level="company", owner_id=manager.id, year=utcnow().year,
+        progress_percentage=40.0, created_by=manager.id,
+    )
+    db.add(objective)
+    db.commit()
+    now = utcnow() + timedelta(seconds=1)
+    run_weekly_digest(now=now)
+
+    # Too soon for the next digest
+    assert run_weekly_digest(now=now + timedelta(days=2)) == {}
+
+    objective.progress_percentage = 55.0
+    db.commit()
+    run_weekly_digest(now=now + timedelta(days=7))
+
+    db.expire_all()
+    bodies = [
+        m.body_text for m in db.query(OutboxEmail)
+        .filter(OutboxEmail.recipients.contains("boss")).order_by(OutboxEmail.id)
+    ]
+    assert "Grow revenue: 40.0% (+40)" in bodies[0]
+    assert "Grow revenue: 55.0% (+15)" in bodies[1]
+
+
+def test_dashboard_link_falls_back_without_cors_origins(db, users, monkeypatch):
+    monkeypatch.setattr(settings, "CORS_ORIGINS", [])
+    run_weekly_digest(now=utcnow() + timedelta(seconds=1))
+
+    assert all("http://localhost/dashboard" in m.body_html for m in db.query(OutboxEmail))
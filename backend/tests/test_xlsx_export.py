@@ -0,0 +1,73 @@
+"""Tests for the streaming (constant_memory) Excel export.
+
+Run with: pytest backend/tests/test_xlsx_export.py
+"""
+
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from app.models.kpi import KPI
+from app.models.user import User
+from app.services.report_service import report_service
+from app.utils.xlsx_export import MAX_COLUMN_WIDTH, iter_file, write_xlsx
+
+
+def read(fileobj):
+    """Load a workbook the way a user's spreadsheet program would."""
+    return load_workbook(BytesIO(b"".join(iter_file(fileobj, chunk_size=1024))))
+
+
+def test_workbook_has_the_header_and_every_row():
+    rows = ((i, f"title {i}", i * 1.5, None) for i in range(1, 501))
+
+    worksheet = read(write_xlsx(rows, ["ID", "Title", "Value", "Empty"], sheet_name="Data"))["Data"]
+
+    assert (worksheet.max_row, worksheet.max_column) == (501, 4)
+    values = list(worksheet.iter_rows(values_only=True))
+    assert values[0] == ("ID", "Title", "Value", "Empty")
+    assert values[1] == (1, "title 1", 1.5, None)
+    assert values[500] == (500, "title 500", 750.0, None)
+    assert worksheet["A1"].font.b
+
+
+def test_text_is_written_as_is():
+    rows = [("=SUM(A1:A2)", "https://example.com", "Ünïcode, \"quoted\"")]
+
+    worksheet = read(write_xlsx(rows, ["Formula", "URL", "Text"])).active
+
+    assert [cell.value for cell in worksheet[2]] == list(rows[0])
+    assert worksheet["A2"].data_type == "s" and worksheet["B2"].hyperlink is None
+
+
+def test_columns_fit_the_longest_value():
+    rows = [("x" * 10, "y" * 200)]
+
+    worksheet = read(write_xlsx(rows, ["Short", "Long"])).active
+
+    # Stored widths include a fraction of a character of cell padding
+    assert int(worksheet.column_dimensions["A"].width) == 12
+    assert int(worksheet.column_dimensions["B"].width) == MAX_COLUMN_WIDTH
+
+
+def test_kpi_report_rows_and_columns(db):
+    user = User(email="owner@example.com", username="owner", password_hash="x", role="admin")
+    db.add(user)
+    db.commit()
+    db.add_all([
+        KPI(user_id=user.id, year=2025, quarter="Q1", title="Revenue", category="sales",
+            target_value="100", current_value="80", progress_percentage=80.0),
+        KPI(user_id=user.id, year=2025, quarter="Q2", title="Churn"),
+        KPI(user_id=user.id, year=2024, quarter="Q4", title="Last year"),
+    ])
+    db.commit()
+
+    worksheet = read(report_service.generate_excel_report(db, year=2025))["KPI Report"]
+
+    rows = list(worksheet.iter_rows(values_only=True))
+    assert rows[0] == ("ID", "Title", "Year", "Quarter", "Category", "Status",
+                       "Target", "Current", "Progress %", "Created", "Updated")
+    assert [row[1:9] for row in rows[1:]] == [
+        ("Revenue", 2025, "Q1", "sales", "draft", "100", "80", 80),
+        ("Churn", 2025, "Q2", "N/A", "draft", "N/A", "N/A", 0),
+    ]